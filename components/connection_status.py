@@ -0,0 +1,28 @@
+import os
+import streamlit as st
+from utils.sheets_provider import invalidate_sheets_manager
+
+
+def has_credentials():
+    """認証情報（Secrets または credentials.json）が設定されているか"""
+    try:
+        if 'gcp_service_account' in st.secrets:
+            return True
+    except Exception:
+        # secrets.toml がない場合
+        pass
+    return os.path.exists('credentials.json')
+
+
+def render_connection_error():
+    """Google Sheetsに接続できない場合のエラー表示と再接続ボタン"""
+    st.markdown('<span class="status-badge status-error">接続エラー</span>', unsafe_allow_html=True)
+    if has_credentials():
+        st.error("Google Sheets認証に失敗しました。認証情報の設定を確認してください。")
+    else:
+        st.error("Google Sheets認証情報が設定されていません。")
+    
+    # 認証情報を修正した後に共有クライアントを作り直す
+    if st.button("再接続", key="reconnect_sheets", type="secondary"):
+        invalidate_sheets_manager()
+        st.rerun()
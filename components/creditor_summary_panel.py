@@ -0,0 +1,38 @@
+import streamlit as st
+
+def render_summary_metrics(summary):
+    """件数・債権額合計・最大・中央値のメトリクスをレンダリング"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("債権者数", f"{summary['count']:,}件")
+    with col2:
+        st.metric("債権額合計", f"{summary['total']:,}円")
+    with col3:
+        st.metric("最大債権額", f"{summary['max']:,}円")
+    with col4:
+        st.metric("債権額中央値", f"{summary['median']:,}円")
+
+def render_breakdowns(summary):
+    """債権名別・ステータス別の内訳をレンダリング"""
+    col_claim, col_status = st.columns(2)
+    with col_claim:
+        st.caption("債権名別")
+        st.dataframe(summary['by_claim_name'], use_container_width=True)
+    with col_status:
+        st.caption("ステータス別")
+        st.dataframe(summary['by_status'], use_container_width=True)
+
+def render_debtor_summary(summary):
+    """1債務者分の集計をレンダリング"""
+    render_summary_metrics(summary)
+    if summary['count']:
+        render_breakdowns(summary)
+
+def render_portfolio_summary(summary):
+    """全債務者の集計をレンダリング"""
+    st.metric("債務者数", f"{summary['debtor_count']:,}名")
+    render_summary_metrics(summary)
+    if summary['count']:
+        st.caption("債務者別")
+        st.dataframe(summary['by_debtor'], use_container_width=True)
+        render_breakdowns(summary)
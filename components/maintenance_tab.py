@@ -19,7 +19,7 @@ def render_registry_content_section(registry_utils):
     
     if st.checkbox("レジストリファイルの内容を表示", key="show_registry"):
         try:
-            registry = registry_utils.template_manager.load_registry()
+            registry = registry_utils.snapshot.registry
             if registry:
                 st.json(registry)
             else:
@@ -0,0 +1,46 @@
+import math
+import streamlit as st
+
+def get_page_count(total_items, page_size):
+    """総ページ数を取得"""
+    return max(1, math.ceil(total_items / page_size))
+
+def _move_page(page_key, delta, page_count):
+    """ページ送りボタンのコールバック（再実行前にページを更新）"""
+    page = st.session_state.get(page_key, 0) + delta
+    st.session_state[page_key] = max(0, min(page, page_count - 1))
+
+def render_pagination(key, total_items, page_size, reset_token=None):
+    """ページ送りをレンダリングして表示範囲（start, end）を返す"""
+    page_key = f"page_{key}"
+    token_key = f"page_token_{key}"
+    page_count = get_page_count(total_items, page_size)
+
+    # 検索条件などが変わったら1ページ目に戻す
+    if st.session_state.get(token_key) != reset_token:
+        st.session_state[token_key] = reset_token
+        st.session_state[page_key] = 0
+
+    page = min(st.session_state.get(page_key, 0), page_count - 1)
+
+    if page_count > 1:
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+
+        with col_prev:
+            st.button(
+                "前へ", key=f"prev_{key}", disabled=page == 0, use_container_width=True,
+                on_click=_move_page, args=(page_key, -1, page_count)
+            )
+
+        with col_next:
+            st.button(
+                "次へ", key=f"next_{key}", disabled=page >= page_count - 1, use_container_width=True,
+                on_click=_move_page, args=(page_key, 1, page_count)
+            )
+
+        with col_info:
+            st.caption(f"{page + 1} / {page_count} ページ（全{total_items}件）")
+
+    st.session_state[page_key] = page
+    start = page * page_size
+    return start, min(start + page_size, total_items)
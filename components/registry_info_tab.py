@@ -1,5 +1,4 @@
 import streamlit as st
-import os
 
 def render_registry_info_tab(registry_utils):
     """レジストリ情報タブをレンダリング"""
@@ -16,7 +15,7 @@ def render_registry_info_tab(registry_utils):
     render_metrics(total_courts, total_templates, court_details)
     
     # 詳細表示
-    render_court_details(court_details, registry_utils.template_manager)
+    render_court_details(court_details, registry_utils.snapshot)
 
 def render_metrics(total_courts, total_templates, court_details):
     """メトリクス情報をレンダリング"""
@@ -30,7 +29,7 @@ def render_metrics(total_courts, total_templates, court_details):
         available_count = sum(1 for court in court_details if court["count"] > 0)
         st.metric("テンプレート保有裁判所", available_count)
 
-def render_court_details(court_details, template_manager):
+def render_court_details(court_details, snapshot):
     """裁判所別詳細情報をレンダリング"""
     st.markdown("---")
     st.subheader("裁判所別テンプレート詳細")
@@ -48,13 +47,13 @@ def render_court_details(court_details, template_manager):
     
     for court in courts_with_templates:
         with st.expander(f"{court['name']} - {court['count']}件"):
-            render_court_templates(court, template_manager)
+            render_court_templates(court, snapshot)
 
-def render_court_templates(court, template_manager):
+def render_court_templates(court, snapshot):
     """個別裁判所のテンプレート情報をレンダリング"""
     for procedure in court['procedures']:
         template_key = f"{court['name']}_{procedure}"
-        template_info = template_manager.get_template_info(template_key)
+        template_info = snapshot.get_template_info(template_key)
         
         if template_info:  # template_infoがNoneでないことを確認
             st.markdown(f"**{procedure}**")
@@ -67,8 +66,7 @@ def render_court_templates(court, template_manager):
             
             with info_col2:
                 st.text(f"最終更新: {template_info.get('last_modified', 'なし')}")
-                file_path = template_info.get('file_path', '')
-                exists = os.path.exists(file_path) if file_path else False
+                exists = template_info.get('file_exists', False)
                 st.text(f"ファイル: {'存在' if exists else '不存在'}")
             
             st.markdown("---")
@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import os
 from utils.constants import COURTS, PROCEDURE_TYPES, TEMPLATE_VARIABLES
 from utils.template_processor import TemplateProcessor
@@ -57,13 +56,14 @@ def render_existing_templates_list(template_manager):
     st.markdown("---")
     st.subheader("登録済みテンプレート一覧")
     
+    snapshot = template_manager.get_registry_snapshot()
     registered_templates = []
     for court in COURTS[:-1]:  # "その他"を除く
         for proc_type in PROCEDURE_TYPES:
             key = TemplateProcessor.get_template_key(court, proc_type)
-            if template_manager.template_exists(key):
-                template_info = template_manager.get_template_info(key)
-                template_path = template_manager.get_template_path(key)
+            template_path = snapshot.get_template_path(key)
+            if template_path is not None:
+                template_info = snapshot.get_template_info(key)
                 file_ext = TemplateProcessor.get_file_extension(template_path)
                 format_name = "Excel" if file_ext == ".xlsx" else "Word" if file_ext == ".docx" else "不明"
                 
@@ -76,6 +76,7 @@ def render_existing_templates_list(template_manager):
                 })
     
     if registered_templates:
+        import pandas as pd
         df_templates = pd.DataFrame(registered_templates)
         st.dataframe(df_templates, use_container_width=True)
     else:
@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from utils.constants import COURTS, PROCEDURE_TYPES
 from utils.styles import get_success_html
+from utils.creditor_record import records_to_dataframe
+from components.creditor_summary_panel import render_debtor_summary
 
 def render_template_usage_tab(data_handler, template_processor, sheets_manager, template_manager):
     """テンプレート使用タブをレンダリング"""
@@ -24,8 +25,9 @@ def render_template_usage_tab(data_handler, template_processor, sheets_manager,
     
     template_key = template_processor.get_template_key(selected_court, procedure_type)
     
-    if template_manager.template_exists(template_key):
-        template_info = template_manager.get_template_info(template_key)
+    snapshot = template_manager.get_registry_snapshot()
+    if snapshot.template_exists(template_key):
+        template_info = snapshot.get_template_info(template_key)
         if template_info:  # template_infoがNoneでないことを確認
             st.success(f"{selected_court} - {procedure_type} のテンプレートが利用可能です")
             st.text(f"説明: {template_info.get('description', 'なし')}")
@@ -71,7 +73,7 @@ def render_data_acquisition_section(data_handler):
             
             st.success("データを取得しました")
             with st.expander("データプレビュー"):
-                df = pd.DataFrame(creditor_data)
+                df = records_to_dataframe(creditor_data)
                 st.dataframe(df, use_container_width=True)
     
     else:  # スプレッドシートリンクを直接入力
@@ -82,6 +84,11 @@ def render_export_section(selected_debtor, creditor_data, selected_court, proced
     st.markdown("---")
     st.subheader("エクスポート")
     
+    from utils.creditor_summary import summarize_debtor
+    
+    with st.expander(f"{selected_debtor} の集計"):
+        render_debtor_summary(summarize_debtor(records_to_dataframe(creditor_data)))
+    
     output_filename = st.text_input("出力ファイル名", 
         value=f"{datetime.now().strftime('%Y%m%d')}_{selected_debtor}_{procedure_type}_債権者一覧表")
     
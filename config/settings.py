@@ -14,6 +14,76 @@ GOOGLE_SHEETS_SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
+# Google API HTTP接続プール設定（全ページで共有するセッション）
+SHEETS_HTTP_POOL = {
+    "pool_connections": 4,
+    "pool_maxsize": 16
+}
+
+# Google APIクォータ設定（毎分のリクエスト数と同時実行数の上限）
+SHEETS_QUOTA = {
+    "read_per_minute": 60,
+    "write_per_minute": 60,
+    "max_concurrency": 8
+}
+
+# シートデータ共有キャッシュ設定（全セッション共通）
+SHEET_CACHE = {
+    "max_entries": 200,
+    "max_bytes": 64 * 1024 * 1024,
+    "ttl_seconds": 300
+}
+
+# Driveのリビジョン確認結果を再利用する秒数
+REVISION_PROBE_TTL_SECONDS = 15
+
+# スプレッドシート一覧ページの1ページあたり表示件数
+SHEETS_PER_PAGE = 10
+ROWS_PER_PAGE = 20
+
+# 空きシートのプール（事前に作成しておき、新しい債務者の初回登録で使う。0で無効）
+# プールのシートは「債権者データ_」で始まらない名前にして一覧に出ないようにする
+SHEET_POOL = {
+    "size": 0,
+    "name_prefix": "空き債権者シート_"
+}
+
+# 行の論理削除（削除時はステータス列に削除済みと記録するだけにし、行の物理削除はシート整理でまとめて行う）
+SOFT_DELETE = {
+    "enabled": False,
+    "status": "削除済み"  # 削除済みを表すステータス（この値の行は読み込み時に除外）
+}
+
+# 債権者横断検索インデックス（SQLite）の設定
+SEARCH_INDEX = {
+    "path": ".cache/search_index.sqlite3",
+    "max_results": 200
+}
+
+# 重複判定に契約日も含めるか（Falseの場合は債権者名と債権額のみ）
+DEDUPE_USE_CONTRACT_DATE = False
+
+# 一括取り込みで1回にまとめて書き込む件数
+IMPORT_BATCH_SIZE = 100
+
+# 一括取り込みで債務者ごとの処理（シート作成・書き込み）を並行して行う数
+IMPORT_DEBTOR_CONCURRENCY = 4
+
+# ファイル取り込みのバックグラウンドジョブ設定
+IMPORT_JOBS = {
+    "max_workers": 1,  # 同時に実行するジョブ数（超えた分は順番待ち）
+    "max_history": 20  # 保持する完了済みジョブ数
+}
+
+# ページ再実行のプロファイリング（URLに ?profile=1 を付けるか、環境変数 CREDITOR_PROFILE=1 で有効）
+PROFILING = {
+    "env_var": "CREDITOR_PROFILE",
+    "query_param": "profile",
+    "directory": "profiles",  # .pstats ファイルの保存先
+    "keep": 20,  # 保持する .pstats ファイル数（古いものから削除）
+    "top": 15  # 概要に表示する関数の数
+}
+
 # データフィールド定義
 CREDITOR_FIELDS = [
     'ID', '債務者名', '会社名', '支店名', '郵便番号', '住所',
@@ -22,6 +92,14 @@ CREDITOR_FIELDS = [
     '代位弁済/債権譲渡', '債権移転日', 'ステータス', '備考', '登録日'
 ]
 
+# 入力データ（JSON等）のキー（CREDITOR_FIELDSと同じ順）
+CREDITOR_FIELD_KEYS = [
+    'id', 'debtor_name', 'company_name', 'branch_name', 'postal_code', 'address',
+    'phone_number', 'fax_number', 'claim_name', 'claim_amount', 'contract_date',
+    'first_borrowing_date', 'last_borrowing_date', 'last_payment_date', 'original_creditor',
+    'substitution_or_transfer', 'transfer_date', 'status', 'notes', 'registered_at'
+]
+
 # JSONサンプル
 JSON_SAMPLE = """{
   "debtor_name": "株式会社サンプル",
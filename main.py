@@ -84,26 +84,17 @@ def main():
         if os.path.exists(creditor_management_dir):
             sys.path.insert(0, creditor_management_dir)
         
-        from utils.sheets_manager import SheetsManager
-        
-        @st.cache_resource
-        def get_sheets_manager():
-            try:
-                return SheetsManager()
-            except Exception as e:
-                st.error(f"SheetsManager初期化エラー: {e}")
-                return None
+        from utils.sheets_provider import get_sheets_manager
+        from utils.metrics import set_page
         
+        set_page("ホーム")
         sheets_manager = get_sheets_manager()
         
         if sheets_manager and sheets_manager.is_connected():
             st.markdown('<span class="status-badge status-connected">Google Sheets 接続中</span>', unsafe_allow_html=True)
         else:
-            st.markdown('<span class="status-badge status-error">接続エラー</span>', unsafe_allow_html=True)
-            if 'gcp_service_account' in st.secrets:
-                st.error("Google Sheets認証に失敗しました。Secrets設定を確認してください。")
-            else:
-                st.error("Google Sheets認証情報が設定されていません。")
+            from components.connection_status import render_connection_error
+            render_connection_error()
     except Exception as e:
         st.error(f"システム初期化エラー: {e}")
         st.info("左のメニューから各機能をご利用ください。")
@@ -7,58 +7,22 @@ try:
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
     
-    from utils.sheets_manager import SheetsManager
-    from utils.data_processor import parse_json_data, validate_creditor_data
+    from utils.sheets_provider import get_sheets_manager
+    from utils.import_pipeline import ImportPipeline
+    from utils.import_jobs import get_import_job_manager
     from utils.styles import MAIN_CSS, get_success_html, get_info_html, get_warning_html
+    from utils.metrics import action, set_page
+    
+    set_page("JSON一括取り込み")
     
     # CSS適用
     st.markdown(MAIN_CSS, unsafe_allow_html=True)
     
-    # ボタンスタイル強制適用JavaScript
-    st.markdown("""
-    <script>
-    function applyButtonStyles() {
-        // プライマリボタンを探してスタイル適用
-        const buttons = document.querySelectorAll('button[kind="primary"], button[data-testid="baseButton-primary"], .stButton > button[kind="primary"]');
-        buttons.forEach(button => {
-            button.style.backgroundColor = '#f0f9f0';
-            button.style.color = '#4a6741';
-            button.style.border = '1px solid #e6f4e6';
-            button.style.borderColor = '#e6f4e6';
-        });
-        
-        // フォーム内のボタンも対象に
-        const formButtons = document.querySelectorAll('.stForm button, form button');
-        formButtons.forEach(button => {
-            button.style.backgroundColor = '#f0f9f0';
-            button.style.color = '#4a6741';
-            button.style.border = '1px solid #e6f4e6';
-            button.style.borderColor = '#e6f4e6';
-        });
-    }
-    
-    // ページ読み込み時に適用
-    document.addEventListener('DOMContentLoaded', applyButtonStyles);
-    
-    // Streamlitの動的更新に対応
-    setTimeout(applyButtonStyles, 100);
-    setTimeout(applyButtonStyles, 500);
-    setTimeout(applyButtonStyles, 1000);
-    
-    // MutationObserverでDOM変更を監視
-    const observer = new MutationObserver(applyButtonStyles);
-    observer.observe(document.body, { childList: true, subtree: true });
-    </script>
-    """, unsafe_allow_html=True)
-    
-    @st.cache_resource
-    def get_sheets_manager():
-        return SheetsManager()
-    
     sheets_manager = get_sheets_manager()
     
     if not sheets_manager.is_connected():
-        st.error("Google Sheets接続エラー")
+        from components.connection_status import render_connection_error
+        render_connection_error()
         st.stop()
     
     st.markdown("ClaimExtract-GPTから出力されたJSONデータを貼り付けて、Ctrl+Enterまたは登録ボタンをクリックしてください")
@@ -70,6 +34,18 @@ try:
     if 'last_processed_json' not in st.session_state:
         st.session_state.last_processed_json = ""
     
+    # 登録済みレコードの冪等キー（貼り直した時に登録済みの分を読み飛ばす）
+    if 'import_committed_keys' not in st.session_state:
+        st.session_state.import_committed_keys = set()
+    
+    # このセッションで登録したファイル取り込みジョブ
+    if 'import_job_ids' not in st.session_state:
+        st.session_state.import_job_ids = []
+    
+    # 登録済みキーを統合済みのジョブ
+    if 'import_merged_job_ids' not in st.session_state:
+        st.session_state.import_merged_job_ids = set()
+    
     # JSONデータ入力
     json_input = st.text_area(
         "JSONデータ（入力後 Ctrl+Enter で自動登録）",
@@ -93,59 +69,131 @@ try:
     if should_process:
         st.session_state.last_processed_json = json_input.strip()
         
-        # パース処理
-        with st.spinner("データを解析・登録中..."):
-            parsed_data, error = parse_json_data(json_input.strip())
+        # 逐次パース・検証・債務者ごとのまとめ書き込み
+        progress_text = st.empty()
+        
+        def show_progress(result):
+            progress_text.caption(
+                f"処理中: {result.processed}件（登録 {result.added}件 / 重複 {result.duplicates}件 / "
+                f"登録済みのためスキップ {result.skipped}件）"
+            )
+        
+        pipeline = ImportPipeline(sheets_manager, st.session_state.import_committed_keys)
+        with st.spinner("データを解析・登録中..."), action("JSON登録"):
+            result = pipeline.run(json_input.strip(), on_progress=show_progress)
+        progress_text.empty()
+        
+        # 債務者ごとの結果（入力順）を再描画後も表示できるよう保存
+        st.session_state.last_import_summary = [
+            {"債務者名": debtor_name, "登録": counts['added'], "重複": counts['duplicates'], "失敗": counts['failed']}
+            for debtor_name, counts in result.debtors.items()
+        ]
+        
+        if result.parse_error:
+            st.error(f"JSON解析エラー: {result.parse_error}")
+        
+        for _, debtor_name, errors in result.invalid:
+            st.error(f"検証エラー ({debtor_name}): {', '.join(errors)}")
         
-        if error:
-            st.error(f"JSON解析エラー: {error}")
-        else:
-            # 検証と登録処理
-            valid_data = []
-            error_count = 0
+        if result.invalid:
+            st.markdown(get_warning_html(f"{len(result.invalid)}件のデータに検証エラーがあります"), unsafe_allow_html=True)
+        
+        for debtor_name, numbers, error in result.failed:
+            st.error(f"処理エラー ({debtor_name}): {len(numbers)}件を登録できませんでした（{error}）。再度登録すると未登録の分だけ登録されます")
+        
+        if result.skipped:
+            st.info(f"{result.skipped}件は登録済みのためスキップしました")
+        
+        if result.committed > 0 and not result.failed and not result.parse_error:
+            st.markdown(get_success_html(f"{result.added}件のデータを登録しました"), unsafe_allow_html=True)
             
-            for data in parsed_data:
-                errors = validate_creditor_data(data)
-                if errors:
-                    error_count += 1
-                    st.error(f"検証エラー ({data.get('debtor_name', '不明')}): {', '.join(errors)}")
-                else:
-                    valid_data.append(data)
+            # 入力エリアをクリア
+            st.session_state.json_input_key += 1
+            st.session_state.last_processed_json = ""
             
-            if error_count > 0:
-                st.markdown(get_warning_html(f"{error_count}件のデータに検証エラーがあります"), unsafe_allow_html=True)
+            # 新しい入力の案内
+            st.info("新しいJSONデータを入力できます")
+            st.rerun()
+        elif result.committed > 0:
+            st.markdown(get_success_html(f"{result.added}件のデータを登録しました"), unsafe_allow_html=True)
+        elif not result.skipped and not result.failed:
+            st.error("有効なデータがありません。")
+    
+    # 直前の取り込みの債務者ごとの結果
+    if st.session_state.get('last_import_summary'):
+        with st.expander("前回の登録結果（債務者ごと）"):
+            st.dataframe(st.session_state.last_import_summary, use_container_width=True, hide_index=True)
+    
+    # ファイルからの一括取り込み（バックグラウンド実行）
+    st.markdown("---")
+    st.markdown("### ファイルから一括取り込み")
+    
+    job_manager = get_import_job_manager()
+    
+    uploaded_file = st.file_uploader(
+        "JSON Lines / CSV / Excel ファイル",
+        type=["jsonl", "json", "csv", "xlsx"],
+        help="CSV・Excelは1行目を列名としてください（JSONのキー名またはスプレッドシートの列名）"
+    )
+    
+    if uploaded_file is not None:
+        if st.button("ファイルを取り込む", key="start_file_import", type="primary", use_container_width=True):
+            with action("ファイル取り込み"):
+                job_id = job_manager.submit(
+                    sheets_manager,
+                    uploaded_file.name,
+                    uploaded_file.getvalue(),
+                    st.session_state.import_committed_keys
+                )
+            st.session_state.import_job_ids.append(job_id)
+            st.rerun()
+    
+    def merge_finished_job_keys(jobs):
+        """完了したジョブが登録したキーをセッションの登録済みキーに統合（ジョブは専用の複製に記録する）"""
+        for job in jobs:
+            if job.is_finished and job.id not in st.session_state.import_merged_job_ids:
+                st.session_state.import_committed_keys |= job.committed_keys
+                st.session_state.import_merged_job_ids.add(job.id)
+    
+    jobs = [job for job in map(job_manager.get, st.session_state.import_job_ids) if job]
+    merge_finished_job_keys(jobs)
+    
+    def render_import_jobs():
+        """取り込みジョブの進捗を表示（実行中は定期的に更新）"""
+        current_jobs = [job for job in map(job_manager.get, st.session_state.import_job_ids) if job]
+        merge_finished_job_keys(current_jobs)
+        
+        for job in reversed(current_jobs):
+            result = job.result
+            status_label = {"queued": "待機中", "running": "取り込み中", "done": "完了", "error": "エラー"}[job.status]
             
-            if valid_data:
-                # 即座に登録実行
-                success_count = 0
-                progress_bar = st.progress(0)
+            with st.container(border=True):
+                st.markdown(f"**{job.filename}**（ジョブID: `{job.id}`） - {status_label}")
+                st.caption(
+                    f"処理 {result.processed:,}件 / 登録 {result.added:,}件 / 重複 {result.duplicates:,}件 / "
+                    f"登録済みのためスキップ {result.skipped:,}件 / エラー {len(result.invalid) + sum(len(numbers) for _, numbers, _ in result.failed):,}件"
+                    f"　{job.rows_per_second:,.1f}件/秒"
+                )
                 
-                for i, data in enumerate(valid_data):
-                    progress_bar.progress((i + 1) / len(valid_data))
-                    
-                    try:
-                        debtor_name = data.get('debtor_name', '').strip()
-                        spreadsheet = sheets_manager.get_or_create_spreadsheet(debtor_name)
-                        
-                        if spreadsheet and sheets_manager.add_data(spreadsheet, data):
-                            success_count += 1
-                    except Exception as e:
-                        st.error(f"処理エラー ({data.get('debtor_name', '不明')}): {e}")
+                if job.error:
+                    st.error(f"処理エラー: {job.error}")
                 
-                progress_bar.empty()
-                
-                if success_count > 0:
-                    st.markdown(get_success_html(f"{success_count}件のデータを登録しました"), unsafe_allow_html=True)
-                    
-                    # 入力エリアをクリア
-                    st.session_state.json_input_key += 1
-                    st.session_state.last_processed_json = ""
-                    
-                    # 新しい入力の案内
-                    st.info("新しいJSONデータを入力できます")
-                    st.rerun()
-            else:
-                st.error("有効なデータがありません。")
+                if job.is_finished and job.has_errors():
+                    st.download_button(
+                        "エラー・重複レポートをダウンロード",
+                        data=job.error_report_csv(),
+                        file_name=f"import_errors_{job.id}.csv",
+                        mime="text/csv",
+                        key=f"error_report_{job.id}"
+                    )
+        
+        # すべて完了したらページ全体を更新してポーリングを止める
+        if any(not job.is_finished for job in jobs) and all(job.is_finished for job in current_jobs):
+            st.rerun()
+    
+    if jobs:
+        polling = any(not job.is_finished for job in jobs)
+        st.fragment(render_import_jobs, run_every=1.0 if polling else None)()
     
     # 使用方法の説明
     st.markdown("---")
@@ -153,6 +201,7 @@ try:
     st.markdown("""
     1. JSONデータを上のテキストエリアに貼り付け
     2. Ctrl+Enter（Mac: Cmd+Enter）を押すか「スプレッドシートに登録」ボタンをクリック
+    3. 大量のデータはJSON Lines / CSV / Excelファイルをアップロードして「ファイルを取り込む」をクリック（バックグラウンドで登録されます）
     """)
         
 except Exception as e:
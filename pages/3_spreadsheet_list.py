@@ -1,14 +1,20 @@
 import streamlit as st
 import sys
 import os
-import pandas as pd
 import time
+import unicodedata
 
 # パスの追加
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from utils.sheets_manager import SheetsManager
+from utils.sheets_provider import get_sheets_manager
 from utils.styles import MAIN_CSS, get_green_button_html, get_info_html
+from components.pagination import render_pagination
+from components.creditor_summary_panel import render_debtor_summary, render_portfolio_summary
+from utils.creditor_record import records_from_dataframe
+from utils.metrics import action, set_page
+from utils.profiling import profile_rerun
+from config.settings import SHEETS_PER_PAGE, ROWS_PER_PAGE, SOFT_DELETE
 
 # CSS適用
 st.markdown(MAIN_CSS, unsafe_allow_html=True)
@@ -16,99 +22,176 @@ st.markdown(MAIN_CSS, unsafe_allow_html=True)
 # セッション状態の初期化
 if 'viewing_sheets' not in st.session_state:
     st.session_state.viewing_sheets = {}
-if 'sheet_data_cache' not in st.session_state:
-    st.session_state.sheet_data_cache = {}
 if 'delete_confirmations' not in st.session_state:
     st.session_state.delete_confirmations = {}
+if 'opened_revisions' not in st.session_state:
+    st.session_state.opened_revisions = {}
+if 'show_portfolio' not in st.session_state:
+    st.session_state.show_portfolio = False
+# 論理削除した直後の行（シートごと、元に戻す用）
+if 'soft_deleted_rows' not in st.session_state:
+    st.session_state.soft_deleted_rows = {}
+# 一覧表示（リビジョン取得）の後にこのセッションで書き込んだシート
+if 'written_sheets' not in st.session_state:
+    st.session_state.written_sheets = set()
 
-@st.cache_resource
-def get_sheets_manager():
-    return SheetsManager()
-
-def clear_sheet_cache(sheet_id):
-    """特定のシートのキャッシュをクリア"""
-    if sheet_id in st.session_state.sheet_data_cache:
-        del st.session_state.sheet_data_cache[sheet_id]
+def close_sheet_view(sheet_id):
+    """特定のシートの表示状態をリセット"""
     if sheet_id in st.session_state.viewing_sheets:
         st.session_state.viewing_sheets[sheet_id] = False
-    # 削除済み行の記録もクリア
-    if f'deleted_rows_{sheet_id}' in st.session_state:
-        del st.session_state[f'deleted_rows_{sheet_id}']
 
-def get_sheet_data(sheets_manager, sheet_id):
-    """シートデータを取得（キャッシュ機能付き）"""
-    # キャッシュのタイムスタンプをチェック（5分で期限切れ）
-    cache_key = f"cache_time_{sheet_id}"
-    current_time = time.time()
+def mark_sheet_written(sheet_id):
+    """
+    このセッションでシートに書き込んだことを記録
     
-    if cache_key in st.session_state:
-        cache_time = st.session_state[cache_key]
-        if current_time - cache_time > 300:  # 5分経過
-            clear_sheet_cache(sheet_id)
+    カード単位の再実行では一覧表示時のリビジョンが古いままのため、次に一覧を表示するまでは
+    書き込みを反映済みのキャッシュをそのまま使う。自分の書き込みは「開いてから変更あり」と表示しない。
+    """
+    st.session_state.written_sheets.add(sheet_id)
+    st.session_state.opened_revisions.pop(sheet_id, None)
+
+def rerun_sheet_card():
+    """操作したシートのカードだけを再実行（ページ全体の実行中に呼ばれた場合はページ全体を再実行）"""
+    from streamlit.errors import StreamlitAPIException
     
-    # キャッシュからデータを取得または新規取得
-    if sheet_id not in st.session_state.sheet_data_cache:
-        df = sheets_manager.get_data(sheet_id)
-        if isinstance(df, list):
-            df = pd.DataFrame(df)
-        st.session_state.sheet_data_cache[sheet_id] = df
-        st.session_state[cache_key] = current_time
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def get_sheet_data(sheets_manager, sheet_id, revision=None):
+    """シートデータを取得（全セッション共有キャッシュ経由、リビジョンが変わった場合のみ再取得）"""
+    return sheets_manager.get_cached_data(sheet_id, revision)
+
+def prefetch_sheet_data(sheets_manager, sheet_ids, revisions=None):
+    """複数シートのデータをまとめて並行取得して共有キャッシュに格納"""
+    sheets_manager.get_cached_data_many(sheet_ids, revisions)
+
+def load_portfolio_frames(sheets_manager, sheets, revisions):
+    """全債務者のシートを同時実行数の上限ずつ並行取得（進捗を表示）"""
+    from utils.quota_scheduler import get_quota_scheduler
     
-    return st.session_state.sheet_data_cache[sheet_id]
+    chunk_size = get_quota_scheduler().max_concurrency
+    frames = {}
+    progress = st.progress(0.0, text="全シートのデータを読み込み中...")
+    for start in range(0, len(sheets), chunk_size):
+        chunk = [sheet['sheet_id'] for sheet in sheets[start:start + chunk_size]]
+        frames.update(sheets_manager.get_cached_data_many(chunk, revisions))
+        loaded = min(start + chunk_size, len(sheets))
+        progress.progress(loaded / len(sheets), text=f"全シートのデータを読み込み中... {loaded} / {len(sheets)}")
+    progress.empty()
+    return frames
 
-def compact_sheet_data(sheets_manager, sheet_id):
-    """シートの空白行を詰めて整理する"""
-    try:
-        # 現在のデータを取得
-        df = get_sheet_data(sheets_manager, sheet_id)
-        if df.empty:
-            return True
-        
-        # 空白行以外のデータを取得
-        non_empty_data = []
-        for _, row in df.iterrows():
-            # すべての列が空でない行のみを保持
-            if any(str(val).strip() for val in row.values if pd.notna(val)):
-                non_empty_data.append(row.to_dict())
-        
-        if not non_empty_data:
-            return True
-        
-        # シートをクリアして再構築
-        success = sheets_manager.clear_sheet_data(sheet_id)
-        if not success:
-            return False
-        
-        # ヘッダーを再追加
-        headers = list(df.columns)
-        if 'sheet_row' in headers:
-            headers.remove('sheet_row')
-        
-        success = sheets_manager.add_headers(sheet_id, headers)
-        if not success:
-            return False
-        
-        # データを順次追加
-        for data in non_empty_data:
-            # sheet_row列を除外
-            clean_data = {k: v for k, v in data.items() if k != 'sheet_row'}
-            success = sheets_manager.append_data(sheet_id, clean_data)
-            if not success:
-                return False
-            time.sleep(0.1)  # API制限対策
-        
-        # キャッシュをクリア
-        clear_sheet_cache(sheet_id)
+def render_portfolio_section(sheets_manager, sheets, revisions):
+    """全債務者の集計（どのシートのリビジョンも変わっていなければ前回の集計結果を使う）"""
+    from utils.creditor_summary import summarize_portfolio
+    
+    with st.expander("全債務者の集計", expanded=st.session_state.show_portfolio):
+        if not st.session_state.show_portfolio:
+            if st.button("集計する", key="show_portfolio_button", use_container_width=True):
+                st.session_state.show_portfolio = True
+                st.rerun()
+            return
         
-        return True
+        signature = tuple((sheet['sheet_id'], revisions.get(sheet['sheet_id'])) for sheet in sheets)
+        cached = st.session_state.get('portfolio_summary')
+        if cached is not None and cached[0] == signature:
+            summary = cached[1]
+        else:
+            with action("全体集計"):
+                frames = load_portfolio_frames(sheets_manager, sheets, revisions)
+            summary = summarize_portfolio(
+                (sheet['debtor_name'], frames.get(sheet['sheet_id'])) for sheet in sheets
+            )
+            st.session_state.portfolio_summary = (signature, summary)
+        render_portfolio_summary(summary)
         
-    except Exception as e:
-        st.error(f"シート整理エラー: {str(e)}")
+        if st.button("集計を閉じる", key="hide_portfolio_button", use_container_width=True):
+            st.session_state.show_portfolio = False
+            st.session_state.pop('portfolio_summary', None)
+            st.rerun()
+
+def render_creditor_search(sheets_manager, sheets):
+    """債権者名などで全債務者を横断検索"""
+    from utils.search_index import get_search_index
+    from config.settings import SEARCH_INDEX
+    
+    creditor_query = st.text_input(
+        "債権者名・支店名・住所・原債権者で全債務者を検索",
+        placeholder="例：アコム",
+        key="creditor_search"
+    )
+    if not creditor_query.strip():
+        return
+    
+    search_index = get_search_index()
+    with st.spinner("検索インデックスを更新中..."), action("横断検索"):
+        search_index.refresh(sheets_manager, sheets)
+    
+    results = search_index.search(creditor_query)
+    if not results:
+        st.warning(f"「{creditor_query}」に一致する債権者が見つかりません")
+        return
+    
+    debtor_count = len({result['sheet_id'] for result in results})
+    limit_note = f"（上位{SEARCH_INDEX['max_results']}件まで表示）" if len(results) >= SEARCH_INDEX['max_results'] else ""
+    st.caption(f"{debtor_count}名の債務者に{len(results)}件の該当があります{limit_note}")
+    st.dataframe(
+        [
+            {
+                "債務者名": result['debtor_name'],
+                "会社名": result['company_name'],
+                "支店名": result['branch_name'],
+                "住所": result['address'],
+                "原債権者": result['original_creditor'],
+                "債権額": result['claim_amount'],
+                "行": result['sheet_row'],
+            }
+            for result in results
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def is_changed_since_opened(sheet):
+    """このセッションで開いてからシートが更新されたかどうか"""
+    opened_revision = st.session_state.opened_revisions.get(sheet['sheet_id'])
+    return sheet.get('revision') is not None and opened_revision is not None and sheet['revision'] != opened_revision
+
+def compact_sheet_data(sheets_manager, sheet_id):
+    """シートの論理削除済みの行と空白行をまとめて削除して整理する"""
+    purged = sheets_manager.purge_deleted_rows(sheet_id)
+    if purged is None:
         return False
+    
+    # 整理後は元に戻せないため記録を破棄
+    st.session_state.soft_deleted_rows.pop(sheet_id, None)
+    if purged:
+        st.toast(f"{purged}行を整理しました")
+    return True
+
+def render_undo_delete(sheets_manager, sheet_id):
+    """直前に論理削除した行を元に戻すボタン"""
+    deleted = st.session_state.soft_deleted_rows.get(sheet_id)
+    if not deleted:
+        return
+    
+    col_message, col_undo = st.columns([4, 1])
+    with col_message:
+        st.caption(f"「{deleted['company_name']}」を削除しました")
+    with col_undo:
+        if st.button("元に戻す", key=f"undo_delete_{sheet_id}", use_container_width=True):
+            with action("元に戻す"):
+                restored = sheets_manager.restore_creditor(sheet_id, deleted['id'], deleted['status'], deleted['sheet_row'])
+            if restored:
+                mark_sheet_written(sheet_id)
+                st.session_state.soft_deleted_rows.pop(sheet_id, None)
+                rerun_sheet_card()
 
 def display_sheet_data(sheet, sheets_manager):
-    """シートデータの表示"""
+    """シートデータの表示（シートのカードのフラグメント内で呼び出す）"""
     sheet_id = sheet['sheet_id']
+    revision = None if sheet_id in st.session_state.written_sheets else sheet.get('revision')
     
     # データ表示トグル
     is_viewing = st.session_state.viewing_sheets.get(sheet_id, False)
@@ -117,34 +200,44 @@ def display_sheet_data(sheet, sheets_manager):
     if st.button(button_text, key=f"toggle_view_{sheet_id}", use_container_width=True):
         st.session_state.viewing_sheets[sheet_id] = not is_viewing
         if not st.session_state.viewing_sheets[sheet_id]:
-            # 閉じる時はキャッシュをクリア
-            clear_sheet_cache(sheet_id)
-        st.rerun()
+            # 閉じる時は表示状態をリセット
+            close_sheet_view(sheet_id)
+        rerun_sheet_card()
     
     # データ表示
     if st.session_state.viewing_sheets.get(sheet_id, False):
-        with st.spinner("データを読み込み中..."):
-            df = get_sheet_data(sheets_manager, sheet_id)
+        with st.spinner("データを読み込み中..."), action("データ確認"):
+            df = get_sheet_data(sheets_manager, sheet_id, revision)
+        
+        # 最新のデータを表示したので変更表示をリセット
+        if revision is not None:
+            st.session_state.opened_revisions[sheet_id] = revision
+            
+        if SOFT_DELETE["enabled"]:
+            render_undo_delete(sheets_manager, sheet_id)
+            if st.button("削除済みの行を整理", key=f"compact_{sheet_id}", help="削除済みの行をシートからまとめて削除します"):
+                with action("シート整理"):
+                    compacted = compact_sheet_data(sheets_manager, sheet_id)
+                if compacted:
+                    mark_sheet_written(sheet_id)
+                    rerun_sheet_card()
             
         if not df.empty:
-            # 削除予定の行を追跡
-            deleted_rows = st.session_state.get(f'deleted_rows_{sheet_id}', set())
+            from utils.creditor_summary import summarize_debtor
             
-            for index, row in df.iterrows():
-                sheet_row = row.get('sheet_row', index + 2)
-                
-                # 既に削除済みの行はスキップ
-                if sheet_row in deleted_rows:
-                    continue
-                
-                # 空白行をスキップ
-                if not any(str(val).strip() for val in row.values if pd.notna(val) and val != sheet_row):
-                    continue
+            with st.expander("集計"):
+                render_debtor_summary(summarize_debtor(df))
+            
+            # 表示中のページの行だけをレンダリング
+            start, end = render_pagination(f"rows_{sheet_id}", len(df), ROWS_PER_PAGE)
+            
+            for record in records_from_dataframe(df.iloc[start:end]):
+                sheet_row = record.sheet_row
                 
                 # データ抽出
-                creditor_name = extract_creditor_name(row)
-                claim_amount = extract_claim_amount(row)
-                status = row.get('ステータス', row.get('status', '未確認'))
+                creditor_name = record.company_name.strip() or "不明"
+                claim_amount = f"{record.claim_amount:,}" if record.claim_amount is not None else (record.text('債権額') or "0")
+                status = record.status or '未確認'
                 
                 # 表示
                 col_data, col_delete = st.columns([4, 1])
@@ -153,68 +246,135 @@ def display_sheet_data(sheet, sheets_manager):
                     st.write(f"**{creditor_name}** - {claim_amount}円 (ステータス: {status})")
                 
                 with col_delete:
-                    if st.button("削除", key=f"delete_row_{sheet_id}_{sheet_row}", help="この行を削除"):
-                        if delete_sheet_row(sheets_manager, sheet_id, sheet_row):
-                            st.success("削除しました")
-                            # 削除済みリストに追加
-                            if f'deleted_rows_{sheet_id}' not in st.session_state:
-                                st.session_state[f'deleted_rows_{sheet_id}'] = set()
-                            st.session_state[f'deleted_rows_{sheet_id}'].add(sheet_row)
-                            # キャッシュをクリア
-                            clear_sheet_cache(sheet_id)
-                            time.sleep(0.5)  # API制限対策
-                            st.rerun()
+                    row_key = record.id if record.id is not None else sheet_row
+                    if st.button("削除", key=f"delete_row_{sheet_id}_{row_key}", help="この行を削除"):
+                        with action("行削除"):
+                            deleted = delete_sheet_row(sheets_manager, sheet_id, record)
+                        if deleted:
+                            # 共有キャッシュには削除を反映済みのため、このカードだけを再描画
+                            mark_sheet_written(sheet_id)
+                            rerun_sheet_card()
                 
                 # 詳細表示
                 with st.expander("詳細を表示"):
-                    display_columns = [col for col in df.columns if col != 'sheet_row']
-                    for col in display_columns[:10]:
-                        if col in row and str(row[col]).strip():
-                            st.write(f"**{col}:** {row[col]}")
+                    for col, value in list(record.to_dict().items())[:10]:
+                        if value.strip():
+                            st.write(f"**{col}:** {value}")
                 
                 st.markdown("---")
         else:
             st.info("データがありません")
 
-def extract_creditor_name(row):
-    """債権者名を抽出"""
-    name_columns = ['債権者名', 'company_name', '会社名', '債権者']
-    for col in name_columns:
-        if col in row and str(row[col]).strip():
-            return row[col]
-    return "不明"
+@st.fragment
+def render_sheet_card(sheet, sheets_manager):
+    """
+    債務者1名分のカード
+    
+    カード内のボタン操作ではこのカードだけを再実行し、スプレッドシート一覧の再取得や
+    他のカードの再描画は行わない（一覧が変わるシート削除のみページ全体を再実行）。
+    """
+    # シート情報表示
+    changed_badge = '<span class="status-badge status-changed">開いてから変更あり</span>' if is_changed_since_opened(sheet) else ''
+    st.markdown(f"""
+    <div class="spreadsheet-card">
+        <h4 class="card-header">債務者: {sheet['debtor_name']} {changed_badge}</h4>
+        <p class="card-subtitle">シート名: {sheet['sheet_name']}</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.markdown(
+            get_green_button_html(sheet["url"], "新しいタブで開く"),
+            unsafe_allow_html=True
+        )
+    
+    with col2:
+        # スプレッドシート削除（確認付き）
+        delete_key = f"delete_sheet_{sheet['sheet_id']}"
+        
+        if st.session_state.delete_confirmations.get(delete_key, False):
+            # 確認モード
+            col_confirm, col_cancel = st.columns(2)
+            
+            with col_confirm:
+                if st.button("削除実行", key=f"confirm_{delete_key}", type="primary", use_container_width=True):
+                    with action("シート削除"):
+                        deleted = sheets_manager.delete_spreadsheet(sheet['sheet_id'])
+                    if deleted:
+                        st.success("削除しました")
+                        st.session_state.delete_confirmations[delete_key] = False
+                        close_sheet_view(sheet['sheet_id'])
+                        time.sleep(0.5)  # API制限対策
+                        # 一覧からシートがなくなるためページ全体を再実行
+                        st.rerun()
+                    else:
+                        st.error("削除に失敗しました")
+            
+            with col_cancel:
+                if st.button("取消", key=f"cancel_{delete_key}", type="secondary", use_container_width=True):
+                    st.session_state.delete_confirmations[delete_key] = False
+                    rerun_sheet_card()
+        else:
+            # 通常モード
+            if st.button("削除", key=delete_key, help="スプレッドシートを削除", use_container_width=True):
+                st.session_state.delete_confirmations[delete_key] = True
+                rerun_sheet_card()
+    
+    # データ確認ボタンを1行下に移動
+    display_sheet_data(sheet, sheets_manager)
+    
+    # URL表示
+    st.text_input(
+        "スプレッドシートURL",
+        value=sheet['url'],
+        key=f"url_copy_{sheet['sheet_id']}",
+        help="Ctrl+C（またはCmd+C）でコピーできます"
+    )
 
-def extract_claim_amount(row):
-    """債権額を抽出"""
-    amount_columns = ['債権額', 'claim_amount', '金額']
-    for col in amount_columns:
-        if col in row and str(row[col]).strip():
-            return row[col]
-    return "0"
+def normalize_search_text(text):
+    """検索用に文字列を正規化（全角半角・大文字小文字を統一）"""
+    return unicodedata.normalize('NFKC', str(text)).casefold().strip()
 
-def delete_sheet_row(sheets_manager, sheet_id, sheet_row):
-    """行を削除"""
+def delete_sheet_row(sheets_manager, sheet_id, record):
+    """行を削除（IDがある行はIDで行を特定し、表示後に行がずれていても正しい行を削除。論理削除の設定時は削除済みと記録）"""
     try:
-        result = sheets_manager.delete_row(sheet_id, sheet_row)
-        return result
+        if record.id is not None and SOFT_DELETE["enabled"]:
+            # ステータスに削除済みと記録するだけ（整理するまで元に戻せる）
+            if not sheets_manager.mark_creditor_deleted(sheet_id, record.id, record.sheet_row):
+                return False
+            st.session_state.soft_deleted_rows[sheet_id] = {
+                'id': record.id,
+                'sheet_row': record.sheet_row,
+                'status': record.status,
+                'company_name': record.company_name.strip() or "不明",
+            }
+            return True
+        if record.id is not None:
+            return sheets_manager.delete_creditor(sheet_id, record.id, record.sheet_row)
+        return sheets_manager.delete_row(sheet_id, record.sheet_row)
     except Exception as e:
         st.error(f"削除エラー: {str(e)}")
         return False
 
 def main():
     st.title("スプレッドシート一覧")
+    set_page("スプレッドシート一覧")
     
     try:
         sheets_manager = get_sheets_manager()
         
         if not sheets_manager.is_connected():
-            st.error("Google Sheets接続エラー")
+            from components.connection_status import render_connection_error
+            render_connection_error()
             return
         
         st.markdown('<span class="status-badge status-connected">Google Sheets 接続中</span>', unsafe_allow_html=True)
         
         # スプレッドシート一覧を取得
-        sheets = sheets_manager.get_all_spreadsheets()
+        with action("一覧表示"):
+            sheets = sheets_manager.get_all_spreadsheets()
         
         if not sheets:
             st.markdown(get_info_html("スプレッドシートが作成されていません。データを登録すると自動で作成されます。"), unsafe_allow_html=True)
@@ -227,90 +387,68 @@ def main():
             if key not in unique_sheets or sheet.get('created_at', '') > unique_sheets[key].get('created_at', ''):
                 unique_sheets[key] = sheet
         
-        sheets = list(unique_sheets.values())
-        debtor_names = sorted(list(set(sheet['debtor_name'] for sheet in sheets)))
+        sheets = sorted(unique_sheets.values(), key=lambda sheet: sheet['debtor_name'])
+        
+        # 全シートの更新状況を一括確認（Drive files.list 1回）
+        with action("一覧表示"):
+            revisions = sheets_manager.get_revision_tokens()
+        # 取り直したリビジョンには自分の書き込みも反映済み
+        st.session_state.written_sheets.clear()
+        for sheet in sheets:
+            sheet['revision'] = revisions.get(sheet['sheet_id'])
+            st.session_state.opened_revisions.setdefault(sheet['sheet_id'], sheet['revision'])
         
-        # 債務者フィルター（複数債務者がいる場合のみ表示）
-        if len(debtor_names) > 1:
-            selected_debtor = st.selectbox(
-                "債務者を選択してください",
-                options=["すべて表示"] + debtor_names,
-                key="debtor_selector"
+        render_portfolio_section(sheets_manager, sheets, revisions)
+        render_creditor_search(sheets_manager, sheets)
+        
+        # 債務者検索（複数債務者がいる場合のみ表示）
+        if len(sheets) > 1:
+            search_query = st.text_input(
+                "債務者名で検索",
+                placeholder="債務者名の一部を入力",
+                key="debtor_search"
             )
         else:
-            selected_debtor = "すべて表示"
+            search_query = ""
         
         # フィルタリング
-        if selected_debtor == "すべて表示":
-            filtered_sheets = sheets
+        query = normalize_search_text(search_query)
+        if query:
+            filtered_sheets = [sheet for sheet in sheets if query in normalize_search_text(sheet['debtor_name'])]
         else:
-            filtered_sheets = [sheet for sheet in sheets if sheet['debtor_name'] == selected_debtor]
+            filtered_sheets = sheets
+        
+        # 表示中のページのシートだけを取得・レンダリング
+        start, end = render_pagination("sheets", len(filtered_sheets), SHEETS_PER_PAGE, reset_token=query)
+        filtered_sheets = filtered_sheets[start:end]
+        
+        # 一括展開（表示中のシートをまとめて並行取得）
+        col_expand, col_collapse = st.columns(2)
+        with col_expand:
+            if st.button("すべてのデータを確認", key="expand_all", use_container_width=True):
+                for sheet in filtered_sheets:
+                    st.session_state.viewing_sheets[sheet['sheet_id']] = True
+                st.rerun()
+        with col_collapse:
+            if st.button("すべて閉じる", key="collapse_all", use_container_width=True):
+                for sheet in filtered_sheets:
+                    close_sheet_view(sheet['sheet_id'])
+                st.rerun()
+        
+        viewing_ids = [sheet['sheet_id'] for sheet in filtered_sheets if st.session_state.viewing_sheets.get(sheet['sheet_id'], False)]
+        if len(viewing_ids) > 1:
+            with st.spinner("データを読み込み中..."), action("データ確認"):
+                prefetch_sheet_data(sheets_manager, viewing_ids, revisions)
         
         # 各シートの表示
         for i, sheet in enumerate(filtered_sheets):
-            with st.container():
-                # シート情報表示
-                st.markdown(f"""
-                <div class="spreadsheet-card">
-                    <h4 class="card-header">債務者: {sheet['debtor_name']}</h4>
-                    <p class="card-subtitle">シート名: {sheet['sheet_name']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(
-                        get_green_button_html(sheet["url"], "新しいタブで開く"),
-                        unsafe_allow_html=True
-                    )
-                
-                with col2:
-                    # スプレッドシート削除（確認付き）
-                    delete_key = f"delete_sheet_{sheet['sheet_id']}"
-                    
-                    if st.session_state.delete_confirmations.get(delete_key, False):
-                        # 確認モード
-                        col_confirm, col_cancel = st.columns(2)
-                        
-                        with col_confirm:
-                            if st.button("削除実行", key=f"confirm_{delete_key}", type="primary", use_container_width=True):
-                                if sheets_manager.delete_spreadsheet(sheet['sheet_id']):
-                                    st.success("削除しました")
-                                    st.session_state.delete_confirmations[delete_key] = False
-                                    clear_sheet_cache(sheet['sheet_id'])
-                                    st.cache_resource.clear()
-                                    time.sleep(0.5)  # API制限対策
-                                    st.rerun()
-                                else:
-                                    st.error("削除に失敗しました")
-                        
-                        with col_cancel:
-                            if st.button("取消", key=f"cancel_{delete_key}", type="secondary", use_container_width=True):
-                                st.session_state.delete_confirmations[delete_key] = False
-                                st.rerun()
-                    else:
-                        # 通常モード
-                        if st.button("削除", key=delete_key, help="スプレッドシートを削除", use_container_width=True):
-                            st.session_state.delete_confirmations[delete_key] = True
-                            st.rerun()
-                
-                # データ確認ボタンを1行下に移動
-                display_sheet_data(sheet, sheets_manager)
-                
-                # URL表示
-                st.text_input(
-                    "スプレッドシートURL",
-                    value=sheet['url'],
-                    key=f"url_copy_{sheet['sheet_id']}",
-                    help="Ctrl+C（またはCmd+C）でコピーできます"
-                )
-                
-                if i < len(filtered_sheets) - 1:
-                    st.markdown("---")
+            render_sheet_card(sheet, sheets_manager)
+            
+            if i < len(filtered_sheets) - 1:
+                st.markdown("---")
         
-        if selected_debtor != "すべて表示" and not filtered_sheets:
-            st.warning(f"{selected_debtor} のスプレッドシートが見つかりません")
+        if query and not filtered_sheets:
+            st.warning(f"「{search_query}」に一致するスプレッドシートが見つかりません")
     
     except Exception as e:
         st.error(f"エラー: {e}")
@@ -318,4 +456,6 @@ def main():
         st.text(traceback.format_exc())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # ?profile=1 でページ全体の実行を計測
+    with profile_rerun("spreadsheet_list"):
+        main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import streamlit as st
+import sys
+import os
+from datetime import datetime
+
+# パスの追加
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utils.metrics import LATENCY_BUCKETS, get_metrics
+from utils.sheet_cache import get_sheet_cache
+from utils.single_flight import get_single_flight
+from utils.styles import MAIN_CSS, get_info_html
+
+# CSS適用
+st.markdown(MAIN_CSS, unsafe_allow_html=True)
+
+st.title("API診断")
+st.markdown("Google Sheets / Drive API の呼び出し回数・所要時間を、操作とページ・操作ごとに集計しています（全セッション共通）")
+
+metrics = get_metrics()
+snapshot = metrics.snapshot()
+series = snapshot["series"]
+
+st.caption(f"集計開始: {datetime.fromtimestamp(snapshot['started_at']).strftime('%Y-%m-%d %H:%M:%S')}")
+
+
+def format_bytes(size):
+    """バイト数を読みやすい単位で表示"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GB"
+
+
+def format_seconds(seconds):
+    """分位点の表示（最後の区切りを超える場合は上限超え）"""
+    if seconds is None:
+        return f"> {LATENCY_BUCKETS[-1]:g} 秒"
+    return f"≦ {seconds * 1000:,.0f} ms"
+
+
+def aggregate(keys):
+    """系列を指定した項目でまとめる"""
+    totals = {}
+    for item in series:
+        key = tuple(item[k] for k in keys)
+        total = totals.setdefault(key, {"requests": 0, "errors": 0, "retries": 0, "bytes": 0, "seconds": 0.0})
+        total["requests"] += item["requests"]
+        total["errors"] += item["requests"] if item["status"] != "ok" else 0
+        total["retries"] += item["retries"]
+        total["bytes"] += item["bytes_sent"] + item["bytes_received"]
+        total["seconds"] += item["seconds"]
+    return sorted(totals.items(), key=lambda entry: entry[1]["requests"], reverse=True)
+
+
+if not series:
+    st.markdown(get_info_html("まだAPI呼び出しの記録がありません"), unsafe_allow_html=True)
+else:
+    # 全体
+    total_requests = sum(item["requests"] for item in series)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("リクエスト数", f"{total_requests:,}")
+    col2.metric("エラー", f"{sum(item['requests'] for item in series if item['status'] != 'ok'):,}")
+    col3.metric("再試行", f"{sum(item['retries'] for item in series):,}")
+    col4.metric("送受信量", format_bytes(sum(item["bytes_sent"] + item["bytes_received"] for item in series)))
+
+    # クォータのバケット別
+    st.markdown("### クォータ別")
+    st.dataframe(
+        [
+            {"バケット": bucket, "リクエスト数": total["requests"], "エラー": total["errors"], "再試行": total["retries"]}
+            for (bucket,), total in aggregate(["bucket"])
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # 操作別
+    st.markdown("### 操作別")
+    quantiles = snapshot["quantiles"]
+    st.dataframe(
+        [
+            {
+                "操作": operation,
+                "バケット": bucket,
+                "リクエスト数": total["requests"],
+                "エラー": total["errors"],
+                "再試行": total["retries"],
+                "平均": f"{total['seconds'] / total['requests'] * 1000:,.0f} ms",
+                "p50": format_seconds(quantiles[operation]["p50"]),
+                "p95": format_seconds(quantiles[operation]["p95"]),
+                "送受信量": format_bytes(total["bytes"]),
+            }
+            for (operation, bucket), total in aggregate(["operation", "bucket"])
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # ページ・操作別
+    st.markdown("### ページ・操作別")
+    st.dataframe(
+        [
+            {
+                "ページ": page,
+                "操作": action_name,
+                "リクエスト数": total["requests"],
+                "エラー": total["errors"],
+                "合計時間": f"{total['seconds']:,.1f} 秒",
+                "送受信量": format_bytes(total["bytes"]),
+            }
+            for (page, action_name), total in aggregate(["page", "action"])
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    # 所要時間の分布
+    st.markdown("### 所要時間の分布")
+    latency = snapshot["latency"]
+    operation = st.selectbox("操作", list(latency), key="latency_operation")
+    if operation:
+        previous = 0
+        distribution = {}
+        for bound, cumulative in latency[operation]["buckets"].items():
+            label = f"{float(bound) * 1000:,.0f} ms以下" if bound != "+Inf" else f"{LATENCY_BUCKETS[-1]:g} 秒超"
+            distribution[label] = cumulative - previous
+            previous = cumulative
+        st.bar_chart(distribution, x_label="所要時間", y_label="件数")
+
+# キャッシュ・リクエスト集約の状況
+st.markdown("### キャッシュ")
+cache_stats = get_sheet_cache().stats()
+lookups = cache_stats["hits"] + cache_stats["misses"]
+col1, col2, col3 = st.columns(3)
+col1.metric("シートデータキャッシュ", f"{cache_stats['entries']:,}件", format_bytes(cache_stats["bytes"]), delta_color="off")
+col2.metric("キャッシュヒット率", f"{cache_stats['hits'] / lookups:.0%}" if lookups else "-")
+col3.metric("同時読み込みの集約", f"{get_single_flight().shared:,}回")
+
+# 監視用の出力
+st.markdown("---")
+st.markdown("### 出力")
+col_prometheus, col_json, col_reset = st.columns(3)
+with col_prometheus:
+    st.download_button(
+        "Prometheus形式",
+        data=metrics.to_prometheus(),
+        file_name="sheets_api_metrics.prom",
+        mime="text/plain",
+        use_container_width=True
+    )
+with col_json:
+    st.download_button(
+        "JSON",
+        data=metrics.to_json(),
+        file_name="sheets_api_metrics.json",
+        mime="application/json",
+        use_container_width=True
+    )
+with col_reset:
+    if st.button("集計をリセット", key="reset_metrics", use_container_width=True):
+        metrics.reset()
+        st.rerun()
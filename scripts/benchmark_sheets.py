@@ -0,0 +1,304 @@
+"""
+SheetsManager のAPI呼び出し回数ベンチマーク
+
+メモリ上の gspread 互換バックエンド（fake_gspread.py）で SheetsManager を動かし、
+登録・一括取り込み・一覧・整理・削除・エクスポート・全シートの並行取得の各操作でのAPI呼び出し回数と
+所要時間を計測する。APIのメソッドごとの呼び出し回数が予算（api_call_budget.json、
+予算にないメソッドは0回）を超えた場合、回数が決まっている操作（EXPECTED_CALLS）の回数が
+異なる場合、またはクォータ超過（429）が発生した場合は終了コード1で失敗する。
+
+予算は設計上の回数から決めている（計測値をそのまま予算にしない）。例えば登録は1件ごとに
+values.append 1回とシートを開く spreadsheets.get 1回、drive.files.list はリビジョン確認1回と
+新しい債務者ごとの検索1回まで。
+
+使い方:
+    python scripts/benchmark_sheets.py                 # 予算と比較してチェック
+    python scripts/benchmark_sheets.py --latency 0.05  # 1回の呼び出しごとに50ミリ秒の遅延
+    python scripts/benchmark_sheets.py --update        # 現在の計測値で予算を更新（設計上の回数と見比べて確認すること）
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import CREDITOR_FIELDS
+from fake_gspread import FakeGoogleBackend
+
+BUDGET_FILE = os.path.join(PROJECT_ROOT, "scripts", "api_call_budget.json")
+
+# 既存データの規模
+DEBTORS = 10
+ROWS_PER_SHEET = 50
+
+# 既存シートへの連続登録の件数（1件ごとに values.append 1回、files.list なしで登録できること）
+INSERT_COUNT = 20
+
+# 呼び出し回数が決まっている操作（シナリオ名 -> {APIのメソッド名: 回数}）
+EXPECTED_CALLS = {
+    "insert": {"values.append": INSERT_COUNT, "drive.files.list": 0},
+}
+
+# まとめて並行取得するシート数（同時実行数の上限8と既定のスレッドプールの最大32スレッドの合計より多い）
+PREFETCH_SHEETS = 48
+
+# シナリオの制限時間（秒、超えた場合は処理が止まっているとみなして失敗）
+SCENARIO_TIMEOUT_SECONDS = 120
+
+# Sheets API のユーザーあたりの既定クォータ（毎分）
+READ_PER_MINUTE = 300
+WRITE_PER_MINUTE = 300
+
+
+def creditor_data(debtor_name, number):
+    """入力データ（英語キー）"""
+    return {
+        "debtor_name": debtor_name,
+        "company_name": f"債権者{number:04d}株式会社",
+        "address": f"東京都千代田区{number}丁目",
+        "claim_name": "貸付金",
+        "claim_amount": str(10000 * (number + 1)),
+        "contract_date": "2024年01月15日",
+    }
+
+
+def sheet_values(debtor_name, rows):
+    """既存シートの値（ヘッダー行＋データ行）"""
+    values = [list(CREDITOR_FIELDS)]
+    for number in range(rows):
+        row = [""] * len(CREDITOR_FIELDS)
+        row[0] = str(number + 1)
+        row[1] = debtor_name
+        row[2] = f"債権者{number:04d}株式会社"
+        row[8] = "貸付金"
+        row[9] = f"{10000 * (number + 1):,}"
+        row[17] = "未確認"
+        values.append(row)
+    return values
+
+
+def create_environment(latency):
+    """既存の債務者シート入りのバックエンドと、それを使う SheetsManager を作成"""
+    from utils.debtor_index import DebtorIndex
+    from utils.sheet_cache import SheetDataCache
+    from utils.sheet_index import SheetIndexStore
+    from utils.sheets_manager import SheetsManager
+    from utils.single_flight import SingleFlight
+
+    backend = FakeGoogleBackend(latency=latency, read_per_minute=READ_PER_MINUTE, write_per_minute=WRITE_PER_MINUTE)
+    for number in range(DEBTORS):
+        debtor_name = f"債務者{number:02d}"
+        backend.add_spreadsheet(f"債権者データ_{debtor_name}_20240101_000000", sheet_values(debtor_name, ROWS_PER_SHEET))
+
+    manager = SheetsManager(client=backend.client())
+    # 共有キャッシュはシナリオごとに空の状態から計測
+    manager.cache = SheetDataCache()
+    manager.indexes = SheetIndexStore()
+    manager.debtors = DebtorIndex()
+    manager.flights = SingleFlight()
+    return backend, manager
+
+
+def scenario_register(manager):
+    """手入力の登録（既存の債務者に10件、新しい債務者に10件）"""
+    for debtor_name in ("債務者00", "新規債務者"):
+        for number in range(10):
+            spreadsheet = manager.get_or_create_spreadsheet(debtor_name)
+            manager.add_data(spreadsheet, creditor_data(debtor_name, 1000 + number))
+
+
+def prepare_insert(manager):
+    """連続登録の準備（シートを検索してインデックスを作成済みの状態にする）"""
+    manager.get_sheet_index(manager.get_or_create_spreadsheet("債務者06"))
+
+
+def scenario_insert(manager):
+    """既存の債務者シートへの連続登録（インデックス作成済みのシートに20件）"""
+    spreadsheet = manager.get_or_create_spreadsheet("債務者06")
+    for number in range(INSERT_COUNT):
+        manager.add_data(spreadsheet, creditor_data("債務者06", 3000 + number))
+
+
+def scenario_bulk_import(manager):
+    """一括取り込み（既存の債務者3名・新しい債務者3名に計300件）"""
+    from utils.import_pipeline import ImportPipeline
+
+    debtor_names = ["債務者01", "債務者02", "債務者03", "新規債務者A", "新規債務者B", "新規債務者C"]
+    records = (creditor_data(debtor_names[number % len(debtor_names)], 2000 + number) for number in range(300))
+    ImportPipeline(manager, set()).run_records(records)
+
+
+def scenario_list(manager):
+    """一覧ページの表示（一覧とリビジョンを2回表示）"""
+    for _ in range(2):
+        manager.get_all_spreadsheets()
+        manager.get_revision_tokens()
+
+
+def scenario_compact(manager):
+    """論理削除した10行をシート整理でまとめて削除"""
+    sheet_id = next(manager.iter_debtor_spreadsheets("債務者04"))["id"]
+    for record_id in range(1, 21, 2):
+        manager.mark_creditor_deleted(sheet_id, record_id)
+    manager.purge_deleted_rows(sheet_id)
+
+
+def scenario_delete(manager):
+    """一覧ページから10行を削除"""
+    sheet_id = next(manager.iter_debtor_spreadsheets("債務者05"))["id"]
+    revision = manager.get_revision_tokens([sheet_id]).get(sheet_id)
+    manager.get_cached_data(sheet_id, revision)
+    for record_id in range(1, 11):
+        manager.delete_creditor(sheet_id, record_id)
+
+
+def prepare_prefetch_many(manager):
+    """並行取得の準備（同時実行数の上限と既定のスレッドプールの最大スレッド数の合計を超える数のシートを追加）"""
+    backend = manager.client.backend
+    for number in range(PREFETCH_SHEETS - DEBTORS):
+        debtor_name = f"追加債務者{number:02d}"
+        backend.add_spreadsheet(f"債権者データ_{debtor_name}_20240101_000000", sheet_values(debtor_name, 5))
+
+
+def scenario_prefetch_many(manager):
+    """一覧・横断検索・全体集計と同じく、全債務者のシートをまとめて並行取得"""
+    revisions = manager.get_revision_tokens()
+    manager.get_cached_data_many(list(revisions), revisions)
+
+
+def scenario_export(manager):
+    """エクスポート用に全債務者のデータを2回読み込み（2回目はキャッシュ）"""
+    from utils.data_handler import DataHandler
+
+    data_handler = DataHandler(manager)
+    sheet_ids = [sheet["sheet_id"] for sheet in manager.get_all_spreadsheets()]
+    for _ in range(2):
+        for sheet_id in sheet_ids:
+            data_handler.handle_dataframe_conversion(data_handler.safe_get_cached_data(sheet_id))
+
+
+SCENARIOS = {
+    "register": scenario_register,
+    "insert": scenario_insert,
+    "bulk_import": scenario_bulk_import,
+    "list": scenario_list,
+    "compact": scenario_compact,
+    "delete": scenario_delete,
+    "export": scenario_export,
+    "prefetch_many": scenario_prefetch_many,
+}
+
+# シナリオの前に計測せずに行う準備
+PREPARATIONS = {
+    "insert": prepare_insert,
+    "prefetch_many": prepare_prefetch_many,
+}
+
+
+def run_scenario(name, latency):
+    """シナリオを実行してAPI呼び出し回数と所要時間を取得"""
+    backend, manager = create_environment(latency)
+    if name in PREPARATIONS:
+        # 準備の呼び出しは計測しない
+        PREPARATIONS[name](manager)
+        backend.reset_calls()
+    started = time.perf_counter()
+    # 処理が止まった場合も結果を出せるよう、別スレッドで実行して制限時間まで待つ
+    runner = threading.Thread(target=SCENARIOS[name], args=(manager,), daemon=True)
+    runner.start()
+    runner.join(SCENARIO_TIMEOUT_SECONDS)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return {
+        "timed_out": runner.is_alive(),
+        "calls": sum(backend.calls.values()),
+        "by_method": dict(sorted(backend.calls.items())),
+        "rejected": sum(backend.rejected.values()),
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+
+def load_budget():
+    """予算ファイルを読み込み"""
+    try:
+        with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_budget(budget):
+    """予算（シナリオ名 -> {APIのメソッド名: 回数}）を予算ファイルに保存"""
+    with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+        json.dump(budget, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SheetsManager のAPI呼び出し回数ベンチマーク")
+    parser.add_argument("--update", action="store_true", help="現在の計測値で予算を更新")
+    parser.add_argument("--latency", type=float, default=0.0, help="1回の呼び出しごとの遅延（秒）")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="実行するシナリオ（複数指定可）")
+    args = parser.parse_args()
+
+    # ベアモード実行時の警告を抑止
+    from streamlit.logger import set_log_level
+    set_log_level(logging.ERROR)
+
+    budget = load_budget()
+    results = {}
+    failures = []
+
+    for name in args.scenario or SCENARIOS:
+        result = run_scenario(name, args.latency)
+        results[name] = result
+
+        print(f"{name}: {result['calls']} calls, {result['elapsed_ms']:.1f} ms")
+        for method, count in result["by_method"].items():
+            print(f"    {count:6d}  {method}")
+
+        if result["timed_out"]:
+            failures.append(f"{name}: {SCENARIO_TIMEOUT_SECONDS} 秒以内に終わりません（処理が止まっている可能性があります）")
+
+        if result["rejected"]:
+            failures.append(f"{name}: クォータ超過で {result['rejected']} 回拒否されました")
+
+        for method, expected in EXPECTED_CALLS.get(name, {}).items():
+            actual = result["by_method"].get(method, 0)
+            if actual != expected:
+                failures.append(f"{name}: {method} が {actual} 回です（期待値 {expected} 回）")
+
+        if name in budget:
+            for method, count in result["by_method"].items():
+                limit = budget[name].get(method, 0)
+                if count > limit:
+                    failures.append(f"{name}: {method} {count} 回が予算 {limit} 回を超えています")
+
+    if args.update:
+        updated = {**budget, **{name: result["by_method"] for name, result in results.items()}}
+        save_budget({name: updated[name] for name in SCENARIOS if name in updated})
+        print(f"予算を更新しました: {os.path.relpath(BUDGET_FILE, PROJECT_ROOT)}")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"NG {failure}")
+        if any(result["timed_out"] for result in results.values()):
+            # 止まったスレッドの終了を待たずに終了する（終了時のスレッドプールの後始末で止まるため）
+            sys.stdout.flush()
+            os._exit(1)
+        return 1
+
+    print()
+    print("OK すべてのシナリオが予算内です")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+ページ起動時のインポート時間チェック
+
+各ページを `python -X importtime` 付きでベアモード実行し、
+streamlit 本体を除いたインポート時間と読み込まれたモジュールを記録する。
+重いモジュール（pandas, openpyxl, docx, gspread など）が起動時に読み込まれた場合、
+または予算（import_budget.json）を超えた場合は終了コード1で失敗する。
+
+使い方:
+    python scripts/check_import_time.py            # 予算と比較してチェック
+    python scripts/check_import_time.py --update   # 現在の計測値で予算を更新
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(PROJECT_ROOT, "scripts", "import_budget.json")
+
+PAGES = [
+    "main.py",
+    "pages/1_json_import.py",
+    "pages/2_manual_input.py",
+    "pages/3_spreadsheet_list.py",
+    "pages/4_export.py",
+    "pages/5_registry_management.py",
+    "pages/6_diagnostics.py",
+]
+
+# 起動時に読み込んではいけない重いモジュール（描画・データ処理・認証時に遅延読み込みする）
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "openpyxl", "docx", "gspread", "google.auth"]
+
+# 予算に対する許容超過率（計測のばらつきを吸収）
+TOLERANCE = 0.5
+
+# 予算の下限（ミリ秒）。小さすぎる値でのばらつきによる誤検知を防ぐ
+MIN_BUDGET_MS = 30.0
+
+MARKER = "__page_import_start__"
+
+# ベアモードでは st.stop() がスクリプトを止めないため、実行時と同様に停止させる
+HARNESS = f"""
+import runpy, sys
+import streamlit
+
+def _stop():
+    raise SystemExit(0)
+
+streamlit.stop = _stop
+sys.stderr.write("{MARKER}\\n")
+sys.stderr.flush()
+try:
+    runpy.run_path(sys.argv[1], run_name="__main__")
+except SystemExit:
+    # スタブ化した st.stop() による停止のみ正常終了とみなす
+    pass
+"""
+
+
+def profile_page(page):
+    """ページを実行してstreamlit以降に読み込まれたモジュールのインポート時間を取得"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", HARNESS, page],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    if result.returncode != 0:
+        # インポートエラーや実行時の例外で停止したページは計測結果を信用しない
+        return {"total_ms": 0.0, "modules": {}, "error": result.stderr.strip().splitlines()[-1:] or ["不明なエラー"]}
+
+    lines = result.stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+
+    modules = {}
+    total_us = 0
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_part, _, name = line.split(":", 1)[1].split("|", 2)
+            self_us = int(self_part)
+        except ValueError:
+            continue
+        name = name.strip()
+        # streamlit 内部の遅延読み込みはアプリ側で制御できないため対象外
+        if name == "streamlit" or name.startswith("streamlit."):
+            continue
+        modules[name] = self_us
+        total_us += self_us
+
+    return {"total_ms": round(total_us / 1000, 1), "modules": modules}
+
+
+def find_heavy_modules(modules):
+    """読み込まれた重いモジュールを抽出"""
+    found = []
+    for heavy in HEAVY_MODULES:
+        if any(name == heavy or name.startswith(heavy + ".") for name in modules):
+            found.append(heavy)
+    return found
+
+
+def load_budget():
+    """予算ファイルを読み込み"""
+    try:
+        with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_budget(profiles):
+    """計測値を予算ファイルに保存"""
+    budget = {page: {"total_ms": max(profile["total_ms"], MIN_BUDGET_MS)} for page, profile in profiles.items()}
+    with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+        json.dump(budget, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ページ起動時のインポート時間をチェック")
+    parser.add_argument("--update", action="store_true", help="現在の計測値で予算を更新")
+    parser.add_argument("--top", type=int, default=5, help="表示する遅いモジュールの数")
+    args = parser.parse_args()
+
+    budget = load_budget()
+    profiles = {}
+    failures = []
+
+    for page in PAGES:
+        profile = profile_page(page)
+        if profile.get("error"):
+            print(f"{page}: 実行エラー")
+            failures.append(f"{page}: ページの実行に失敗しました: {profile['error'][0]}")
+            # --update 時も失敗したページの予算は据え置く
+            profiles[page] = {"total_ms": budget.get(page, {}).get("total_ms", MIN_BUDGET_MS)}
+            continue
+        profiles[page] = profile
+
+        slowest = sorted(profile["modules"].items(), key=lambda x: x[1], reverse=True)[:args.top]
+        print(f"{page}: {profile['total_ms']:.1f} ms ({len(profile['modules'])} modules)")
+        for name, self_us in slowest:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+        heavy = find_heavy_modules(profile["modules"])
+        if heavy:
+            failures.append(f"{page}: 起動時に重いモジュールを読み込んでいます: {', '.join(heavy)}")
+
+        page_budget = budget.get(page, {}).get("total_ms")
+        if page_budget is not None and profile["total_ms"] > page_budget * (1 + TOLERANCE):
+            failures.append(f"{page}: インポート時間 {profile['total_ms']:.1f} ms が予算 {page_budget:.1f} ms を超えています")
+
+    if args.update:
+        save_budget(profiles)
+        print(f"予算を更新しました: {os.path.relpath(BUDGET_FILE, PROJECT_ROOT)}")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"NG {failure}")
+        return 1
+
+    print()
+    print("OK すべてのページが予算内です")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,433 @@
+"""
+メモリ上の gspread 互換バックエンド（ベンチマーク・動作確認用）
+
+SheetsManager が使う gspread クライアントの範囲（open_by_key, create, del_spreadsheet,
+list_spreadsheet_files, http_client の values_get と Drive API、Spreadsheet の sheet1・
+batch_update・share、Worksheet の get_all_values・update・update_cell・append_rows・
+batch_clear・delete_rows・row_values・format）をメモリ上で再現する。
+認証情報なしで SheetsManager を動かし、API呼び出し回数を数えるために使う。
+
+呼び出しはAPIのメソッド名（values.get, spreadsheets.batchUpdate, drive.files.list など）ごとに
+数え、1回ごとの遅延と毎分のリクエスト数の上限（超えた場合は429相当のエラー）を設定できる。
+
+使い方:
+    backend = FakeGoogleBackend(latency=0.05, read_per_minute=300)
+    manager = SheetsManager(client=backend.client())
+    ...
+    print(backend.calls)
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from utils.quota_scheduler import request_slot
+
+# 範囲指定（A:Z、'シート名'!A:Z など）の列部分
+_RANGE_COLUMNS = re.compile(r"^(?:'(?:[^']|'')*'!|[^!]*!)?([A-Z]+)\d*(?::([A-Z]+)\d*)?$")
+_CELL = re.compile(r"^([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$")
+_NAME_CONTAINS = re.compile(r"name contains '((?:[^'\\]|\\.)*)'")
+_FIELDS = re.compile(r"files\(([^)]*)\)")
+
+# 読み取りとして数える呼び出し（それ以外は書き込み）
+READ_METHODS = {"values.get", "spreadsheets.get", "drive.files.list"}
+
+
+class FakeAPIError(Exception):
+    """APIエラー（クォータ超過は code=429、存在しないファイルは code=404）"""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord("A") + 1
+    return number
+
+
+def _column_letters(number):
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeWorksheet:
+    """先頭シート（セルは文字列の2次元配列で保持）"""
+
+    def __init__(self, spreadsheet, sheet_id=0):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.rows = []
+
+    @property
+    def _backend(self):
+        return self.spreadsheet.backend
+
+    def _trimmed(self):
+        """末尾の空セル・空行を除いた値（APIの応答と同じ形）"""
+        rows = [list(row) for row in self.rows]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def _set_cell(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append("")
+        cells[col - 1] = "" if value is None else str(value)
+
+    def get_all_values(self):
+        """全ての値（gspreadと同じく長方形に埋めて返す）"""
+        self._backend.call("values.get")
+        with self._backend.lock:
+            rows = self._trimmed()
+        width = max((len(row) for row in rows), default=0)
+        return [row + [""] * (width - len(row)) for row in rows]
+
+    def row_values(self, row):
+        self._backend.call("values.get")
+        with self._backend.lock:
+            rows = self._trimmed()
+        return list(rows[row - 1]) if row <= len(rows) else []
+
+    def update(self, values=None, range_name=None, **kwargs):
+        """範囲に値を書き込み（旧来の update(範囲, 値) の順にも対応）"""
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        self._backend.call("values.update")
+        match = _CELL.match(range_name.split("!")[-1])
+        start_row, start_col = int(match.group(2)), _column_number(match.group(1))
+        with self._backend.lock:
+            for r, row in enumerate(values):
+                for c, value in enumerate(row):
+                    self._set_cell(start_row + r, start_col + c, value)
+            self.spreadsheet.touch()
+        return {"updatedRange": range_name}
+
+    def update_cell(self, row, col, value):
+        self._backend.call("values.update")
+        with self._backend.lock:
+            self._set_cell(row, col, value)
+            self.spreadsheet.touch()
+        return {"updatedRange": f"{_column_letters(col)}{row}"}
+
+    def append_rows(self, values, value_input_option="RAW", insert_data_option=None, table_range=None, **kwargs):
+        """
+        表の末尾に行を追加（values.append）
+
+        APIと同じく、先頭行から続く表（最初の空行の手前まで）の下に追加する。そのため途中に空行がある
+        シートでは空行の位置に追加され、INSERT_ROWS の場合はそれより下の行が追加した行数分ずれる。
+        """
+        self._backend.call("values.append")
+        with self._backend.lock:
+            table_end = 0
+            while table_end < len(self.rows) and any(cell != "" for cell in self.rows[table_end]):
+                table_end += 1
+            start = table_end + 1
+            if insert_data_option == "INSERT_ROWS" and table_end < len(self.rows):
+                self.rows[table_end:table_end] = [[] for _ in values]
+            for offset, row in enumerate(values):
+                for col, value in enumerate(row, start=1):
+                    self._set_cell(start + offset, col, value)
+            self.spreadsheet.touch()
+        width = max((len(row) for row in values), default=1)
+        end = start + len(values) - 1
+        return {
+            "spreadsheetId": self.spreadsheet.id,
+            "updates": {
+                "updatedRange": f"'シート1'!A{start}:{_column_letters(width)}{end}",
+                "updatedRows": len(values),
+            },
+        }
+
+    def batch_clear(self, ranges):
+        self._backend.call("values.batchClear")
+        with self._backend.lock:
+            for range_name in ranges:
+                match = _CELL.match(range_name.split("!")[-1])
+                first_col, first_row = _column_number(match.group(1)), int(match.group(2))
+                last_col = _column_number(match.group(3) or match.group(1))
+                last_row = int(match.group(4) or match.group(2))
+                for row in range(first_row, min(last_row, len(self.rows)) + 1):
+                    cells = self.rows[row - 1]
+                    for col in range(first_col, min(last_col, len(cells)) + 1):
+                        cells[col - 1] = ""
+            self.spreadsheet.touch()
+        return {}
+
+    def delete_rows(self, start_index, end_index=None):
+        self._backend.call("spreadsheets.batchUpdate")
+        with self._backend.lock:
+            self._delete_rows(start_index - 1, end_index or start_index)
+            self.spreadsheet.touch()
+        return {}
+
+    def _delete_rows(self, start, end):
+        """0始まり・終端を含まない範囲の行を削除（ロック取得済みで呼ぶ）"""
+        del self.rows[start:end]
+
+    def format(self, ranges, format=None):
+        self._backend.call("spreadsheets.batchUpdate")
+        return {}
+
+
+class FakeSpreadsheet:
+    """スプレッドシート（Driveのファイル情報を含む）"""
+
+    def __init__(self, backend, sheet_id, name):
+        self.backend = backend
+        self.id = sheet_id
+        self.name = name
+        self.created_time = self.modified_time = _now()
+        self.version = 1
+        self.trashed = False
+        self.permission_ids = []
+        self.sheet1 = FakeWorksheet(self)
+
+    @property
+    def title(self):
+        return self.name
+
+    def touch(self):
+        """書き込み後にDriveのversionと更新日時を進める（ロック取得済みで呼ぶ）"""
+        self.version += 1
+        self.modified_time = _now()
+
+    def batch_update(self, body):
+        """updateCells（値）と deleteDimension（行削除）に対応"""
+        self.backend.call("spreadsheets.batchUpdate")
+        with self.backend.lock:
+            for request in body.get("requests", []):
+                if "updateCells" in request:
+                    update = request["updateCells"]
+                    grid = update["range"]
+                    for r, row in enumerate(update.get("rows", [])):
+                        for c, cell in enumerate(row.get("values", [])):
+                            value = cell.get("userEnteredValue", {})
+                            if value:
+                                self.sheet1._set_cell(
+                                    grid.get("startRowIndex", 0) + r + 1,
+                                    grid.get("startColumnIndex", 0) + c + 1,
+                                    next(iter(value.values()))
+                                )
+                elif "deleteDimension" in request:
+                    grid = request["deleteDimension"]["range"]
+                    if grid.get("dimension") == "ROWS":
+                        self.sheet1._delete_rows(grid["startIndex"], grid["endIndex"])
+            self.touch()
+        return {"spreadsheetId": self.id, "replies": [{} for _ in body.get("requests", [])]}
+
+    def share(self, email_address, perm_type, role, notify=True, **kwargs):
+        self.backend.call("drive.permissions.create")
+        with self.backend.lock:
+            permission_id = "anyoneWithLink" if perm_type == "anyone" else f"user:{email_address}"
+            if permission_id not in self.permission_ids:
+                self.permission_ids.append(permission_id)
+        return _FakeResponse({"id": permission_id})
+
+    def file_info(self):
+        """Drive files.list の1件分"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "createdTime": self.created_time,
+            "modifiedTime": self.modified_time,
+            "version": str(self.version),
+            "permissionIds": list(self.permission_ids),
+            "mimeType": "application/vnd.google-apps.spreadsheet",
+        }
+
+
+class FakeHTTPClient:
+    """gspread の HTTPClient のうち values_get と Drive API（request）"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def values_get(self, sheet_id, range_name, params=None):
+        self.backend.call("values.get")
+        spreadsheet = self.backend.get(sheet_id)
+        match = _RANGE_COLUMNS.match(range_name)
+        last_col = _column_number(match.group(2) or match.group(1)) if match else None
+        with self.backend.lock:
+            rows = spreadsheet.sheet1._trimmed()
+        if last_col is not None:
+            rows = [row[:last_col] for row in rows]
+        cell = _CELL.match(range_name.split("!")[-1])
+        if cell:
+            # 行を指定した範囲（A5、A5:T7 など）
+            first_row = int(cell.group(2))
+            rows = rows[first_row - 1:int(cell.group(4) or cell.group(2))]
+        return {"range": range_name, "majorDimension": "ROWS", "values": rows}
+
+    def request(self, method, endpoint, params=None, json=None, **kwargs):
+        """Drive API v3 の files.list と files.update（名前の変更）"""
+        params = params or {}
+        path = endpoint.split("/drive/v3/files", 1)[-1].strip("/")
+        if method.lower() == "get" and not path:
+            self.backend.call("drive.files.list")
+            return _FakeResponse(self.backend.list_files(
+                params.get("q", ""), params.get("fields", ""),
+                int(params.get("pageSize", 100)), params.get("pageToken")
+            ))
+        if method.lower() == "patch" and path:
+            self.backend.call("drive.files.update")
+            spreadsheet = self.backend.get(path)
+            with self.backend.lock:
+                if json and "name" in json:
+                    spreadsheet.name = json["name"]
+                spreadsheet.modified_time = _now()
+            return _FakeResponse(spreadsheet.file_info())
+        raise FakeAPIError(400, f"未対応のリクエストです: {method} {endpoint}")
+
+
+class FakeClient:
+    """gspread.Client 互換のクライアント"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.http_client = FakeHTTPClient(backend)
+
+    def open_by_key(self, key):
+        self.backend.call("spreadsheets.get")
+        return self.backend.get(key)
+
+    def create(self, title, folder_id=None):
+        self.backend.call("drive.files.create")
+        return self.backend.create(title)
+
+    def del_spreadsheet(self, file_id):
+        self.backend.call("drive.files.delete")
+        spreadsheet = self.backend.get(file_id)
+        with self.backend.lock:
+            spreadsheet.trashed = True
+
+    def list_spreadsheet_files(self, title=None, folder_id=None):
+        self.backend.call("drive.files.list")
+        with self.backend.lock:
+            return [
+                spreadsheet.file_info() for spreadsheet in self.backend.spreadsheets.values()
+                if not spreadsheet.trashed and (title is None or spreadsheet.name == title)
+            ]
+
+
+class FakeGoogleBackend:
+    """
+    メモリ上のGoogle Sheets / Drive
+
+    Args:
+        latency: 1回の呼び出しごとの遅延（秒）
+        read_per_minute: 毎分の読み取り回数の上限（Noneで無制限）
+        write_per_minute: 毎分の書き込み回数の上限（Noneで無制限）
+    """
+
+    def __init__(self, latency=0.0, read_per_minute=None, write_per_minute=None):
+        self.latency = latency
+        self.quotas = {"read": read_per_minute, "write": write_per_minute}
+        self.spreadsheets = {}
+        self.calls = Counter()
+        self.rejected = Counter()
+        self.lock = threading.RLock()
+        self._recent = {"read": deque(), "write": deque()}
+        self._next_id = 1
+
+    def client(self):
+        return FakeClient(self)
+
+    def call(self, method):
+        """
+        呼び出しを記録し、クォータの確認と遅延を行う
+
+        実際のHTTPセッション（InstrumentedSession）と同じく、QuotaScheduler.per_request の
+        ブロック内では1回ごとにクォータと同時実行枠を確保する。
+        """
+        bucket = "read" if method in READ_METHODS else "write"
+        limit = self.quotas[bucket]
+        with request_slot(bucket):
+            with self.lock:
+                if limit is not None:
+                    recent = self._recent[bucket]
+                    now = time.monotonic()
+                    while recent and now - recent[0] >= 60:
+                        recent.popleft()
+                    if len(recent) >= limit:
+                        self.rejected[method] += 1
+                        raise FakeAPIError(429, f"Quota exceeded for {bucket} requests per minute")
+                    recent.append(now)
+                self.calls[method] += 1
+            if self.latency:
+                time.sleep(self.latency)
+
+    def reset_calls(self):
+        with self.lock:
+            self.calls.clear()
+            self.rejected.clear()
+
+    def get(self, sheet_id):
+        with self.lock:
+            spreadsheet = self.spreadsheets.get(sheet_id)
+        if spreadsheet is None or spreadsheet.trashed:
+            raise FakeAPIError(404, f"Requested entity was not found: {sheet_id}")
+        return spreadsheet
+
+    def create(self, title):
+        with self.lock:
+            sheet_id = f"fake-sheet-{self._next_id:05d}"
+            self._next_id += 1
+            spreadsheet = self.spreadsheets[sheet_id] = FakeSpreadsheet(self, sheet_id, title)
+        return spreadsheet
+
+    def add_spreadsheet(self, title, values, shared=True):
+        """呼び出し回数に数えずにデータ入りのスプレッドシートを用意"""
+        spreadsheet = self.create(title)
+        with self.lock:
+            spreadsheet.sheet1.rows = [[str(cell) for cell in row] for row in values]
+            if shared:
+                spreadsheet.permission_ids.append("anyoneWithLink")
+        return spreadsheet
+
+    def list_files(self, query, fields, page_size, page_token=None):
+        """files.list（name contains と trashed = false の条件に対応）"""
+        names = [name.replace("\\'", "'").replace("\\\\", "\\") for name in _NAME_CONTAINS.findall(query)]
+        include_trashed = "trashed = false" not in query
+        match = _FIELDS.search(fields)
+        file_fields = [field.strip() for field in match.group(1).split(",")] if match else None
+
+        with self.lock:
+            files = [
+                spreadsheet.file_info() for spreadsheet in self.spreadsheets.values()
+                if (include_trashed or not spreadsheet.trashed)
+                and all(name in spreadsheet.name for name in names)
+            ]
+
+        start = int(page_token or 0)
+        page = files[start:start + page_size]
+        if file_fields:
+            page = [{field: file[field] for field in file_fields if field in file} for file in page]
+        response = {"files": page}
+        if start + page_size < len(files):
+            response["nextPageToken"] = str(start + page_size)
+        return response
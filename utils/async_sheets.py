@@ -0,0 +1,46 @@
+"""
+Google Sheets 非同期クライアント
+
+共有HTTPセッション（接続プール・トークン自動更新付き）上で、
+複数スプレッドシートの値を asyncio で並行取得する。
+同時実行数と毎分のリクエスト数はクォータスケジューラで制限する。
+同じシート・範囲の取得が他で実行中の場合はその結果を共有する（シングルフライト）。
+"""
+
+import asyncio
+from utils.quota_scheduler import get_quota_scheduler
+from utils.single_flight import get_single_flight
+
+# 先頭シートの全データ範囲（シート名なしのA1表記は先頭シートを指す）
+DEFAULT_VALUES_RANGE = "A:Z"
+
+
+class AsyncSheetsClient:
+    """複数シートの値を並行して取得するクライアント"""
+
+    def __init__(self, client, scheduler=None, flights=None):
+        self.client = client
+        self.scheduler = scheduler or get_quota_scheduler()
+        self.flights = flights or get_single_flight()
+
+    async def get_values(self, sheet_id, range_name=DEFAULT_VALUES_RANGE):
+        """1シートの値を取得（行の配列）"""
+        async def fetch():
+            response = await self.scheduler.call_async(
+                "read", self.client.http_client.values_get, sheet_id, range_name
+            )
+            return response.get("values", [])
+
+        return await self.flights.do_async((sheet_id, range_name), fetch)
+
+    async def get_values_many(self, sheet_ids, range_name=DEFAULT_VALUES_RANGE):
+        """複数シートの値を並行取得（失敗したシートは例外オブジェクトを返す）"""
+        results = await asyncio.gather(
+            *(self.get_values(sheet_id, range_name) for sheet_id in sheet_ids),
+            return_exceptions=True
+        )
+        return dict(zip(sheet_ids, results))
+
+    def fetch_many(self, sheet_ids, range_name=DEFAULT_VALUES_RANGE):
+        """同期コードから複数シートを並行取得"""
+        return asyncio.run(self.get_values_many(list(sheet_ids), range_name))
@@ -0,0 +1,196 @@
+"""
+債権者レコード
+
+スプレッドシートの行（日本語ヘッダーの文字列）を、I/O境界で1回だけ
+型付きの CreditorRecord に変換する。債権額は整数、日付は date、
+債権名は ClaimName として保持し、テンプレート出力用に元のセル文字列も保持する。
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from config.settings import CREDITOR_FIELDS
+
+_FIELD_INDEX = {field: i for i, field in enumerate(CREDITOR_FIELDS)}
+_DATE_PATTERN = re.compile(r'(\d{4})\D+(\d{1,2})\D+(\d{1,2})')
+_AMOUNT_STRIP = str.maketrans('', '', ',円¥ 　')
+
+
+class ClaimName(Enum):
+    """債権名（東京地裁用のコード付き）"""
+    LOAN = ('貸付金', 'A')
+    ADVANCE = ('立替金', 'B')
+    GUARANTEE = ('保証金', 'C')
+    OTHER = ('その他', 'D')
+
+    def __init__(self, label, code):
+        self.label = label
+        self.code = code
+
+    @classmethod
+    def parse(cls, text):
+        """文字列から債権名を取得（該当なしはその他）"""
+        text = str(text).strip()
+        for claim_name in cls:
+            if claim_name.label == text:
+                return claim_name
+        return cls.OTHER
+
+
+def parse_amount(text):
+    """債権額を整数に変換（カンマ・円・全角数字に対応、変換できない場合はNone）"""
+    if text is None:
+        return None
+    normalized = unicodedata.normalize('NFKC', str(text)).translate(_AMOUNT_STRIP)
+    if not normalized:
+        return None
+    try:
+        return int(normalized)
+    except ValueError:
+        try:
+            return int(float(normalized))
+        except ValueError:
+            return None
+
+
+def parse_date(text):
+    """日付文字列（2024年01月15日、2024/01/15、2024-01-15など）をdateに変換"""
+    if not text:
+        return None
+    match = _DATE_PATTERN.search(unicodedata.normalize('NFKC', str(text)))
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def parse_datetime(text):
+    """登録日時（YYYY-MM-DD HH:MM:SS）をdatetimeに変換"""
+    if not text:
+        return None
+    try:
+        return datetime.strptime(str(text).strip(), '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        parsed = parse_date(text)
+        return datetime(parsed.year, parsed.month, parsed.day) if parsed else None
+
+
+@dataclass(slots=True)
+class CreditorRecord:
+    """債権者1件分のデータ"""
+    id: int | None
+    debtor_name: str
+    company_name: str
+    branch_name: str
+    postal_code: str
+    address: str
+    phone_number: str
+    fax_number: str
+    claim_name: ClaimName
+    claim_amount: int | None
+    contract_date: date | None
+    first_borrowing_date: date | None
+    last_borrowing_date: date | None
+    last_payment_date: date | None
+    original_creditor: str
+    substitution_or_transfer: str
+    transfer_date: date | None
+    status: str
+    notes: str
+    registered_at: datetime | None
+    sheet_row: int | None
+    cells: tuple  # CREDITOR_FIELDS順の元のセル文字列
+
+    @classmethod
+    def from_cells(cls, cells, sheet_row=None):
+        """CREDITOR_FIELDS順のセル文字列から作成"""
+        c = cells
+        return cls(
+            id=parse_amount(c[0]),  # IDも数値として解釈
+            debtor_name=c[1],
+            company_name=c[2],
+            branch_name=c[3],
+            postal_code=c[4],
+            address=c[5],
+            phone_number=c[6],
+            fax_number=c[7],
+            claim_name=ClaimName.parse(c[8]),
+            claim_amount=parse_amount(c[9]),
+            contract_date=parse_date(c[10]),
+            first_borrowing_date=parse_date(c[11]),
+            last_borrowing_date=parse_date(c[12]),
+            last_payment_date=parse_date(c[13]),
+            original_creditor=c[14],
+            substitution_or_transfer=c[15],
+            transfer_date=parse_date(c[16]),
+            status=c[17],
+            notes=c[18],
+            registered_at=parse_datetime(c[19]),
+            sheet_row=sheet_row,
+            cells=tuple(c),
+        )
+
+    def text(self, field):
+        """元のセル文字列を取得（テンプレート出力用）"""
+        index = _FIELD_INDEX.get(field)
+        return self.cells[index] if index is not None else ''
+
+    def to_dict(self):
+        """日本語ヘッダーをキーとする辞書に変換（表示用）"""
+        return dict(zip(CREDITOR_FIELDS, self.cells))
+
+
+def _column_positions(headers):
+    """ヘッダー行からCREDITOR_FIELDSの各列の位置を取得"""
+    positions = {}
+    for i, header in enumerate(headers):
+        header = str(header).strip()
+        if header in _FIELD_INDEX and header not in positions:
+            positions[header] = i
+    return [positions.get(field) for field in CREDITOR_FIELDS]
+
+
+def _cells_for(row, positions):
+    return tuple(
+        '' if pos is None or pos >= len(row) or row[pos] is None else str(row[pos])
+        for pos in positions
+    )
+
+
+def records_from_values(all_values):
+    """シートの値（ヘッダー行＋データ行）からレコードを作成"""
+    if not all_values or len(all_values) < 2:
+        return []
+
+    positions = _column_positions(all_values[0])
+    records = []
+    for sheet_row, row in enumerate(all_values[1:], start=2):
+        if any(str(cell).strip() for cell in row):
+            records.append(CreditorRecord.from_cells(_cells_for(row, positions), sheet_row))
+    return records
+
+
+def records_from_dataframe(df):
+    """get_dataのDataFrame（sheet_row列付き）からレコードを作成"""
+    if df is None or df.empty:
+        return []
+
+    positions = _column_positions(df.columns)
+    row_position = list(df.columns).index('sheet_row') if 'sheet_row' in df.columns else None
+
+    records = []
+    for row in df.itertuples(index=False, name=None):
+        sheet_row = int(row[row_position]) if row_position is not None else None
+        records.append(CreditorRecord.from_cells(_cells_for(row, positions), sheet_row))
+    return records
+
+
+def records_to_dataframe(records):
+    """レコードを表示用のDataFrameに変換"""
+    import pandas as pd
+
+    return pd.DataFrame([record.cells for record in records], columns=CREDITOR_FIELDS)
@@ -0,0 +1,128 @@
+"""
+債権者データ集計
+
+シートのDataFrameに対して、債権額を1回だけint64列に変換し、
+債務者ごと・全体の件数、合計、最大、中央値、債権名・ステータス別の内訳を
+pandasのベクトル演算で集計する。
+キャッシュ済みのDataFrameは共有されているため、集計時は変更せずコピーに列を追加する。
+"""
+
+from config.settings import CREDITOR_FIELDS
+
+CLAIM_AMOUNT_COLUMN = "債権額_数値"
+DEBTOR_COLUMN = "債務者名"
+UNSET_CLAIM_NAME = "未設定"
+UNSET_STATUS = "未確認"
+_AMOUNT_STRIP_PATTERN = r"[,，円¥￥\s]"
+
+
+def parse_claim_amounts(values):
+    """債権額の列をint64に変換（カンマ・円・全角数字に対応、変換できない値は0）"""
+    import pandas as pd
+
+    series = pd.Series(values, copy=False)
+    normalized = (
+        series.astype("string")
+        .fillna("")
+        .str.normalize("NFKC")
+        .str.replace(_AMOUNT_STRIP_PATTERN, "", regex=True)
+    )
+    numbers = pd.to_numeric(normalized, errors="coerce")
+    return numbers.fillna(0).round().astype("int64")
+
+
+def prepare_frame(df, debtor_name=None):
+    """空白行を除き、債権額の数値列（と債務者名）を追加したコピーを返す"""
+    import pandas as pd
+
+    if df is None or df.empty:
+        return pd.DataFrame(columns=[*CREDITOR_FIELDS, CLAIM_AMOUNT_COLUMN])
+
+    data_columns = [col for col in df.columns if col != "sheet_row"]
+    text = df[data_columns].astype("string").fillna("")
+    non_empty = text.apply(lambda column: column.str.strip().ne("")).any(axis=1)
+    frame = df.loc[non_empty].copy()
+
+    for field in ("債権名", "ステータス", "債権額"):
+        if field not in frame.columns:
+            frame[field] = ""
+
+    frame[CLAIM_AMOUNT_COLUMN] = parse_claim_amounts(frame["債権額"])
+    frame["債権名"] = frame["債権名"].astype("string").str.strip().replace("", UNSET_CLAIM_NAME).fillna(UNSET_CLAIM_NAME)
+    frame["ステータス"] = frame["ステータス"].astype("string").str.strip().replace("", UNSET_STATUS).fillna(UNSET_STATUS)
+
+    if debtor_name is not None:
+        frame[DEBTOR_COLUMN] = debtor_name
+    return frame
+
+
+def _breakdown(frame, column):
+    """指定列ごとの件数と債権額合計"""
+    return (
+        frame.groupby(column, sort=False)[CLAIM_AMOUNT_COLUMN]
+        .agg(件数="count", 債権額合計="sum")
+        .sort_values("債権額合計", ascending=False)
+    )
+
+
+def _totals(frame):
+    amounts = frame[CLAIM_AMOUNT_COLUMN]
+    if amounts.empty:
+        return {"count": 0, "total": 0, "max": 0, "median": 0}
+    return {
+        "count": int(amounts.size),
+        "total": int(amounts.sum()),
+        "max": int(amounts.max()),
+        "median": int(amounts.median()),
+    }
+
+
+def summarize_debtor(df):
+    """
+    1債務者分のシートデータを集計
+
+    Returns:
+        dict: count, total, max, median と by_claim_name, by_status（DataFrame）
+    """
+    frame = prepare_frame(df)
+    summary = _totals(frame)
+    summary["by_claim_name"] = _breakdown(frame, "債権名")
+    summary["by_status"] = _breakdown(frame, "ステータス")
+    return summary
+
+
+def summarize_portfolio(debtor_frames):
+    """
+    全債務者のシートデータを集計
+
+    Args:
+        debtor_frames: (債務者名, DataFrame) の組の一覧（同じ債務者名は合算）
+
+    Returns:
+        dict: 全体の count, total, max, median、債務者別の by_debtor、
+              債権名・ステータス別の by_claim_name, by_status（DataFrame）
+    """
+    import pandas as pd
+
+    prepared = [
+        prepare_frame(df, debtor_name)
+        for debtor_name, df in debtor_frames
+        if df is not None and not df.empty
+    ]
+    columns = [DEBTOR_COLUMN, "債権名", "ステータス", CLAIM_AMOUNT_COLUMN]
+    if prepared:
+        frame = pd.concat([part[columns] for part in prepared], ignore_index=True)
+    else:
+        frame = pd.DataFrame({column: pd.Series(dtype="int64" if column == CLAIM_AMOUNT_COLUMN else "string") for column in columns})
+
+    summary = _totals(frame)
+    summary["debtor_count"] = int(frame[DEBTOR_COLUMN].nunique())
+    summary["by_debtor"] = (
+        frame.groupby(DEBTOR_COLUMN, sort=False)[CLAIM_AMOUNT_COLUMN]
+        .agg(件数="count", 債権額合計="sum", 最大債権額="max", 中央値="median")
+        .astype("int64")
+        .sort_values("債権額合計", ascending=False)
+    )
+    summary["by_claim_name"] = _breakdown(frame, "債権名")
+    summary["by_status"] = _breakdown(frame, "ステータス")
+    return summary
@@ -1,36 +1,26 @@
 import streamlit as st
-import pandas as pd
 import re
+from utils.creditor_record import records_from_dataframe, records_from_values, records_to_dataframe
 
 class DataHandler:
     def __init__(self, sheets_manager):
         self.sheets_manager = sheets_manager
     
     def handle_dataframe_conversion(self, data):
-        """DataFrameまたはリストをリスト形式に変換"""
+        """DataFrameまたは行の配列をCreditorRecordのリストに変換"""
         if data is None:
             return None, None
             
-        # DataFrameの場合
-        if isinstance(data, pd.DataFrame):
-            if data.empty:
+        # 行の配列の場合
+        if isinstance(data, list):
+            if len(data) <= 1:
                 return None, None
-            headers = data.columns.tolist()
-            creditor_data = data.to_dict('records')
-            return headers, creditor_data
-            
-        # リストの場合
-        elif isinstance(data, list) and len(data) > 1:
-            headers = data[0]
-            creditor_data = []
-            for row in data[1:]:
-                creditor_dict = {}
-                for i, header in enumerate(headers):
-                    creditor_dict[header] = row[i] if i < len(row) else ''
-                creditor_data.append(creditor_dict)
-            return headers, creditor_data
-            
-        return None, None
+            return data[0], records_from_values(data)
+        
+        # DataFrameの場合
+        if data.empty:
+            return None, None
+        return data.columns.tolist(), records_from_dataframe(data)
 
     def safe_get_spreadsheet_data_by_id(self, spreadsheet_id):
         """スプレッドシートIDから安全にデータを取得"""
@@ -62,6 +52,16 @@ class DataHandler:
             st.error(f"データ取得中にエラーが発生しました: {e}")
             return None
     
+    def safe_get_cached_data(self, sheet_id):
+        """リビジョンを確認し、変更があった場合のみシートデータを取得"""
+        try:
+            revision = self.sheets_manager.get_revision_tokens([sheet_id]).get(sheet_id)
+            return self.sheets_manager.get_cached_data(sheet_id, revision)
+            
+        except Exception as e:
+            st.error(f"データ取得中にエラーが発生しました: {e}")
+            return None
+    
     def get_data_from_spreadsheet_list(self):
         """スプレッドシート一覧からデータを取得"""
         with st.spinner("債務者一覧を取得中..."):
@@ -77,17 +77,12 @@ class DataHandler:
         if selected_debtor:
             with st.spinner(f"{selected_debtor}のデータを取得中..."):
                 selected_sheet = next(sheet for sheet in spreadsheets if sheet['name'] == selected_debtor)
-                data = self.safe_get_data_from_sheet_info(selected_sheet)
+                data = self.safe_get_cached_data(selected_sheet['id'])
             
             if data is not None:
-                if isinstance(data, pd.DataFrame) and not data.empty:
-                    headers, creditor_data = self.handle_dataframe_conversion(data)
-                    if creditor_data:
-                        return selected_debtor, creditor_data
-                elif isinstance(data, list) and len(data) > 1:
-                    headers, creditor_data = self.handle_dataframe_conversion(data)
-                    if creditor_data:
-                        return selected_debtor, creditor_data
+                headers, creditor_data = self.handle_dataframe_conversion(data)
+                if creditor_data:
+                    return selected_debtor, creditor_data
                 
                 st.warning("データが見つかりませんでした")
         
@@ -161,7 +156,7 @@ class DataHandler:
                             st.success("データを取得しました")
                             
                             with st.expander("データプレビュー"):
-                                df = pd.DataFrame(creditor_data)
+                                df = records_to_dataframe(creditor_data)
                                 st.dataframe(df, use_container_width=True)
                             
                             return selected_debtor, creditor_data
@@ -2,22 +2,6 @@
 データ処理ユーティリティ
 """
 
-import json
-
-def parse_json_data(json_text):
-    """JSONデータをパースして検証"""
-    try:
-        data = json.loads(json_text)
-        
-        if isinstance(data, list):
-            return data, None
-        elif isinstance(data, dict):
-            return [data], None
-        else:
-            return None, "JSONデータの形式が正しくありません"
-    except json.JSONDecodeError as e:
-        return None, f"JSON解析エラー: {str(e)}"
-
 def validate_creditor_data(data):
     """債権者データの基本検証"""
     errors = []
@@ -0,0 +1,66 @@
+"""
+債務者スプレッドシート索引
+
+債務者名から、その債務者のスプレッドシート（ID・名前・作成日時）と
+公開設定済みかどうかを引けるようにする（全セッション共有）。
+登録のたびにDrive全体を検索したり、公開設定を繰り返したりしないために使う。
+"""
+
+import threading
+from dataclasses import dataclass
+
+
+@dataclass
+class DebtorSheet:
+    """債務者のスプレッドシート情報"""
+    sheet_id: str
+    name: str
+    created_time: str = ''
+    shared: bool = False
+
+
+class DebtorIndex:
+    """債務者名 → スプレッドシート情報"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, debtor_name):
+        with self._lock:
+            return self._entries.get(debtor_name)
+
+    def put(self, debtor_name, sheet):
+        with self._lock:
+            self._entries[debtor_name] = sheet
+
+    def mark_shared(self, debtor_name):
+        """公開設定済みとして記録"""
+        with self._lock:
+            sheet = self._entries.get(debtor_name)
+            if sheet is not None:
+                sheet.shared = True
+
+    def invalidate_sheet(self, sheet_id):
+        """削除されたシートの索引を除く"""
+        with self._lock:
+            for debtor_name, sheet in list(self._entries.items()):
+                if sheet.sheet_id == sheet_id:
+                    del self._entries[debtor_name]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_debtor_index():
+    """プロセス全体で共有する債務者スプレッドシート索引を取得"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DebtorIndex()
+        return _index
@@ -0,0 +1,149 @@
+"""
+ファイル取り込みジョブ管理
+
+アップロードされたファイルの取り込みをバックグラウンドスレッドで実行する。
+ジョブはIDで参照でき、画面側は進捗（処理件数・毎秒の処理件数）をポーリングして表示する。
+ジョブは実行数の上限付きのキューで順番に処理される。
+"""
+
+import contextvars
+import csv
+import io
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import IMPORT_JOBS
+from utils.import_pipeline import ImportPipeline, ImportResult, iter_file_records
+
+
+class ImportJob:
+    """1ファイル分の取り込みジョブ"""
+
+    def __init__(self, filename, committed_keys=()):
+        self.id = uuid.uuid4().hex[:8]
+        self.filename = filename
+        # 登録済みの冪等キー（ジョブ専用の複製。画面側のセッションの集合には完了後に画面側で統合する）
+        self.committed_keys = set(committed_keys)
+        self.status = "queued"  # queued / running / done / error
+        self.error = None
+        self.result = ImportResult()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "error")
+
+    @property
+    def elapsed_seconds(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def rows_per_second(self):
+        """毎秒の処理件数"""
+        elapsed = self.elapsed_seconds
+        return self.result.processed / elapsed if elapsed > 0 else 0.0
+
+    def has_errors(self):
+        result = self.result
+        return bool(result.invalid or result.failed or result.duplicate_records or result.parse_error or self.error)
+
+    def error_report_csv(self):
+        """エラー・重複レポート（CSV、Excelで開けるようBOM付きUTF-8）"""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["件目", "債務者名", "種別", "内容"])
+
+        for number, debtor_name, errors in self.result.invalid:
+            writer.writerow([number, debtor_name, "検証エラー", " / ".join(errors)])
+        for debtor_name, numbers, error in self.result.failed:
+            for number in numbers:
+                writer.writerow([number, debtor_name, "登録エラー", error])
+        for number, debtor_name in self.result.duplicate_records:
+            writer.writerow([number, debtor_name, "重複", "同じデータが既に登録されています"])
+        if self.result.parse_error:
+            writer.writerow(["", "", "解析エラー", self.result.parse_error])
+        if self.error:
+            writer.writerow(["", "", "処理エラー", self.error])
+
+        return ("﻿" + output.getvalue()).encode("utf-8")
+
+
+class ImportJobManager:
+    """取り込みジョブのキューと実行状況を管理"""
+
+    def __init__(self, max_workers=None, max_history=None):
+        self.max_history = max_history or IMPORT_JOBS["max_history"]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or IMPORT_JOBS["max_workers"],
+            thread_name_prefix="import-job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, sheets_manager, filename, data, committed_keys):
+        """
+        ファイルの取り込みジョブを登録
+
+        Args:
+            sheets_manager: SheetsManager
+            filename: ファイル名（拡張子で形式を判定）
+            data: ファイルの内容（bytes）
+            committed_keys: 登録済みの冪等キーの集合（ジョブは複製に記録し、呼び出し元の集合は変更しない）
+
+        Returns:
+            str: ジョブID
+        """
+        job = ImportJob(filename, committed_keys)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim_history()
+        # 登録したページ・操作をAPI呼び出しの計測に引き継ぐ
+        self._executor.submit(contextvars.copy_context().run, self._run, job, sheets_manager, data)
+        return job.id
+
+    def get(self, job_id):
+        """ジョブを取得"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, sheets_manager, data):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            pipeline = ImportPipeline(sheets_manager, job.committed_keys)
+            records = iter_file_records(job.filename, data)
+
+            def update(result):
+                job.result = result
+
+            job.result = pipeline.run_records(records, on_progress=update)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+
+    def _trim_history(self):
+        """古い完了済みジョブを破棄"""
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        for job in sorted(finished, key=lambda job: job.created_at)[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job.id]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_import_job_manager():
+    """プロセス全体で共有する取り込みジョブ管理を取得"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ImportJobManager()
+        return _manager
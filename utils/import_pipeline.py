@@ -0,0 +1,343 @@
+"""
+一括取り込みパイプライン
+
+貼り付けたテキストやファイル（JSON Lines / CSV / Excel）を逐次パースしてレコードを1件ずつ取り出し、
+検証した上で債務者ごとにまとめて書き込む。レコードごとに冪等キー（正規化した内容のハッシュ）を持ち、
+書き込み済みのキーは再実行時に読み飛ばすため、途中で失敗した取り込みを
+貼り直すと未登録の分だけが登録される。
+"""
+
+import contextvars
+import csv
+import hashlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from config.settings import CREDITOR_FIELDS, CREDITOR_FIELD_KEYS, IMPORT_BATCH_SIZE, IMPORT_DEBTOR_CONCURRENCY
+from utils.data_processor import clean_data, validate_creditor_data
+from utils.quota_scheduler import get_quota_scheduler
+from utils.sheets_manager import pop_last_error, quiet_messages
+
+_WHITESPACE = " \t\r\n"
+_READ_CHUNK_SIZE = 64 * 1024
+# 日本語ヘッダー（CREDITOR_FIELDS）から入力データのキーへの対応
+_HEADER_TO_KEY = dict(zip(CREDITOR_FIELDS, CREDITOR_FIELD_KEYS))
+
+
+class JsonStreamError(ValueError):
+    """ストリーム中のJSON解析エラー（何件目で失敗したかを保持）"""
+
+    def __init__(self, message, record_index):
+        super().__init__(message)
+        self.record_index = record_index
+
+
+def iter_json_records(chunks):
+    """
+    テキスト（またはテキストの断片の列）からレコードを逐次取り出す
+
+    配列（[{...}, {...}]）、単一オブジェクト、連結したオブジェクト、JSON Lines に対応する。
+    全体を読み込まずに、完結したオブジェクトから順に返す。
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    in_array = False
+    record_index = 0
+
+    def parse(final):
+        nonlocal buffer, in_array, record_index
+        pos = 0
+        while True:
+            # 空白と配列の区切りを読み飛ばす
+            while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (in_array and buffer[pos] == ",")):
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if char == "[" and not in_array:
+                in_array = True
+                pos += 1
+                continue
+            if char == "]" and in_array:
+                in_array = False
+                pos += 1
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if not final:
+                    break  # 続きのテキストを待つ
+                raise JsonStreamError(f"{record_index + 1}件目付近: {e.msg}", record_index) from e
+
+            if end >= len(buffer) and not final and not isinstance(value, (dict, list)):
+                break  # 数値などは続きがある可能性がある
+            if not isinstance(value, dict):
+                raise JsonStreamError(f"{record_index + 1}件目: JSONデータの形式が正しくありません", record_index)
+
+            pos = end
+            record_index += 1
+            yield value
+
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        buffer += chunk
+        yield from parse(final=False)
+    yield from parse(final=True)
+
+    if in_array:
+        raise JsonStreamError(f"{record_index + 1}件目付近: 配列が閉じられていません", record_index)
+
+
+def _decode_text(data):
+    """ファイルの内容を文字列に変換（UTF-8（BOM付き含む）、だめならShift_JIS系）"""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp932")
+
+
+def _normalize_header(header):
+    """列名を入力データのキーに変換（日本語ヘッダーにも対応）"""
+    header = str(header or "").strip()
+    return _HEADER_TO_KEY.get(header, header)
+
+
+def _cell_text(value):
+    """Excelのセル値を文字列に変換"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.strftime("%Y年%m月%d日")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_jsonl_file(data):
+    """JSON Lines（またはJSON）ファイルの内容からレコードを逐次取り出す"""
+    text = io.StringIO(_decode_text(data))
+    return iter_json_records(iter(lambda: text.read(_READ_CHUNK_SIZE), ""))
+
+
+def iter_csv_file(data):
+    """CSVファイルの内容からレコードを逐次取り出す（1行目はヘッダー）"""
+    reader = csv.reader(io.StringIO(_decode_text(data), newline=""))
+    try:
+        headers = [_normalize_header(header) for header in next(reader, [])]
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield dict(zip(headers, row))
+    except csv.Error as e:
+        raise ValueError(f"CSV解析エラー（{reader.line_num}行目）: {e}") from e
+
+
+def iter_excel_file(data):
+    """Excelファイル（.xlsx）の先頭シートからレコードを逐次取り出す（1行目はヘッダー）"""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Excelファイルを開けません: {e}") from e
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [_normalize_header(header) for header in next(rows, ())]
+        for row in rows:
+            cells = [_cell_text(value) for value in row]
+            if any(cell.strip() for cell in cells):
+                yield dict(zip(headers, cells))
+    finally:
+        workbook.close()
+
+
+# ファイル拡張子ごとの読み込み関数
+FILE_READERS = {
+    "jsonl": iter_jsonl_file,
+    "json": iter_jsonl_file,
+    "csv": iter_csv_file,
+    "xlsx": iter_excel_file,
+}
+
+
+def iter_file_records(filename, data):
+    """ファイル名の拡張子に応じてレコードを逐次取り出す"""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    reader = FILE_READERS.get(extension)
+    if reader is None:
+        raise ValueError(f"対応していないファイル形式です: {filename}")
+    return reader(data)
+
+
+def record_key(data):
+    """レコードの冪等キー（前後の空白を除いた内容のハッシュ）"""
+    canonical = json.dumps(clean_data(data), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ImportResult:
+    """取り込み結果"""
+    processed: int = 0
+    added: int = 0
+    duplicates: int = 0
+    skipped: int = 0  # 以前の取り込みで登録済み
+    invalid: list = field(default_factory=list)  # [(何件目, 債務者名, エラー一覧)]
+    failed: list = field(default_factory=list)  # [(債務者名, 何件目の一覧, エラーメッセージ)]
+    duplicate_records: list = field(default_factory=list)  # [(何件目, 債務者名)]
+    debtors: dict = field(default_factory=dict)  # {債務者名: {'added', 'duplicates', 'failed'}}（初出順）
+    parse_error: str = None
+
+    @property
+    def committed(self):
+        return self.added + self.duplicates
+
+
+class ImportPipeline:
+    """逐次パース → 検証 → 債務者ごとのまとめ書き込み"""
+
+    def __init__(self, sheets_manager, committed_keys, batch_size=IMPORT_BATCH_SIZE, scheduler=None,
+                 max_workers=IMPORT_DEBTOR_CONCURRENCY):
+        """
+        Args:
+            sheets_manager: SheetsManager
+            committed_keys: 登録済みの冪等キーの集合（呼び出し側で保持し、登録のたびに追加される）
+            batch_size: まとめて書き込む件数
+            max_workers: 債務者ごとの書き込みを並行して行う数
+        """
+        self.sheets_manager = sheets_manager
+        self.committed_keys = committed_keys
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.scheduler = scheduler or get_quota_scheduler()
+        self._spreadsheets = {}
+
+    def run(self, chunks, on_progress=None):
+        """JSONテキストの取り込みを実行（on_progress(result) はレコードの処理と書き込みのたびに呼ばれる）"""
+        return self.run_records(iter_json_records(chunks), on_progress)
+
+    def run_records(self, records, on_progress=None):
+        """レコードの列の取り込みを実行"""
+        result = ImportResult()
+        pending = []
+        seen_keys = set()
+
+        try:
+            for data in records:
+                result.processed += 1
+                self._accept(result.processed, data, pending, seen_keys, result)
+                if len(pending) >= self.batch_size:
+                    self._flush(pending, result)
+                    pending = []
+                if on_progress:
+                    on_progress(result)
+        except ValueError as e:
+            # 解析できた分は登録する
+            result.parse_error = str(e)
+
+        if pending:
+            self._flush(pending, result)
+        if on_progress:
+            on_progress(result)
+        return result
+
+    def _accept(self, number, data, pending, seen_keys, result):
+        """検証と冪等キーの確認を行い、書き込み待ちに追加"""
+        cleaned = clean_data(data)
+        errors = validate_creditor_data(cleaned)
+        if errors:
+            result.invalid.append((number, cleaned.get('debtor_name') or '不明', errors))
+            return
+
+        key = record_key(data)
+        if key in self.committed_keys or key in seen_keys:
+            result.skipped += 1
+            return
+
+        seen_keys.add(key)
+        pending.append((number, key, cleaned['debtor_name'], data))
+
+    def _flush(self, pending, result):
+        """
+        書き込み待ちのレコードを債務者ごとにまとめて書き込む
+
+        債務者が複数の場合はスレッドプールで並行して処理し（クォータスケジューラは共有）、
+        結果は債務者の初出順に反映する。
+        """
+        by_debtor = {}
+        for number, key, debtor_name, data in pending:
+            by_debtor.setdefault(debtor_name, []).append((number, key, data))
+        groups = list(by_debtor.items())
+
+        if len(groups) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(groups)),
+                thread_name_prefix="import-debtor"
+            ) as executor:
+                # 呼び出し元（ページ・操作）をAPI呼び出しの計測に引き継ぐ
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._write_group, group)
+                    for group in groups
+                ]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [self._write_group(group) for group in groups]
+
+        for (debtor_name, items), (statuses, error) in zip(groups, outcomes):
+            counts = result.debtors.setdefault(debtor_name, {'added': 0, 'duplicates': 0, 'failed': 0})
+
+            if statuses is None:
+                # このまとまりは未登録のまま（冪等キーを記録しないので再実行で再登録される）
+                result.failed.append((debtor_name, [number for number, _, _ in items], error))
+                counts['failed'] += len(items)
+                continue
+
+            for (number, key, _), status in zip(items, statuses):
+                self.committed_keys.add(key)
+                if status == 'added':
+                    result.added += 1
+                    counts['added'] += 1
+                else:
+                    result.duplicates += 1
+                    result.duplicate_records.append((number, debtor_name))
+                    counts['duplicates'] += 1
+
+    def _write_group(self, group):
+        """
+        1債務者分のレコードを書き込む
+
+        作業スレッドから呼ばれるため画面には何も表示せず、エラーは戻り値で返す。
+        クォータはシートの検索・作成・公開設定・書き込みなどのAPI呼び出し1回ごとに確保する。
+
+        Returns:
+            tuple: (各レコードの結果, None)。失敗時は (None, エラーメッセージ)
+        """
+        debtor_name, items = group
+        with quiet_messages(), self.scheduler.per_request():
+            pop_last_error()
+            try:
+                spreadsheet = self._get_spreadsheet(debtor_name)
+                if not spreadsheet:
+                    return None, pop_last_error() or "スプレッドシートを取得できませんでした"
+                statuses = self.sheets_manager.add_data_batch(spreadsheet, [data for _, _, data in items])
+                if statuses is None:
+                    return None, pop_last_error() or "スプレッドシートへの書き込みに失敗しました"
+                return statuses, None
+            except Exception as e:
+                return None, str(e)
+
+    def _get_spreadsheet(self, debtor_name):
+        """債務者のスプレッドシートを取得（同じ取り込み中は再検索しない）"""
+        if debtor_name not in self._spreadsheets:
+            self._spreadsheets[debtor_name] = self.sheets_manager.get_or_create_spreadsheet(debtor_name)
+        return self._spreadsheets[debtor_name]
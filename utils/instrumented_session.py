@@ -0,0 +1,51 @@
+"""
+計測付きHTTPセッション
+
+AuthorizedSession（トークン自動更新付き）を通る全てのリクエストについて、
+操作名・所要時間・送受信バイト数・再試行回数をAPI呼び出しの集計（utils.metrics）に記録する。
+QuotaScheduler.per_request のブロック内では、1回の呼び出しごとにクォータと同時実行枠を確保する。
+"""
+
+import threading
+import time
+from google.auth.transport.requests import AuthorizedSession
+from utils.metrics import classify_request, get_metrics
+from utils.quota_scheduler import request_bucket, request_slot
+
+
+class InstrumentedSession(AuthorizedSession):
+    """リクエストごとに計測するAuthorizedSession"""
+
+    def __init__(self, credentials, metrics=None, **kwargs):
+        super().__init__(credentials, **kwargs)
+        self.metrics = metrics or get_metrics()
+        self._attempts = threading.local()
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        # トークン期限切れ（401）で再取得した後の再送は、元のリクエストの再試行として数える
+        if kwargs.get("_credential_refresh_attempt", 0) > 0:
+            self._attempts.retries = getattr(self._attempts, "retries", 0) + 1
+            return super().request(method, url, data=data, headers=headers, **kwargs)
+
+        self._attempts.retries = 0
+        # 取り込みなど呼び出しごとにクォータを確保する処理（QuotaScheduler.per_request）では、ここで1回分を確保
+        with request_slot(request_bucket(method)):
+            started = time.perf_counter()
+            response = None
+            try:
+                response = super().request(method, url, data=data, headers=headers, **kwargs)
+                return response
+            finally:
+                operation, bucket = classify_request(method, url)
+                if response is None:
+                    status, bytes_sent, bytes_received = "error", 0, 0
+                else:
+                    status = "ok" if response.ok else str(response.status_code)
+                    body = response.request.body if response.request is not None else None
+                    bytes_sent = len(body) if body else 0
+                    bytes_received = len(response.content or b"")
+                self.metrics.record(
+                    operation, bucket, time.perf_counter() - started,
+                    bytes_sent=bytes_sent, bytes_received=bytes_received,
+                    retries=self._attempts.retries, status=status
+                )
@@ -0,0 +1,235 @@
+"""
+Google API 呼び出しの計測
+
+Sheets / Drive API へのリクエストごとに、操作名（values.get など）、呼び出し元のページと操作、
+クォータのバケット（read / write / drive）、所要時間、送受信バイト数、再試行回数を記録し、
+プロセス全体で集計する。診断ページでの表示と、Prometheusのテキスト形式・JSONでの出力に使う。
+
+呼び出し元のページと操作は contextvars で受け渡す（ページの先頭で set_page、
+ボタン等の処理を action で囲む）。
+"""
+
+import bisect
+import contextvars
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# 所要時間のヒストグラムの区切り（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_page = contextvars.ContextVar("api_metrics_page", default="-")
+_current_action = contextvars.ContextVar("api_metrics_action", default="-")
+
+# URLから操作名を判定（上から順に照合）
+_OPERATIONS = [
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values/[^/?]+:append"), "values.append"),
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values:batchClear"), "values.batchClear"),
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values:batchUpdate"), "values.batchUpdate"),
+    ("GET", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values:batchGet"), "values.batchGet"),
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values/[^/?]+:clear"), "values.clear"),
+    ("GET", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values/"), "values.get"),
+    ("PUT", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/]+/values/"), "values.update"),
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/?]+:batchUpdate"), "spreadsheets.batchUpdate"),
+    ("GET", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/[^/?]+"), "spreadsheets.get"),
+    ("POST", re.compile(r"sheets\.googleapis\.com/v4/spreadsheets/?(\?|$)"), "spreadsheets.create"),
+    ("POST", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+/permissions"), "drive.permissions.create"),
+    ("GET", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+/permissions"), "drive.permissions.list"),
+    ("POST", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+/copy"), "drive.files.copy"),
+    ("GET", re.compile(r"googleapis\.com/drive/v3/files/?(\?|$)"), "drive.files.list"),
+    ("POST", re.compile(r"googleapis\.com/drive/v3/files/?(\?|$)"), "drive.files.create"),
+    ("GET", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+"), "drive.files.get"),
+    ("PATCH", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+"), "drive.files.update"),
+    ("DELETE", re.compile(r"googleapis\.com/drive/v3/files/[^/?]+"), "drive.files.delete"),
+    ("POST", re.compile(r"oauth2\.googleapis\.com/token"), "auth.token"),
+]
+
+
+def classify_request(method, url):
+    """
+    リクエストの操作名とクォータのバケットを判定
+
+    Returns:
+        tuple: (操作名, バケット)。バケットは Sheets API の read / write、Drive API の drive、トークン取得の auth
+    """
+    method = method.upper()
+    operation = None
+    for operation_method, pattern, name in _OPERATIONS:
+        if method == operation_method and pattern.search(url):
+            operation = name
+            break
+    if operation is None:
+        service = "drive" if "/drive/" in url else "sheets" if "sheets.googleapis.com" in url else "other"
+        operation = f"{service}.{method.lower()}"
+
+    if operation.startswith(("drive.", "auth.")):
+        bucket = operation.split(".", 1)[0]
+    elif method == "GET":
+        bucket = "read"
+    else:
+        bucket = "write"
+    return operation, bucket
+
+
+def set_page(page):
+    """このスクリプト実行（ページ）の名前を設定（以降の呼び出しに記録される）"""
+    _current_page.set(page)
+    _current_action.set("-")
+
+
+@contextmanager
+def action(name):
+    """ブロック内の呼び出しを操作名付きで記録"""
+    token = _current_action.set(name)
+    try:
+        yield
+    finally:
+        _current_action.reset(token)
+
+
+def current_labels():
+    """現在の呼び出し元（ページ, 操作）"""
+    return _current_page.get(), _current_action.get()
+
+
+class _Histogram:
+    """所要時間のヒストグラム（区切りごとの件数・合計・件数）"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)  # 最後は上限なし
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """区切りから推定した分位点（秒、該当する区切りの上限。最後の区切りを超える場合はNone）"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*LATENCY_BUCKETS, float("inf")), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"buckets": buckets, "sum": round(self.sum, 6), "count": self.count}
+
+
+class MetricsRegistry:
+    """API呼び出しの集計（全セッション共有）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            # (操作名, バケット, ページ, 操作, 結果) -> 件数など
+            self._counters = {}
+            # 操作名 -> ヒストグラム
+            self._latency = {}
+
+    def record(self, operation, bucket, seconds, bytes_sent=0, bytes_received=0, retries=0, status="ok",
+               page=None, action_name=None):
+        """1回のAPI呼び出しを記録（ページ・操作の省略時は現在の呼び出し元）"""
+        current_page, current_action = current_labels()
+        key = (operation, bucket, page or current_page, action_name or current_action, status)
+        with self._lock:
+            counter = self._counters.setdefault(
+                key, {"requests": 0, "retries": 0, "bytes_sent": 0, "bytes_received": 0, "seconds": 0.0}
+            )
+            counter["requests"] += 1
+            counter["retries"] += retries
+            counter["bytes_sent"] += bytes_sent
+            counter["bytes_received"] += bytes_received
+            counter["seconds"] += seconds
+            self._latency.setdefault(operation, _Histogram()).observe(seconds)
+
+    def snapshot(self):
+        """集計結果（JSONに変換できる形）"""
+        with self._lock:
+            series = [
+                {
+                    "operation": operation, "bucket": bucket, "page": page, "action": action_name,
+                    "status": status, **counter, "seconds": round(counter["seconds"], 6),
+                }
+                for (operation, bucket, page, action_name, status), counter in sorted(self._counters.items())
+            ]
+            latency = {operation: histogram.to_dict() for operation, histogram in sorted(self._latency.items())}
+            quantiles = {
+                operation: {"p50": histogram.quantile(0.5), "p95": histogram.quantile(0.95)}
+                for operation, histogram in self._latency.items()
+            }
+            started_at = self.started_at
+        return {"started_at": started_at, "series": series, "latency": latency, "quantiles": quantiles}
+
+    def to_json(self):
+        """集計結果のJSON"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """集計結果のPrometheusテキスト形式"""
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = [
+            ("sheets_api_requests_total", "requests", "Google API requests"),
+            ("sheets_api_retries_total", "retries", "Retried Google API requests"),
+            ("sheets_api_sent_bytes_total", "bytes_sent", "Request body bytes sent to Google APIs"),
+            ("sheets_api_received_bytes_total", "bytes_received", "Response body bytes received from Google APIs"),
+        ]
+        for name, field, help_text in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for item in snapshot["series"]:
+                labels = _labels(
+                    operation=item["operation"], bucket=item["bucket"], page=item["page"],
+                    action=item["action"], status=item["status"]
+                )
+                lines.append(f"{name}{{{labels}}} {item[field]}")
+
+        name = "sheets_api_request_duration_seconds"
+        lines.append(f"# HELP {name} Google API request latency")
+        lines.append(f"# TYPE {name} histogram")
+        for operation, histogram in snapshot["latency"].items():
+            for bound, cumulative in histogram["buckets"].items():
+                lines.append(f"{name}_bucket{{{_labels(operation=operation, le=bound)}}} {cumulative}")
+            lines.append(f"{name}_sum{{{_labels(operation=operation)}}} {histogram['sum']}")
+            lines.append(f"{name}_count{{{_labels(operation=operation)}}} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels):
+    """Prometheusのラベル表記（値はエスケープ）"""
+    return ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics():
+    """プロセス全体で共有するAPI呼び出しの集計を取得"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
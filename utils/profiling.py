@@ -0,0 +1,137 @@
+"""
+ページ再実行のプロファイリング
+
+URLに ?profile=1 を付けるか、環境変数 CREDITOR_PROFILE=1 を設定すると、
+ページのスクリプト実行（再実行）ごとに cProfile と tracemalloc で計測する。
+所要時間・累積時間の上位関数・ピークメモリをページ下部に折りたたみ表示し、
+.pstats ファイルを保存する（保持数を超えた古いファイルは削除）。
+
+保存したファイルは `python -m pstats profiles/<ファイル名>.pstats` や snakeviz などで確認できる。
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import streamlit as st
+from config.settings import PROFILING
+
+# cProfile と tracemalloc はプロセス全体で1つのため、同時に計測するのは1回の実行のみ
+_profiling_lock = threading.Lock()
+
+
+def is_profiling_enabled():
+    """プロファイリングが有効か（クエリパラメータの指定はページを移動しても引き継ぐ）"""
+    if os.environ.get(PROFILING["env_var"], "").lower() in ("1", "true", "yes"):
+        return True
+
+    value = st.query_params.get(PROFILING["query_param"])
+    if value is not None:
+        st.session_state.profiling_enabled = value.lower() in ("1", "true", "yes")
+    return st.session_state.get("profiling_enabled", False)
+
+
+def _prune_profiles(directory, keep):
+    """保持数を超えた古い .pstats ファイルを削除"""
+    files = sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pstats")),
+        key=os.path.getmtime,
+        reverse=True
+    )
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _summarize_stats(profiler, limit):
+    """関数呼び出しの総数と、累積時間の上位関数"""
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, total_time, cumulative_time, _) in stats.stats.items():
+        rows.append({
+            "関数": function,
+            "場所": f"{os.path.relpath(filename) if os.path.isabs(filename) else filename}:{line}",
+            "呼び出し回数": calls,
+            "累積時間(ms)": round(cumulative_time * 1000, 1),
+            "自身の時間(ms)": round(total_time * 1000, 1),
+        })
+    rows.sort(key=lambda row: row["累積時間(ms)"], reverse=True)
+    return stats.total_calls, rows[:limit]
+
+
+def _render_summary(result):
+    """計測結果の概要をページ下部に表示"""
+    with st.expander(f"プロファイル: {result['wall_ms']:,.0f} ms / ピークメモリ {result['peak_mb']:,.1f} MB"):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("所要時間", f"{result['wall_ms']:,.0f} ms")
+        col2.metric("ピークメモリ", f"{result['peak_mb']:,.1f} MB")
+        col3.metric("関数呼び出し", f"{result['calls']:,}")
+        if result["path"]:
+            st.caption(f"保存先: {result['path']}")
+        st.dataframe(result["top"], use_container_width=True, hide_index=True)
+
+
+@contextmanager
+def profile_rerun(name):
+    """
+    ページのスクリプト実行を計測（無効時は何もしない）
+
+    Args:
+        name: .pstats ファイル名に使うページ名（英数字）
+    """
+    if not is_profiling_enabled():
+        yield
+        return
+
+    if not _profiling_lock.acquire(blocking=False):
+        # 他のセッションの再実行を計測中
+        yield
+        st.caption("プロファイル: 他の実行を計測中のため、今回の実行は計測していません")
+        return
+
+    import cProfile
+    import tracemalloc
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall_ms = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        _profiling_lock.release()
+
+        path = None
+        try:
+            directory = PROFILING["directory"]
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pstats")
+            profiler.dump_stats(path)
+            _prune_profiles(directory, PROFILING["keep"])
+        except OSError:
+            path = None
+
+        calls, top = _summarize_stats(profiler, PROFILING["top"])
+        _render_summary({
+            "wall_ms": wall_ms,
+            "peak_mb": peak / (1024 * 1024),
+            "calls": calls,
+            "path": path,
+            "top": top,
+        })
@@ -0,0 +1,163 @@
+"""
+Google API クォータスケジューラ
+
+読み取り・書き込みのバケットごとにトークンバケットで毎分のリクエスト数を制限し、
+同時実行数の上限も管理する。スレッドと asyncio の両方から利用できる。
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config.settings import SHEETS_QUOTA
+
+# API呼び出し1回ごとにクォータと同時実行枠を確保するスケジューラ（per_request のブロック内だけ設定される）
+_request_scheduler = contextvars.ContextVar("quota_request_scheduler", default=None)
+
+
+def request_bucket(method):
+    """API呼び出しのバケット（GETは読み取り、それ以外は書き込み。Drive API も同じ分け方で数える）"""
+    return "read" if method.upper() == "GET" else "write"
+
+
+@contextmanager
+def request_slot(bucket):
+    """
+    API呼び出し1回分のクォータと同時実行枠を確保（HTTPセッションが1回の呼び出しごとに使う）
+
+    per_request のブロック外では何もしない。呼び出し中に同じスレッドから行われる
+    入れ子の呼び出しでは枠を重ねて確保しない。
+    """
+    scheduler = _request_scheduler.get()
+    if scheduler is None:
+        yield
+        return
+
+    token = _request_scheduler.set(None)
+    try:
+        with scheduler.slot(bucket):
+            yield
+    finally:
+        _request_scheduler.reset(token)
+
+
+class TokenBucket:
+    """毎分のリクエスト数を制限するトークンバケット"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """トークンを取得。取得できない場合は次のトークンまでの待ち秒数を返す"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class QuotaScheduler:
+    """バケット別のレート制限と同時実行数制限"""
+
+    def __init__(self, quotas=None, max_concurrency=None):
+        quotas = quotas or SHEETS_QUOTA
+        self.buckets = {
+            "read": TokenBucket(quotas["read_per_minute"]),
+            "write": TokenBucket(quotas["write_per_minute"]),
+        }
+        self.max_concurrency = max_concurrency or quotas["max_concurrency"]
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def wait_for_token(self, bucket):
+        """トークンが取得できるまで待機（スレッド用）"""
+        while True:
+            wait = self.buckets[bucket].try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def wait_for_token_async(self, bucket):
+        """トークンが取得できるまで待機（asyncio用）"""
+        while True:
+            wait = self.buckets[bucket].try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    @contextmanager
+    def slot(self, bucket="read"):
+        """クォータと同時実行枠を確保して処理を実行"""
+        self.wait_for_token(bucket)
+        with self._semaphore:
+            yield
+
+    @contextmanager
+    def per_request(self):
+        """
+        ブロック内のAPI呼び出し1回ごとにクォータと同時実行枠を確保させる
+
+        1つの操作で作成・書式設定・公開設定など複数の呼び出しを行う場合も、
+        呼び出しの回数分のトークンを消費する。設定は現在のスレッド（コンテキスト）だけに効く。
+        """
+        token = _request_scheduler.set(self)
+        try:
+            yield
+        finally:
+            _request_scheduler.reset(token)
+
+    def _get_executor(self):
+        """asyncio からの呼び出しを実行する専用スレッドプール（スレッド数は同時実行数の上限と同じ）"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="sheets-io")
+            return self._executor
+
+    def _call_in_slot(self, fn, args):
+        with self._semaphore:
+            # 確保済みの枠の中なので、呼び出し1回ごとの確保（request_slot）は行わない
+            token = _request_scheduler.set(None)
+            try:
+                return fn(*args)
+            finally:
+                _request_scheduler.reset(token)
+
+    async def call_async(self, bucket, fn, *args):
+        """
+        クォータと同時実行枠を確保して fn(*args) を実行（asyncio用）
+
+        枠の確保と呼び出しは専用スレッドプールの同じスレッドで行う。枠を待つスレッドが
+        呼び出しに使うスレッドを使い切って止まることはなく、待機中に取り消された場合も
+        枠はスレッド側で返される。呼び出し元（ページ・操作）は計測用に引き継ぐ。
+        """
+        await self.wait_for_token_async(bucket)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), contextvars.copy_context().run, self._call_in_slot, fn, args
+        )
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_quota_scheduler():
+    """プロセス全体で共有するクォータスケジューラを取得"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler()
+        return _scheduler
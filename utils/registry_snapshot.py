@@ -0,0 +1,183 @@
+"""
+テンプレートレジストリのスナップショット
+
+レジストリファイルとテンプレートディレクトリを1回だけ走査し、
+統計・裁判所別詳細・ファイルサイズ・拡張子・空ディレクトリなどの
+派生情報をまとめて保持する。レジストリのバージョンが変わらない限り
+同じスナップショットを使い回す。
+"""
+
+import os
+import json
+import streamlit as st
+
+TEMPLATE_NAME = "債権者一覧表"
+PROCEDURE_TYPES = ["個人再生", "自己破産"]
+TEMPLATE_EXTENSIONS = [".docx", ".xlsx"]
+
+
+def get_registry_version(registry_file, base_path):
+    """
+    レジストリのバージョンを取得
+
+    レジストリファイルに加えて、テンプレートディレクトリ配下
+    （templates/<裁判所>/<手続種別>/）の全ファイルのパス・更新時刻・サイズを含める。
+    レジストリを更新せずにテンプレートファイルだけを置き換え・削除した場合も別のバージョンになる。
+    """
+    try:
+        stat = os.stat(registry_file)
+        registry_version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        registry_version = None
+
+    files = []
+    for root, dirs, filenames in os.walk(base_path):
+        dirs.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((os.path.relpath(path, base_path), stat.st_mtime_ns, stat.st_size))
+    return registry_version, tuple(files)
+
+
+class RegistrySnapshot:
+    """レジストリから導出される情報を一括で保持する読み取り専用オブジェクト"""
+
+    def __init__(self, registry, base_path, version):
+        self.registry = registry
+        self.base_path = base_path
+        self.version = version
+
+        self.total_courts = len(registry)
+        self.total_templates = 0
+        self.court_details = []
+        self.template_infos = {}
+        self.templates = []
+
+        self._build()
+        self.empty_directories = self._find_empty_directories()
+
+    @classmethod
+    def load(cls, registry_file, base_path, version):
+        """レジストリファイルを読み込んでスナップショットを作成"""
+        try:
+            with open(registry_file, 'r', encoding='utf-8') as f:
+                registry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            registry = {}
+        return cls(registry, base_path, version)
+
+    @classmethod
+    def current(cls, template_manager):
+        """テンプレートマネージャーの現在のスナップショットを取得（バージョン単位でメモ化）"""
+        version = get_registry_version(template_manager.registry_file, template_manager.base_path)
+        return _load_snapshot(template_manager.registry_file, template_manager.base_path, version)
+
+    def _build(self):
+        """レジストリを1回走査して派生情報を構築"""
+        for court_name, court_data in self.registry.items():
+            procedures = []
+
+            for procedure_type, procedure_data in court_data.items():
+                if not isinstance(procedure_data, dict) or TEMPLATE_NAME not in procedure_data:
+                    continue
+
+                template_key = f"{court_name}_{procedure_type}"
+                info = dict(procedure_data[TEMPLATE_NAME])
+                template_path = self._resolve_template_path(court_name, procedure_type, info.get("file_path", ""))
+
+                # ファイルの実在確認とサイズ
+                file_path = info.get("file_path", "")
+                if file_path and os.path.exists(file_path):
+                    info["file_exists"] = True
+                    info["file_size"] = os.path.getsize(file_path)
+                else:
+                    info["file_exists"] = False
+                    info["file_size"] = 0
+                self.template_infos[template_key] = info
+
+                # テンプレート一覧用の情報
+                template_entry = dict(procedure_data[TEMPLATE_NAME])
+                template_entry['key'] = template_key
+                template_entry['court'] = court_name
+                template_entry['procedure_type'] = procedure_type
+                template_entry['path'] = template_path
+                template_entry['file_extension'] = os.path.splitext(template_path)[1] if template_path else '.xlsx'
+                self.templates.append(template_entry)
+
+                if procedure_type in PROCEDURE_TYPES:
+                    procedures.append(procedure_type)
+                    self.total_templates += 1
+
+            self.court_details.append({
+                "name": court_name,
+                "procedures": procedures,
+                "count": len(procedures)
+            })
+
+        # 裁判所名でソート
+        self.templates.sort(key=lambda x: x['court'])
+
+    def _resolve_template_path(self, court_name, procedure_type, registered_path):
+        """テンプレートファイルの実パスを解決（レジストリ優先、なければファイルシステム）"""
+        if registered_path and os.path.exists(registered_path):
+            return registered_path
+
+        for extension in TEMPLATE_EXTENSIONS:
+            file_path = os.path.join(self.base_path, court_name, procedure_type, f"{TEMPLATE_NAME}{extension}")
+            if os.path.exists(file_path):
+                return file_path
+
+        return None
+
+    def _find_empty_directories(self):
+        """テンプレートファイルを含まない裁判所ディレクトリを取得"""
+        empty_dirs = []
+        if not os.path.exists(self.base_path):
+            return empty_dirs
+
+        for item in os.listdir(self.base_path):
+            item_path = os.path.join(self.base_path, item)
+            if os.path.isdir(item_path) and item != "template_registry.json":
+                has_templates = False
+                for root, dirs, files in os.walk(item_path):
+                    if f"{TEMPLATE_NAME}.xlsx" in files:
+                        has_templates = True
+                        break
+
+                if not has_templates:
+                    empty_dirs.append(item)
+
+        return empty_dirs
+
+    def get_statistics(self):
+        """レジストリ統計を取得（裁判所数、テンプレート数、裁判所別詳細）"""
+        if not self.registry:
+            return None, None, []
+        return self.total_courts, self.total_templates, self.court_details
+
+    def get_template_info(self, template_key):
+        """テンプレート情報を取得"""
+        return self.template_infos.get(template_key)
+
+    def get_template_path(self, template_key):
+        """テンプレートファイルのパスを取得（レジストリ優先、なければファイルシステム）"""
+        for template in self.templates:
+            if template['key'] == template_key:
+                return template['path']
+
+        court_name, procedure_type = template_key.rsplit('_', 1)
+        return self._resolve_template_path(court_name, procedure_type, "")
+
+    def template_exists(self, template_key):
+        """テンプレートの存在確認"""
+        return self.get_template_path(template_key) is not None
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_snapshot(registry_file, base_path, version):
+    """バージョンごとにスナップショットをキャッシュ"""
+    return RegistrySnapshot.load(registry_file, base_path, version)
@@ -20,55 +20,22 @@ class RegistryUtils:
             st.session_state.operation_result = "error"
             return None
     
+    @property
+    def snapshot(self):
+        """現在のレジストリスナップショット（各タブで共有）"""
+        return self.template_manager.get_registry_snapshot()
+    
     def get_registry_statistics(self):
         """レジストリ統計を取得"""
         try:
-            registry = self.template_manager.load_registry()
-            if not registry:
-                return None, None, []
-            
-            total_courts = len(registry)
-            total_templates = 0
-            court_details = []
-            
-            for court_name, court_data in registry.items():
-                procedures = []
-                for key, value in court_data.items():
-                    if isinstance(value, dict) and "債権者一覧表" in value:
-                        if key in ["個人再生", "自己破産"]:
-                            procedures.append(key)
-                            total_templates += 1
-                
-                court_details.append({
-                    "name": court_name,
-                    "procedures": procedures,
-                    "count": len(procedures)
-                })
-            
-            return total_courts, total_templates, court_details
-            
+            return self.snapshot.get_statistics()
         except Exception as e:
             st.error(f"統計取得エラー: {str(e)}")
             return None, None, []
     
     def get_empty_directories(self):
         """空のディレクトリを取得"""
-        empty_dirs = []
-        if os.path.exists("templates"):
-            for item in os.listdir("templates"):
-                item_path = os.path.join("templates", item)
-                if os.path.isdir(item_path) and item != "template_registry.json":
-                    # ディレクトリ内にテンプレートファイルがあるかチェック
-                    has_templates = False
-                    for root, dirs, files in os.walk(item_path):
-                        if "債権者一覧表.xlsx" in files:
-                            has_templates = True
-                            break
-                    
-                    if not has_templates:
-                        empty_dirs.append(item)
-        
-        return empty_dirs
+        return list(self.snapshot.empty_directories)
     
     def get_backup_files(self):
         """バックアップファイル一覧を取得"""
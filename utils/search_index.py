@@ -0,0 +1,182 @@
+"""
+債権者横断検索インデックス
+
+全債務者シートの債権者名・支店名・住所・原債権者を SQLite（FTS5）に索引し、
+どの債務者がどの債権者に債務を負っているかを横断検索する。
+文字列はNFKC正規化・小文字化・カタカナのひらがな化・空白除去をしてから索引するため、
+全角・半角やカナの違いを無視して部分一致で検索できる。
+シートのリビジョン（Driveのversion）を記録し、変更されたシートだけを索引し直す。
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from config.settings import SEARCH_INDEX
+from utils.creditor_record import records_from_dataframe
+
+# 索引する項目（CreditorRecordの属性名）
+INDEXED_FIELDS = ("company_name", "branch_name", "address", "original_creditor")
+# トライグラムで索引できる最短の検索語の長さ
+_TRIGRAM_MIN_LENGTH = 3
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_for_search(text):
+    """検索用の正規化（NFKC・小文字化・カタカナ→ひらがな・空白除去）"""
+    normalized = unicodedata.normalize("NFKC", str(text or "")).casefold()
+    return _WHITESPACE.sub("", normalized.translate(_KATAKANA_TO_HIRAGANA))
+
+
+class CreditorSearchIndex:
+    """債権者の横断検索インデックス"""
+
+    def __init__(self, path=None):
+        self.path = path or SEARCH_INDEX["path"]
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.use_fts = self._create_tables()
+
+    def _create_tables(self):
+        """テーブルを作成（FTS5のトライグラムが使えない場合は通常のテーブルで部分一致検索）"""
+        columns = ", ".join(f"{field}_norm" for field in INDEXED_FIELDS)
+        display_columns = ", ".join(f"{field} UNINDEXED" for field in INDEXED_FIELDS)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sheets (sheet_id TEXT PRIMARY KEY, debtor_name TEXT, revision TEXT)"
+            )
+            try:
+                self._conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS creditors USING fts5("
+                    f"sheet_id UNINDEXED, debtor_name UNINDEXED, sheet_row UNINDEXED, claim_amount UNINDEXED, "
+                    f"{display_columns}, {columns}, tokenize='trigram')"
+                )
+                return True
+            except sqlite3.OperationalError:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS creditors (sheet_id TEXT, debtor_name TEXT, sheet_row INTEGER, "
+                    f"claim_amount TEXT, {', '.join(INDEXED_FIELDS)}, {columns})"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS creditors_sheet ON creditors(sheet_id)")
+                return False
+
+    def indexed_revisions(self):
+        """索引済みシートのリビジョン {sheet_id: revision}"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT sheet_id, revision FROM sheets"))
+
+    def stale_sheet_ids(self, sheets):
+        """索引し直しが必要なシートID（未索引、またはリビジョンが変わったもの）"""
+        indexed = self.indexed_revisions()
+        return [
+            sheet["sheet_id"] for sheet in sheets
+            if sheet["sheet_id"] not in indexed
+            or sheet.get("revision") is None
+            or indexed[sheet["sheet_id"]] != sheet.get("revision")
+        ]
+
+    def index_sheet(self, sheet_id, debtor_name, revision, df):
+        """1シート分を索引し直す"""
+        rows = []
+        for record in records_from_dataframe(df):
+            values = [getattr(record, field) for field in INDEXED_FIELDS]
+            rows.append((
+                sheet_id, debtor_name, record.sheet_row, record.text("債権額"),
+                *values, *(normalize_for_search(value) for value in values)
+            ))
+
+        placeholders = ", ".join("?" * (4 + 2 * len(INDEXED_FIELDS)))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM creditors WHERE sheet_id = ?", (sheet_id,))
+            self._conn.executemany(f"INSERT INTO creditors VALUES ({placeholders})", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sheets (sheet_id, debtor_name, revision) VALUES (?, ?, ?)",
+                (sheet_id, debtor_name, revision)
+            )
+
+    def remove_missing(self, sheet_ids):
+        """一覧にないシート（削除されたもの）を索引から除く"""
+        keep = set(sheet_ids)
+        removed = [sheet_id for sheet_id in self.indexed_revisions() if sheet_id not in keep]
+        if removed:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM creditors WHERE sheet_id = ?", [(sheet_id,) for sheet_id in removed])
+                self._conn.executemany("DELETE FROM sheets WHERE sheet_id = ?", [(sheet_id,) for sheet_id in removed])
+
+    def refresh(self, sheets_manager, sheets, chunk_size=None):
+        """
+        変更されたシートだけを索引し直す
+
+        変更されたシートが多い場合（初回など）も、同時実行数の上限ずつ取得して索引する。
+
+        Args:
+            sheets_manager: SheetsManager
+            sheets: シート情報の一覧（sheet_id, debtor_name, revision）
+            chunk_size: 1回にまとめて取得するシート数（省略時はクォータスケジューラの同時実行数）
+
+        Returns:
+            int: 索引し直したシート数
+        """
+        from utils.quota_scheduler import get_quota_scheduler
+
+        self.remove_missing([sheet["sheet_id"] for sheet in sheets])
+        stale_ids = self.stale_sheet_ids(sheets)
+        if not stale_ids:
+            return 0
+
+        chunk_size = chunk_size or get_quota_scheduler().max_concurrency
+        revisions = {sheet["sheet_id"]: sheet.get("revision") for sheet in sheets}
+        debtor_names = {sheet["sheet_id"]: sheet["debtor_name"] for sheet in sheets}
+        for start in range(0, len(stale_ids), chunk_size):
+            chunk = stale_ids[start:start + chunk_size]
+            frames = sheets_manager.get_cached_data_many(chunk, revisions)
+            for sheet_id in chunk:
+                df = frames.get(sheet_id)
+                if df is not None:
+                    self.index_sheet(sheet_id, debtor_names[sheet_id], revisions[sheet_id], df)
+        return len(stale_ids)
+
+    def search(self, query, limit=None):
+        """
+        債権者名・支店名・住所・原債権者で部分一致検索
+
+        Returns:
+            list: [{'sheet_id', 'debtor_name', 'sheet_row', 'claim_amount', 'company_name', ...}]
+        """
+        term = normalize_for_search(query)
+        if not term:
+            return []
+        limit = limit or SEARCH_INDEX["max_results"]
+
+        select_columns = ["sheet_id", "debtor_name", "sheet_row", "claim_amount", *INDEXED_FIELDS]
+        select = f"SELECT {', '.join(select_columns)} FROM creditors"
+        if self.use_fts and len(term) >= _TRIGRAM_MIN_LENGTH:
+            # トライグラムのフレーズ検索（部分一致）
+            sql = f"{select} WHERE creditors MATCH ? ORDER BY debtor_name LIMIT ?"
+            params = ('"' + term.replace('"', '""') + '"', limit)
+        else:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions = " OR ".join(f"{field}_norm LIKE ? ESCAPE '\\'" for field in INDEXED_FIELDS)
+            sql = f"{select} WHERE {conditions} ORDER BY debtor_name LIMIT ?"
+            params = (*[f"%{escaped}%"] * len(INDEXED_FIELDS), limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(select_columns, row)) for row in rows]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """プロセス全体で共有する検索インデックスを取得"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CreditorSearchIndex()
+        return _index
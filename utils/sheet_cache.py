@@ -0,0 +1,171 @@
+"""
+シートデータ共有キャッシュ
+
+全セッションで共有する、スレッドセーフなLRU/TTLキャッシュ。
+シートIDとリビジョンをキーにDataFrameを保持し、件数とメモリ量の上限で古いものから破棄する。
+キャッシュしたDataFrameは複数セッションで共有されるため、呼び出し側で変更しないこと。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from config.settings import SHEET_CACHE
+
+
+def next_revision(revision):
+    """
+    自分の書き込み1回分だけ進んだリビジョン（Driveのversionは変更のたびに増える）
+
+    書き込み後に確認したリビジョンがこれと一致すれば、間に他の変更がなかったとみなせる。
+    数値でない場合は確かめられないためNone。
+    """
+    try:
+        return str(int(revision) + 1)
+    except (TypeError, ValueError):
+        return None
+
+
+class SheetDataCache:
+    """シートID単位のLRU/TTLキャッシュ"""
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl_seconds=None):
+        self.max_entries = max_entries or SHEET_CACHE["max_entries"]
+        self.max_bytes = max_bytes or SHEET_CACHE["max_bytes"]
+        self.ttl_seconds = ttl_seconds or SHEET_CACHE["ttl_seconds"]
+        # sheet_id -> (frame, revision, stored_at, size, expected_revision)
+        # expected_revision は自分の書き込みを反映済みの場合に、書き込み後に確認されるはずのリビジョン
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _frame_size(frame):
+        """DataFrameのおおよそのメモリ量（バイト）"""
+        try:
+            return int(frame.memory_usage(deep=True).sum())
+        except Exception:
+            return 0
+
+    def get(self, sheet_id, revision=None):
+        """キャッシュからDataFrameを取得（リビジョン不一致、またはリビジョン指定なしで期限切れの場合はNone）"""
+        with self._lock:
+            entry = self._entries.get(sheet_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            frame, cached_revision, stored_at, size, expected_revision = entry
+            if revision is not None and revision == expected_revision:
+                # 自分の書き込みだけが反映されたリビジョンとして確認できた
+                self._entries[sheet_id] = (frame, revision, stored_at, size, None)
+                stale = False
+            elif revision is not None:
+                # リビジョンで検証できる場合は期限に関係なく一致すれば有効
+                # （書き込み前のリビジョンは、書き込み後にまだ確認し直していない状態）
+                stale = revision != cached_revision
+            else:
+                stale = time.monotonic() - stored_at > self.ttl_seconds
+            if stale:
+                self._remove(sheet_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(sheet_id)
+            self.hits += 1
+            return frame
+
+    def get_revision(self, sheet_id):
+        """キャッシュ済みデータのリビジョンを取得"""
+        with self._lock:
+            entry = self._entries.get(sheet_id)
+            return entry[1] if entry else None
+
+    def patch(self, sheet_id, expected_revision, transform):
+        """
+        書き込みをキャッシュ済みのDataFrameに反映（再取得しない）
+
+        キャッシュが書き込み前のリビジョン（expected_revision）のデータである場合だけ、
+        transform(frame) で作った新しいDataFrameに置き換える（共有中の元のDataFrameは変更しない）。
+        置き換えたデータは、書き込み1回分だけ進んだリビジョンが確認されるまでは書き込み前のリビジョンで有効とし、
+        それ以外のリビジョン（間に他の変更があった）が確認されたら破棄する。
+
+        Returns:
+            bool: 反映できた場合True（できなかった場合はエントリーを破棄）
+        """
+        with self._lock:
+            entry = self._entries.get(sheet_id)
+            if entry is None or expected_revision is None or expected_revision not in (entry[1], entry[4]):
+                self._remove(sheet_id)
+                return False
+            written_revision = next_revision(entry[4] if entry[4] is not None else entry[1])
+            if written_revision is None:
+                self._remove(sheet_id)
+                return False
+
+        try:
+            frame = transform(entry[0])
+        except Exception:
+            self.invalidate(sheet_id)
+            return False
+
+        size = self._frame_size(frame)
+        with self._lock:
+            self._remove(sheet_id)
+            self._entries[sheet_id] = (frame, expected_revision, time.monotonic(), size, written_revision)
+            self._total_bytes += size
+            self._evict()
+        return True
+
+    def put(self, sheet_id, frame, revision=None):
+        """DataFrameをキャッシュに保存"""
+        size = self._frame_size(frame)
+        with self._lock:
+            self._remove(sheet_id)
+            self._entries[sheet_id] = (frame, revision, time.monotonic(), size, None)
+            self._total_bytes += size
+            self._evict()
+
+    def invalidate(self, sheet_id=None):
+        """キャッシュを無効化（sheet_id省略時は全件）"""
+        with self._lock:
+            if sheet_id is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            else:
+                self._remove(sheet_id)
+
+    def stats(self):
+        """キャッシュの統計情報"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, sheet_id):
+        entry = self._entries.pop(sheet_id, None)
+        if entry is not None:
+            self._total_bytes -= entry[3]
+
+    def _evict(self):
+        """上限を超えた分を古いものから破棄"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            sheet_id = next(iter(self._entries))
+            self._remove(sheet_id)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_sheet_cache():
+    """プロセス全体で共有するシートデータキャッシュを取得"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SheetDataCache()
+        return _cache
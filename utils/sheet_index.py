@@ -0,0 +1,271 @@
+"""
+債権者シートの重複チェック用インデックス
+
+シートごとに、行番号ごとのIDと正規化した重複判定キー（債権者名・債権額・任意で契約日）の
+ハッシュ、採番済みの最大IDを保持する。登録のたびにシート全体を読み直して線形比較する代わりに、
+インデックスで O(1) の重複チェックを行い、IDから行番号を特定して更新・削除する。
+インデックスはリビジョン（Driveのversion）で検証し、他で変更された場合は作り直す。
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from config.settings import DEDUPE_USE_CONTRACT_DATE, SHEET_CACHE, SOFT_DELETE
+from utils.creditor_record import parse_amount, parse_date
+from utils.sheet_cache import next_revision
+
+# シート上の列位置（CREDITOR_FIELDS順）
+_ID_COLUMN = 0
+_COMPANY_COLUMN = 2
+_AMOUNT_COLUMN = 9
+_CONTRACT_DATE_COLUMN = 10
+STATUS_COLUMN = 17
+_UPDATED_RANGE = re.compile(r'![A-Z]+(\d+)(?::[A-Z]+(\d+))?$')
+
+
+def _normalize_text(text):
+    """全角・半角、大文字・小文字、空白の違いを無視した文字列"""
+    normalized = unicodedata.normalize('NFKC', str(text or '')).casefold()
+    return ''.join(normalized.split())
+
+
+def dedupe_key(company_name, claim_amount, contract_date=''):
+    """重複判定キー（正規化した債権者名・債権額・契約日のハッシュ）"""
+    amount = parse_amount(claim_amount)
+    parts = [
+        _normalize_text(company_name),
+        str(amount) if amount is not None else _normalize_text(claim_amount),
+    ]
+    if DEDUPE_USE_CONTRACT_DATE:
+        parsed_date = parse_date(contract_date)
+        parts.append(parsed_date.isoformat() if parsed_date else _normalize_text(contract_date))
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def record_dedupe_key(data):
+    """入力データ（英語キー）の重複判定キー"""
+    return dedupe_key(data.get('company_name', ''), data.get('claim_amount', ''), data.get('contract_date', ''))
+
+
+def is_deleted_row(row):
+    """論理削除済みの行（ステータス列が削除済み）かどうか"""
+    return len(row) > STATUS_COLUMN and str(row[STATUS_COLUMN]).strip() == SOFT_DELETE["status"]
+
+
+def _row_key(row):
+    """シートの行（CREDITOR_FIELDS順のセル）の重複判定キー"""
+    padded = list(row) + [''] * (_CONTRACT_DATE_COLUMN + 1 - len(row))
+    return dedupe_key(padded[_COMPANY_COLUMN], padded[_AMOUNT_COLUMN], padded[_CONTRACT_DATE_COLUMN])
+
+
+def parse_updated_rows(updated_range):
+    """values.append の応答の updatedRange（例: 'シート1'!A5:T7）から行範囲を取得"""
+    match = _UPDATED_RANGE.search(updated_range or '')
+    if not match:
+        return None
+    start = int(match.group(1))
+    return start, int(match.group(2) or start)
+
+
+class SheetIndex:
+    """
+    1シート分の行の索引
+
+    行番号ごとのIDと重複判定キーを保持し、重複判定・IDの採番・IDから行番号の特定に使う。
+    行を削除した場合は以降の行番号を詰めて、他の行のIDから引ける行番号を正しく保つ。
+    """
+
+    def __init__(self, rows=None, max_id=0):
+        self.rows = dict(rows or {})  # 行番号 -> (ID, 重複判定キー)
+        self.key_counts = Counter(key for _, key in self.rows.values() if key is not None)
+        self.max_id = max_id
+        self._discarded = False  # 行の位置を記録できず、作り直しが必要
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_values(cls, all_values):
+        """シートの値（ヘッダー行＋データ行）から作成"""
+        rows = {}
+        max_id = 0
+        for sheet_row, row in enumerate(all_values[1:], start=2):
+            if any(str(cell).strip() for cell in row):
+                record_id = parse_amount(row[_ID_COLUMN]) if row else None
+                # 論理削除済みの行は重複判定に含めない（IDは元に戻せるよう予約したまま）
+                rows[sheet_row] = (record_id, None if is_deleted_row(row) else _row_key(row))
+                max_id = max(max_id, record_id or 0)
+        return cls(rows, max_id)
+
+    def __contains__(self, key):
+        return self.key_counts.get(key, 0) > 0
+
+    def reserve(self, records):
+        """
+        重複判定とIDの採番をまとめて行う（書き込み前に予約）
+
+        同時に登録された場合も同じIDや同じデータが二重に予約されないよう、ロックして処理する。
+
+        Returns:
+            list: 各レコードの (ID, 重複判定キー)（既存データまたは先行するレコードと重複する場合はNone）
+        """
+        reserved = []
+        with self._lock:
+            for data in records:
+                key = record_dedupe_key(data)
+                if key in self:
+                    reserved.append(None)
+                    continue
+                self.key_counts[key] += 1
+                self.max_id += 1
+                reserved.append((self.max_id, key))
+        return reserved
+
+    def record_rows(self, start_row, entries):
+        """
+        追加した行の位置を記録（entriesは予約した (ID, 重複判定キー) の一覧、キーは予約時に計上済み）
+
+        values.append は途中の空行の後に追加することがあり、その場合は下の行がずれるため、
+        追加位置が既知の最後の行の次でなければ記録しない（同時に追加した他の行も以降は記録しない）。
+
+        Returns:
+            bool: 記録できた場合True（Falseの場合はインデックスを作り直すこと）
+        """
+        with self._lock:
+            if self._discarded or start_row != max(self.rows, default=1) + 1:
+                self._discarded = True
+                return False
+            for offset, (record_id, key) in enumerate(entries):
+                self.rows[start_row + offset] = (record_id, key)
+            return True
+
+    def locate(self, record_id, hint_row=None):
+        """
+        IDから行番号を取得
+
+        同じIDの行が複数ある場合（古いデータ）は hint_row がそのIDの行であればそれを使い、
+        特定できなければNoneを返す。
+        """
+        with self._lock:
+            matches = [sheet_row for sheet_row, (row_id, _) in self.rows.items() if row_id == record_id]
+        if len(matches) == 1:
+            return matches[0]
+        if hint_row in matches:
+            return hint_row
+        return None
+
+    def remove_row(self, sheet_row):
+        """行の削除を反映（以降の行番号を1つ詰める）"""
+        with self._lock:
+            removed = self.rows.pop(sheet_row, None)
+            if removed is not None and removed[1] is not None:
+                self.key_counts[removed[1]] -= 1
+            self.rows = {
+                (row - 1 if row > sheet_row else row): entry
+                for row, entry in self.rows.items()
+            }
+
+    def mark_deleted(self, sheet_row):
+        """行の論理削除を反映（行番号とIDは残し、重複判定から外す）"""
+        with self._lock:
+            record_id, key = self.rows.get(sheet_row, (None, None))
+            if key is not None:
+                self.key_counts[key] -= 1
+            self.rows[sheet_row] = (record_id, None)
+    
+    def update_row(self, sheet_row, row_data):
+        """行の更新を反映（IDと重複判定キーを更新）"""
+        with self._lock:
+            _, old_key = self.rows.get(sheet_row, (None, None))
+            if old_key is not None:
+                self.key_counts[old_key] -= 1
+            row = [str(cell) for cell in row_data]
+            key = None if is_deleted_row(row) else _row_key(row)
+            if key is not None:
+                self.key_counts[key] += 1
+            self.rows[sheet_row] = (parse_amount(row[_ID_COLUMN]) if row else None, key)
+
+
+class SheetIndexStore:
+    """シートIDごとのインデックスを保持（全セッション共有）"""
+
+    def __init__(self, ttl_seconds=None):
+        self.ttl_seconds = ttl_seconds or SHEET_CACHE["ttl_seconds"]
+        # sheet_id -> (index, revision, stored_at, expected_revision)
+        # expected_revision は自分の書き込みを反映済みの場合に、書き込み後に確認されるはずのリビジョン
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, sheet_id, revision=None):
+        """
+        インデックスを取得（無効な場合はNone）
+
+        自分の書き込みを反映済みのインデックスは、書き込みの回数分だけ進んだリビジョンが確認できれば採用し、
+        それ以外のリビジョン（間に他の変更があった）の場合は作り直させる。
+        """
+        with self._lock:
+            entry = self._entries.get(sheet_id)
+            if entry is None:
+                return None
+
+            index, cached_revision, stored_at, expected_revision = entry
+            if revision is None:
+                valid = time.monotonic() - stored_at <= self.ttl_seconds
+            elif revision == expected_revision:
+                self._entries[sheet_id] = (index, revision, stored_at, None)
+                valid = True
+            else:
+                # 書き込み前のリビジョンは、書き込み後にまだ確認し直していない状態
+                valid = revision == cached_revision
+
+            if not valid:
+                del self._entries[sheet_id]
+                return None
+            return index
+
+    def put(self, sheet_id, index, revision=None):
+        """インデックスを保存（revisionは作成時に確認したリビジョン、不明ならNone）"""
+        with self._lock:
+            self._entries[sheet_id] = (index, revision, time.monotonic(), None)
+
+    def record_write(self, sheet_id, index):
+        """
+        自分の書き込みを反映したインデックスを保存
+
+        書き込み前のリビジョンが分かっている場合は、書き込み1回分だけ進んだリビジョンを次に受け入れる。
+        """
+        with self._lock:
+            entry = self._entries.get(sheet_id)
+            if entry is None or entry[0] is not index:
+                # 書き込み中に作り直された場合など（期限までは有効、リビジョンが確認されたら作り直す）
+                self._entries[sheet_id] = (index, None, time.monotonic(), None)
+                return
+            _, cached_revision, stored_at, expected_revision = entry
+            base_revision = expected_revision if expected_revision is not None else cached_revision
+            written_revision = next_revision(base_revision)
+            if written_revision is None:
+                self._entries[sheet_id] = (index, None, time.monotonic(), None)
+            else:
+                self._entries[sheet_id] = (index, cached_revision, stored_at, written_revision)
+
+    def invalidate(self, sheet_id=None):
+        """インデックスを無効化（sheet_id省略時は全件）"""
+        with self._lock:
+            if sheet_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(sheet_id, None)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_sheet_index_store():
+    """プロセス全体で共有するインデックスを取得"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SheetIndexStore()
+        return _store
@@ -2,16 +2,93 @@
 Google Sheets操作管理
 """
 
+import contextvars
 import os
+import threading
+import time
 import streamlit as st
-import pandas as pd
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from config.settings import CREDITOR_FIELDS, GOOGLE_SHEETS_SCOPES, SHEETS_HTTP_POOL, REVISION_PROBE_TTL_SECONDS, SHEET_POOL, SOFT_DELETE
+from utils.creditor_record import parse_amount
+from utils.debtor_index import DebtorSheet, get_debtor_index
+from utils.sheet_cache import get_sheet_cache
+from utils.single_flight import get_single_flight
+from utils.sheet_index import STATUS_COLUMN, SheetIndex, get_sheet_index_store, is_deleted_row, parse_updated_rows
+
+# 債権者スプレッドシート一覧で取得する項目（Drive APIのフィールドマスク）
+DEBTOR_SHEET_FIELDS = ('id', 'name', 'createdTime', 'modifiedTime')
+
+# ヘッダー行の書式
+HEADER_FORMAT = {
+    'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
+    'textFormat': {'bold': True}
+}
+
+# 直前の書き込み操作のエラー（取り込みの作業スレッドでは st.error が表示されないため、呼び出し元が取り出して表示する）
+_last_error = contextvars.ContextVar("sheets_last_error", default=None)
+# メッセージを表示しない実行中か（quiet_messages のブロック内）
+_quiet = contextvars.ContextVar("sheets_quiet", default=False)
+
+
+@contextmanager
+def quiet_messages():
+    """
+    ブロック内では st.info / st.error を表示しない（取り込みの作業スレッド用）
+
+    エラーは表示せずに記録だけ行い、呼び出し元が pop_last_error で取り出して表示する。
+    """
+    token = _quiet.set(True)
+    try:
+        yield
+    finally:
+        _quiet.reset(token)
+
+
+def _notify(message):
+    """お知らせを表示（quiet_messages のブロック内では表示しない）"""
+    if not _quiet.get():
+        st.info(message)
+
+
+def _report_error(message):
+    """エラーを表示し、呼び出し元が取り出せるよう記録（quiet_messages のブロック内では記録のみ）"""
+    _last_error.set(message)
+    if not _quiet.get():
+        st.error(message)
+
+
+def pop_last_error():
+    """直前の書き込み操作のエラーメッセージを取り出す（なければNone）"""
+    message = _last_error.get()
+    _last_error.set(None)
+    return message
+
 
 class SheetsManager:
-    def __init__(self):
+    def __init__(self, client=None):
+        """
+        Args:
+            client: 使用するgspreadクライアント（省略時は認証情報から作成。ベンチマーク等で差し替える場合に指定）
+        """
         self.client = None
         self.gc = None  # エイリアス追加
-        self.init_client()
+        self.credentials = None
+        self.session = None
+        self.cache = get_sheet_cache()
+        self.indexes = get_sheet_index_store()
+        self.debtors = get_debtor_index()
+        self.flights = get_single_flight()
+        self._pool_ids = None
+        self._pool_lock = threading.Lock()
+        self._revisions = {}
+        self._revisions_at = 0.0
+        self._revisions_lock = threading.Lock()
+        if client is not None:
+            self.client = client
+            self.gc = client
+        else:
+            self.init_client()
     
     def init_client(self):
         """Google Sheetsクライアントを初期化"""
@@ -26,6 +103,10 @@ class SheetsManager:
                 self.client = None
                 self.gc = None
             
+            # 空きシートのプールをバックグラウンドで用意
+            if self.client and SHEET_POOL["size"] > 0:
+                threading.Thread(target=self.replenish_sheet_pool, daemon=True).start()
+            
         except Exception as e:
             st.error(f"Google Sheets接続エラー: {str(e)}")
             self.client = None
@@ -33,41 +114,25 @@ class SheetsManager:
     
     def _init_from_file(self):
         """credentials.jsonからの初期化"""
-        import gspread
         from google.oauth2.service_account import Credentials
         
-        # Google Sheets API のスコープを直接定義
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
         credentials = Credentials.from_service_account_file(
-            'credentials.json', scopes=scopes
+            'credentials.json', scopes=GOOGLE_SHEETS_SCOPES
         )
-        self.client = gspread.authorize(credentials)
-        self.gc = self.client  # エイリアス設定
+        self._authorize(credentials)
     
     def _init_from_secrets(self):
         """Streamlit Secretsからの初期化"""
-        import gspread
         from google.oauth2.service_account import Credentials
         
         try:
-            # Google Sheets API のスコープを直接定義
-            scopes = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-            
             # Streamlit Secretsから認証情報を取得
             credentials_info = dict(st.secrets['gcp_service_account'])
             
             credentials = Credentials.from_service_account_info(
-                credentials_info, scopes=scopes
+                credentials_info, scopes=GOOGLE_SHEETS_SCOPES
             )
-            self.client = gspread.authorize(credentials)
-            self.gc = self.client  # エイリアス設定
+            self._authorize(credentials)
             
         except Exception as e:
             st.error(f"Google Sheets認証エラー: {str(e)}")
@@ -75,6 +140,48 @@ class SheetsManager:
             self.gc = None
             raise e
     
+    def _authorize(self, credentials):
+        """接続プール付きのセッションでクライアントを作成"""
+        import gspread
+        from requests.adapters import HTTPAdapter
+        from utils.instrumented_session import InstrumentedSession
+        
+        # AuthorizedSessionはトークン期限切れ時に自動で再取得する（リクエストごとに計測を記録）
+        session = InstrumentedSession(credentials)
+        adapter = HTTPAdapter(
+            pool_connections=SHEETS_HTTP_POOL["pool_connections"],
+            pool_maxsize=SHEETS_HTTP_POOL["pool_maxsize"]
+        )
+        session.mount("https://", adapter)
+        
+        self.credentials = credentials
+        self.session = session
+        self.client = gspread.Client(auth=credentials, session=session)
+        self.gc = self.client  # エイリアス設定
+    
+    def refresh_credentials(self):
+        """アクセストークンを明示的に更新"""
+        if not self.credentials or not self.session:
+            return False
+            
+        try:
+            from google.auth.transport.requests import Request
+            
+            self.credentials.refresh(Request(self.session))
+            return True
+            
+        except Exception as e:
+            st.error(f"トークン更新エラー: {e}")
+            return False
+    
+    def close(self):
+        """HTTPセッションを閉じて接続プールを解放"""
+        if self.session:
+            self.session.close()
+        self.session = None
+        self.client = None
+        self.gc = None
+    
     def is_connected(self):
         """接続状態を確認"""
         return self.client is not None
@@ -95,22 +202,13 @@ class SheetsManager:
                 st.error("Google Sheetsクライアントが接続されていません")
                 return None
                 
-            # スプレッドシートを開く
-            spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            
-            # シート名が指定されていない場合は最初のシートを使用
-            if sheet_name:
-                worksheet = spreadsheet.worksheet(sheet_name)
-            else:
-                worksheet = spreadsheet.get_worksheet(0)  # 最初のシート
+            # 全データを取得（シート名が指定されていない場合は最初のシート）
+            data = self._get_all_values(spreadsheet_id, sheet_name)
             
-            # 全データを取得
-            data = worksheet.get_all_values()
-            
-            # 空の行を除去
+            # 空の行と論理削除済みの行を除去
             filtered_data = []
             for row in data:
-                if any(cell.strip() for cell in row):  # 空白でないセルがある行のみ
+                if any(cell.strip() for cell in row) and not is_deleted_row(row):  # 空白でないセルがある行のみ
                     filtered_data.append(row)
             
             return filtered_data
@@ -125,20 +223,18 @@ class SheetsManager:
             return []
             
         try:
-            spreadsheets = self.client.list_spreadsheet_files()
             debt_sheets = []
             
-            for sheet in spreadsheets:
-                if "債権者データ_" in sheet['name']:
-                    parts = sheet['name'].split('_')
-                    if len(parts) >= 2:
-                        debtor_name = parts[1]
-                        debt_sheets.append({
-                            'name': debtor_name,
-                            'id': sheet['id'],
-                            'sheet_id': sheet['id'],  # 両方のキーを追加
-                            'url': f"https://docs.google.com/spreadsheets/d/{sheet['id']}/edit?usp=sharing"
-                        })
+            for sheet in self.iter_debtor_spreadsheets():
+                parts = sheet['name'].split('_')
+                if len(parts) >= 2:
+                    debtor_name = parts[1]
+                    debt_sheets.append({
+                        'name': debtor_name,
+                        'id': sheet['id'],
+                        'sheet_id': sheet['id'],  # 両方のキーを追加
+                        'url': f"https://docs.google.com/spreadsheets/d/{sheet['id']}/edit?usp=sharing"
+                    })
             
             return debt_sheets
             
@@ -146,8 +242,50 @@ class SheetsManager:
             st.error(f"スプレッドシート一覧取得エラー: {e}")
             return []
     
+    def iter_debtor_spreadsheets(self, debtor_name=None, fields=DEBTOR_SHEET_FIELDS):
+        """
+        債権者スプレッドシートを順に返すジェネレーター
+        
+        名前（債権者データ_）とゴミ箱の条件はDrive側で絞り込み、必要な項目だけを
+        ページ単位で取得する。途中で止めれば残りのページは取得しない。
+        
+        Args:
+            debtor_name: 指定した場合はその債務者のシートだけ
+            fields: 取得する項目（Drive APIのファイルのフィールド名）
+        """
+        prefix = f"債権者データ_{debtor_name}" if debtor_name else "債権者データ_"
+        escaped_prefix = prefix.replace("\\", "\\\\").replace("'", "\\'")
+        for file in self._list_drive_files(
+            f"name contains '{escaped_prefix}' and trashed = false",
+            f"files({','.join(fields)})"
+        ):
+            # Driveのcontainsは単語単位の一致のため、名前を改めて確認
+            if "債権者データ_" in file.get('name', prefix):
+                yield file
+    
+    def _get_all_values(self, sheet_id, sheet_name=None):
+        """
+        シートの全ての値を取得（行の配列、末尾の空セルは省略される）
+        
+        同じシート・範囲の読み込みが同時に実行中の場合は、その結果を共有して1回のリクエストにまとめる。
+        結果は他の呼び出し元と共有するため変更しないこと。
+        """
+        from utils.async_sheets import DEFAULT_VALUES_RANGE
+        
+        # シート名なしのA1表記は先頭シートを指す
+        range_name = DEFAULT_VALUES_RANGE
+        if sheet_name:
+            range_name = "'{}'!{}".format(sheet_name.replace("'", "''"), DEFAULT_VALUES_RANGE)
+        
+        return self.flights.do(
+            (sheet_id, range_name),
+            lambda: self.client.http_client.values_get(sheet_id, range_name).get('values', [])
+        )
+    
     def get_data(self, sheet_info):
         """スプレッドシートからデータを取得（pandas DataFrame形式）"""
+        import pandas as pd
+        
         if not self.client:
             return pd.DataFrame()
             
@@ -166,40 +304,184 @@ class SheetsManager:
                 st.error("スプレッドシートIDが無効です")
                 return pd.DataFrame()
                 
-            spreadsheet = self.client.open_by_key(sheet_id)
-            worksheet = spreadsheet.sheet1
-            
             # 全ての値を取得
-            all_values = worksheet.get_all_values()
-            
-            if not all_values:
-                return pd.DataFrame()
-            
-            # ヘッダー行とデータ行を分離
-            headers = all_values[0]
-            data_rows = all_values[1:]
-            
-            # 空の行を除去してDataFrameを作成
-            filtered_rows = []
-            for i, row in enumerate(data_rows, start=2):  # 行番号は2から開始（ヘッダーが1行目）
-                if any(cell.strip() for cell in row):
-                    # 行番号を追加（Google Sheetsの実際の行番号）
-                    row_with_number = row + [i] if len(row) < len(headers) + 1 else row
-                    filtered_rows.append(row_with_number)
-            
-            if not filtered_rows:
-                return pd.DataFrame()
-            
-            # DataFrame作成（sheet_row列を追加）
-            df_headers = headers + ['sheet_row']
-            df = pd.DataFrame(filtered_rows, columns=df_headers[:len(filtered_rows[0])])
+            all_values = self._get_all_values(sheet_id)
             
-            return df
+            return self._values_to_dataframe(all_values)
             
         except Exception as e:
             st.error(f"データ取得エラー: {e}")
             return pd.DataFrame()
     
+    def get_data_many(self, sheet_ids):
+        """複数のスプレッドシートのデータを並行取得（{sheet_id: DataFrame}形式）"""
+        import pandas as pd
+        
+        sheet_ids = list(dict.fromkeys(sheet_ids))
+        if not self.client or not sheet_ids:
+            return {sheet_id: pd.DataFrame() for sheet_id in sheet_ids}
+        
+        from utils.async_sheets import AsyncSheetsClient
+        
+        results = AsyncSheetsClient(self.client).fetch_many(sheet_ids)
+        
+        frames = {}
+        for sheet_id, values in results.items():
+            if isinstance(values, Exception):
+                st.error(f"データ取得エラー ({sheet_id}): {values}")
+                frames[sheet_id] = pd.DataFrame()
+            else:
+                frames[sheet_id] = self._values_to_dataframe(values)
+        
+        return frames
+    
+    def get_cached_data(self, sheet_id, revision=None):
+        """共有キャッシュ経由でデータを取得（キャッシュにないか、リビジョンが変わった場合のみ取得）"""
+        df = self.cache.get(sheet_id, revision)
+        if df is None:
+            df = self.get_data(sheet_id)
+            if self.client and not df.empty:
+                self.cache.put(sheet_id, df, revision)
+        return df
+    
+    def get_cached_data_many(self, sheet_ids, revisions=None):
+        """共有キャッシュ経由で複数シートのデータを取得（不足分だけを並行取得）"""
+        revisions = revisions or {}
+        frames = {}
+        missing_ids = []
+        for sheet_id in dict.fromkeys(sheet_ids):
+            df = self.cache.get(sheet_id, revisions.get(sheet_id))
+            if df is None:
+                missing_ids.append(sheet_id)
+            else:
+                frames[sheet_id] = df
+        
+        if missing_ids:
+            for sheet_id, df in self.get_data_many(missing_ids).items():
+                if self.client and not df.empty:
+                    self.cache.put(sheet_id, df, revisions.get(sheet_id))
+                frames[sheet_id] = df
+        
+        return frames
+    
+    def get_revisions(self, sheet_ids=None, max_age=REVISION_PROBE_TTL_SECONDS):
+        """
+        債権者スプレッドシートのリビジョンを一括取得
+        
+        Drive files.list 1回（ページ単位）で全債権者シートの version と modifiedTime を取得する。
+        max_age秒以内の結果は再利用する。
+        
+        Returns:
+            dict: {sheet_id: {'version': str, 'modified_time': str}}
+        """
+        if not self.client:
+            return {}
+        
+        with self._revisions_lock:
+            if time.monotonic() - self._revisions_at > max_age:
+                try:
+                    revisions = {}
+                    for file in self.iter_debtor_spreadsheets(fields=('id', 'name', 'version', 'modifiedTime')):
+                        revisions[file['id']] = {
+                            'version': file.get('version'),
+                            'modified_time': file.get('modifiedTime', '')
+                        }
+                    self._revisions = revisions
+                    self._revisions_at = time.monotonic()
+                except Exception as e:
+                    _report_error(f"更新状況の取得エラー: {e}")
+            
+            revisions = self._revisions
+        
+        if sheet_ids is None:
+            return dict(revisions)
+        return {sheet_id: revisions[sheet_id] for sheet_id in sheet_ids if sheet_id in revisions}
+    
+    def get_revision_tokens(self, sheet_ids=None):
+        """キャッシュ検証用のリビジョントークン（Driveのversion）を取得"""
+        return {sheet_id: info['version'] for sheet_id, info in self.get_revisions(sheet_ids).items()}
+    
+    def _invalidate(self, sheet_id, index=None, patch=None, revision=None):
+        """
+        書き込み後にキャッシュを無効化
+        
+        index を指定した場合は、書き込みを反映済みのインデックスとして保持する（それ以外は破棄）。
+        patch を指定した場合は、書き込み前のリビジョン（revision）のキャッシュに patch を適用して
+        再取得せずに保持する。
+        リビジョン確認結果は期限まで使い続ける（自分の書き込みのたびに全債権者シートを検索し直さない）。
+        """
+        # 書き込み前に始まった読み込みの結果を、以降の読み込みで共有しない
+        self.flights.forget(sheet_id)
+        if patch is None or not self.cache.patch(sheet_id, revision, patch):
+            self.cache.invalidate(sheet_id)
+        if index is None:
+            self.indexes.invalidate(sheet_id)
+        else:
+            self.indexes.record_write(sheet_id, index)
+    
+    def get_sheet_index(self, spreadsheet):
+        """重複チェック用インデックスを取得（ないか、他で変更された場合はシートを1回読んで作成）"""
+        sheet_id = spreadsheet.id
+        revision = self.get_revision_tokens([sheet_id]).get(sheet_id)
+        index = self.indexes.get(sheet_id, revision)
+        if index is None:
+            index = SheetIndex.from_values(self._get_all_values(sheet_id))
+            self.indexes.put(sheet_id, index, revision)
+        return index
+    
+    def _list_drive_files(self, query, file_fields, page_size=1000):
+        """Drive files.list をページ単位で呼び出してスプレッドシートファイルを順に返す"""
+        from gspread.urls import DRIVE_FILES_API_V3_URL
+        
+        params = {
+            "q": f"mimeType = 'application/vnd.google-apps.spreadsheet' and {query}",
+            "pageSize": page_size,
+            "supportsAllDrives": True,
+            "includeItemsFromAllDrives": True,
+            "fields": f"nextPageToken,{file_fields}",
+        }
+        
+        while True:
+            response = self.client.http_client.request("get", DRIVE_FILES_API_V3_URL, params=params).json()
+            for file in response.get("files", []):
+                yield file
+            
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+            params["pageToken"] = page_token
+    
+    @staticmethod
+    def _values_to_dataframe(all_values):
+        """シートの値（行の配列）をsheet_row列付きのDataFrameに変換"""
+        import pandas as pd
+        
+        if not all_values:
+            return pd.DataFrame()
+        
+        # ヘッダー行とデータ行を分離
+        headers = all_values[0]
+        data_rows = all_values[1:]
+        
+        # 値APIは末尾の空セルを省略するため、ヘッダー幅まで埋める
+        width = max(len(row) for row in all_values)
+        headers = headers + [''] * (width - len(headers))
+        
+        # 空の行と論理削除済みの行を除去してDataFrameを作成
+        filtered_rows = []
+        for i, row in enumerate(data_rows, start=2):  # 行番号は2から開始（ヘッダーが1行目）
+            if any(cell.strip() for cell in row) and not is_deleted_row(row):
+                # 行番号を追加（Google Sheetsの実際の行番号）
+                row = row + [''] * (width - len(row))
+                filtered_rows.append(row + [i])
+        
+        if not filtered_rows:
+            return pd.DataFrame()
+        
+        # DataFrame作成（sheet_row列を追加）
+        df_headers = headers + ['sheet_row']
+        return pd.DataFrame(filtered_rows, columns=df_headers)
+    
     def clear_sheet_data(self, sheet_id):
         """シートのデータ部分をクリア（ヘッダーは残す）"""
         if not self.client:
@@ -220,6 +502,7 @@ class SheetsManager:
             if last_row > 1:
                 worksheet.batch_clear([f'A2:Z{last_row}'])
             
+            self._invalidate(sheet_id)
             return True
             
         except Exception as e:
@@ -240,11 +523,9 @@ class SheetsManager:
             worksheet.update(f'A1:{end_col}1', [headers])
             
             # ヘッダー行のフォーマット
-            worksheet.format(f'A1:{end_col}1', {
-                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
-                'textFormat': {'bold': True}
-            })
+            worksheet.format(f'A1:{end_col}1', HEADER_FORMAT)
             
+            self._invalidate(sheet_id)
             return True
             
         except Exception as e:
@@ -260,14 +541,10 @@ class SheetsManager:
             spreadsheet = self.client.open_by_key(sheet_id)
             worksheet = spreadsheet.sheet1
             
-            # 現在のデータの最後の行を取得
-            all_values = worksheet.get_all_values()
-            next_row = len(all_values) + 1
-            
             # データを行形式に変換
             if isinstance(data, dict):
-                # ヘッダーの順序に従ってデータを配列に変換
-                headers = all_values[0] if all_values else []
+                # ヘッダーの順序に従ってデータを配列に変換（ヘッダー行だけを取得）
+                headers = worksheet.row_values(1)
                 row_data = []
                 for header in headers:
                     if header == 'sheet_row':
@@ -277,9 +554,9 @@ class SheetsManager:
                 row_data = data
             
             # データを追加
-            end_col = chr(ord('A') + len(row_data) - 1)
-            worksheet.update(f'A{next_row}:{end_col}{next_row}', [row_data])
+            self._append_rows(worksheet, [row_data])
             
+            self._invalidate(sheet_id)
             return True
             
         except Exception as e:
@@ -312,54 +589,137 @@ class SheetsManager:
             st.error(f"空行検索エラー: {e}")
             return 2
     
+    @staticmethod
+    def _unique_headers():
+        """ヘッダー行（重複を避けるため一意のヘッダーに）"""
+        unique_headers = []
+        for i, field in enumerate(CREDITOR_FIELDS):
+            if field in unique_headers:
+                unique_headers.append(f"{field}_{i}")
+            else:
+                unique_headers.append(field)
+        return unique_headers
+    
+    def _provision(self, spreadsheet):
+        """
+        新規スプレッドシートの初期設定
+        
+        ヘッダー行の値と書式を1回の batchUpdate で設定し、公開設定（誰でも編集可能）を1回だけ行う。
+        """
+        headers = self._unique_headers()
+        spreadsheet.batch_update({"requests": [{
+            "updateCells": {
+                # 新規作成したスプレッドシートの先頭シートのIDは0
+                "range": {
+                    "sheetId": 0,
+                    "startRowIndex": 0, "endRowIndex": 1,
+                    "startColumnIndex": 0, "endColumnIndex": len(headers)
+                },
+                "rows": [{"values": [
+                    {"userEnteredValue": {"stringValue": header}, "userEnteredFormat": HEADER_FORMAT}
+                    for header in headers
+                ]}],
+                "fields": "userEnteredValue,userEnteredFormat(backgroundColor,textFormat)"
+            }
+        }]})
+        
+        # スプレッドシートを完全に公開（誰でも編集可能）
+        spreadsheet.share('', perm_type='anyone', role='writer', notify=False)
+    
     def create_spreadsheet(self, debtor_name):
-        """債務者専用のスプレッドシートを作成"""
+        """債務者専用のスプレッドシートを作成（空きシートのプールがあればそれを使用）"""
         if not self.client:
             return None
             
         try:
-            from config.settings import CREDITOR_FIELDS
-            
             # 重複しないタイムスタンプを追加
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             sheet_name = f"債権者データ_{debtor_name}_{timestamp}"
             
-            # スプレッドシート作成
-            spreadsheet = self.client.create(sheet_name)
-            
-            # ワークシート取得
-            worksheet = spreadsheet.sheet1
-            
-            # ヘッダー行を設定（重複を避けるため一意のヘッダーに）
-            unique_headers = []
-            for i, field in enumerate(CREDITOR_FIELDS):
-                if field in unique_headers:
-                    unique_headers.append(f"{field}_{i}")
-                else:
-                    unique_headers.append(field)
+            spreadsheet = self._take_pooled_spreadsheet(sheet_name)
+            if spreadsheet is None:
+                # スプレッドシート作成とヘッダー・公開設定
+                spreadsheet = self.client.create(sheet_name)
+                self._provision(spreadsheet)
             
-            worksheet.update('A1:T1', [unique_headers])
-            
-            # ヘッダー行のフォーマット
-            worksheet.format('A1:T1', {
-                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9},
-                'textFormat': {'bold': True}
-            })
-            
-            # スプレッドシートを完全に公開（誰でも編集可能）
-            spreadsheet.share('', perm_type='anyone', role='writer', notify=False)
-            
-            # ドメイン制限なしで誰でもアクセス可能に設定
-            try:
-                spreadsheet.share('', perm_type='anyone', role='writer', notify=False, with_link=True)
-            except:
-                pass  # 既に設定済みの場合はエラーを無視
+            # 空のシートなので重複チェック用インデックスを読み取りなしで用意
+            self.indexes.put(spreadsheet.id, SheetIndex())
+            self.debtors.put(debtor_name, DebtorSheet(
+                spreadsheet.id, sheet_name,
+                datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                shared=True
+            ))
             
             return spreadsheet
             
         except Exception as e:
-            st.error(f"スプレッドシート作成エラー: {e}")
+            _report_error(f"スプレッドシート作成エラー: {e}")
+            return None
+    
+    def _load_pool_ids(self):
+        """空きシートのプールのIDを作成日時順に読み込む（初回のみDriveを検索。_pool_lock を保持して呼ぶ）"""
+        if self._pool_ids is None:
+            self._pool_ids = [
+                file['id'] for file in sorted(
+                    self._list_drive_files(
+                        f"name contains '{SHEET_POOL['name_prefix']}' and trashed = false",
+                        "files(id,createdTime)"
+                    ),
+                    key=lambda file: file.get('createdTime', '')
+                )
+            ]
+    
+    def _take_pooled_spreadsheet(self, sheet_name):
+        """空きシートのプールから1つ取り出して債務者用の名前に変更（プールが空ならNone）"""
+        if SHEET_POOL["size"] <= 0:
+            return None
+        
+        from gspread.urls import DRIVE_FILES_API_V3_URL
+        
+        with self._pool_lock:
+            self._load_pool_ids()
+            sheet_id = self._pool_ids.pop(0) if self._pool_ids else None
+        
+        if sheet_id is None:
             return None
+        
+        try:
+            self.client.http_client.request(
+                "patch", f"{DRIVE_FILES_API_V3_URL}/{sheet_id}",
+                params={"supportsAllDrives": True}, json={"name": sheet_name}
+            )
+            spreadsheet = self.client.open_by_key(sheet_id)
+        except Exception:
+            # 名前を変えられなかったシートはプールに戻す
+            with self._pool_lock:
+                self._pool_ids.insert(0, sheet_id)
+            return None
+        
+        # 使った分をバックグラウンドで補充
+        threading.Thread(target=self.replenish_sheet_pool, daemon=True).start()
+        return spreadsheet
+    
+    def replenish_sheet_pool(self):
+        """空きシートのプールを設定数まで補充（ヘッダー・公開設定済みの空シートを作成）"""
+        if not self.client or SHEET_POOL["size"] <= 0:
+            return 0
+        
+        with self._pool_lock:
+            self._load_pool_ids()
+            shortage = SHEET_POOL["size"] - len(self._pool_ids)
+        
+        created = 0
+        for _ in range(max(0, shortage)):
+            try:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+                spreadsheet = self.client.create(f"{SHEET_POOL['name_prefix']}{timestamp}")
+                self._provision(spreadsheet)
+            except Exception:
+                break
+            with self._pool_lock:
+                self._pool_ids.append(spreadsheet.id)
+            created += 1
+        return created
     
     def get_or_create_spreadsheet(self, debtor_name):
         """債務者のスプレッドシートを取得または作成（重複防止強化）"""
@@ -367,38 +727,107 @@ class SheetsManager:
             return None
             
         try:
-            # 既存のスプレッドシートを検索（より厳密な検索）
-            spreadsheets = self.client.list_spreadsheet_files()
-            existing_sheets = []
-            
-            for sheet in spreadsheets:
-                # 完全一致または部分一致で債務者名を含むシートを検索
-                if (f"債権者データ_{debtor_name}_" in sheet['name'] or 
-                    sheet['name'] == f"債権者データ_{debtor_name}"):
-                    existing_sheets.append(sheet)
-            
-            # 既存のシートがある場合は最新のものを返す
-            if existing_sheets:
+            # 債務者スプレッドシート索引にあればDriveを検索しない
+            debtor_sheet = self.debtors.get(debtor_name)
+            existing_sheet = None
+            if debtor_sheet:
+                try:
+                    existing_sheet = self.client.open_by_key(debtor_sheet.sheet_id)
+                except Exception:
+                    # 他で削除された場合は検索し直す
+                    self.debtors.invalidate_sheet(debtor_sheet.sheet_id)
+                    debtor_sheet = None
+            
+            if debtor_sheet is None:
+                # 既存のスプレッドシートを検索（より厳密な検索）
+                existing_sheets = []
+                for sheet in self.iter_debtor_spreadsheets(debtor_name, (*DEBTOR_SHEET_FIELDS, 'permissionIds')):
+                    # 完全一致または部分一致で債務者名を含むシートを検索
+                    if (f"債権者データ_{debtor_name}_" in sheet['name'] or 
+                        sheet['name'] == f"債権者データ_{debtor_name}"):
+                        existing_sheets.append(sheet)
+                
+                if not existing_sheets:
+                    # 見つからない場合は新規作成
+                    _notify(f"{debtor_name} の新しいスプレッドシートを作成します")
+                    return self.create_spreadsheet(debtor_name)
+                
                 # 作成日時でソート（最新を取得）
                 latest_sheet = max(existing_sheets, key=lambda x: x.get('createdTime', ''))
-                existing_sheet = self.client.open_by_key(latest_sheet['id'])
-                
-                # 既存のスプレッドシートも公開設定を確認
+                permission_ids = latest_sheet.get('permissionIds', [])
+                debtor_sheet = DebtorSheet(
+                    latest_sheet['id'], latest_sheet['name'], latest_sheet.get('createdTime', ''),
+                    shared='anyone' in permission_ids or 'anyoneWithLink' in permission_ids
+                )
+                self.debtors.put(debtor_name, debtor_sheet)
+                existing_sheet = self.client.open_by_key(debtor_sheet.sheet_id)
+            
+            # 公開設定がまだの場合だけ設定
+            if not debtor_sheet.shared:
                 try:
                     existing_sheet.share('', perm_type='anyone', role='writer', notify=False)
+                    self.debtors.mark_shared(debtor_name)
                 except:
                     pass
-                    
-                st.info(f"既存のスプレッドシートを使用します: {latest_sheet['name']}")
-                return existing_sheet
             
-            # 見つからない場合は新規作成
-            st.info(f"{debtor_name} の新しいスプレッドシートを作成します")
-            return self.create_spreadsheet(debtor_name)
+            _notify(f"既存のスプレッドシートを使用します: {debtor_sheet.name}")
+            return existing_sheet
             
         except Exception as e:
-            st.error(f"スプレッドシート取得エラー: {e}")
+            _report_error(f"スプレッドシート取得エラー: {e}")
+            return None
+    
+    @staticmethod
+    def _build_row(data, data_id, registered_at):
+        """入力データ（英語キー）をCREDITOR_FIELDS順の行に変換"""
+        return [
+            data_id,  # ID
+            data.get('debtor_name', ''),
+            data.get('company_name', ''),
+            data.get('branch_name', ''),
+            data.get('postal_code', ''),
+            data.get('address', ''),
+            data.get('phone_number', ''),
+            data.get('fax_number', ''),
+            data.get('claim_name', ''),
+            data.get('claim_amount', ''),
+            data.get('contract_date', ''),
+            data.get('first_borrowing_date', ''),
+            data.get('last_borrowing_date', ''),
+            data.get('last_payment_date', ''),
+            data.get('original_creditor', ''),
+            data.get('substitution_or_transfer', ''),
+            data.get('transfer_date', ''),
+            '未確認',  # ステータス
+            data.get('notes', ''),
+            registered_at
+        ]
+    
+    @staticmethod
+    def _append_rows(worksheet, rows):
+        """
+        行をシートの末尾にサーバー側で追加（values.append の INSERT_ROWS）
+        
+        次の空行を読み取って書き込む方式と違い、同時に追加しても互いに上書きしない。
+        """
+        return worksheet.append_rows(
+            rows,
+            value_input_option='RAW',
+            insert_data_option='INSERT_ROWS',
+            table_range='A1'
+        )
+    
+    @staticmethod
+    def _record_appended_rows(index, response, reservations):
+        """
+        追加した行の位置をインデックスに記録
+        
+        応答から位置が分からない場合や、シートの末尾以外に追加された場合はNoneを返して作り直させる。
+        """
+        updated_rows = parse_updated_rows((response or {}).get('updates', {}).get('updatedRange'))
+        if updated_rows is None or not index.record_rows(updated_rows[0], reservations):
             return None
+        return index
     
     def add_data(self, spreadsheet, data):
         """スプレッドシートにデータを追加（重複チェック強化）"""
@@ -408,54 +837,61 @@ class SheetsManager:
         try:
             worksheet = spreadsheet.sheet1
             
-            # 既存データをチェックして重複を防ぐ
-            existing_data = worksheet.get_all_values()
-            if len(existing_data) > 1:  # ヘッダー行以外にデータがある場合
-                # 同じ債権者名と債権額の組み合わせがないかチェック
-                company_name = data.get('company_name', '')
-                claim_amount = data.get('claim_amount', '')
-                
-                for row in existing_data[1:]:  # ヘッダー行をスキップ
-                    if len(row) >= 3 and row[2] == company_name and row[9] == str(claim_amount):
-                        st.warning(f"同じデータが既に存在します: {company_name}")
-                        return True  # 重複として処理成功扱い
-            
-            # 次の空行を見つける
-            next_row = self.find_next_empty_row(spreadsheet.id)
-            
-            # IDは行番号-1（ヘッダー行を除く）
-            data_id = next_row - 1
-            
-            row_data = [
-                data_id,  # ID
-                data.get('debtor_name', ''),
-                data.get('company_name', ''),
-                data.get('branch_name', ''),
-                data.get('postal_code', ''),
-                data.get('address', ''),
-                data.get('phone_number', ''),
-                data.get('fax_number', ''),
-                data.get('claim_name', ''),
-                data.get('claim_amount', ''),
-                data.get('contract_date', ''),
-                data.get('first_borrowing_date', ''),
-                data.get('last_borrowing_date', ''),
-                data.get('last_payment_date', ''),
-                data.get('original_creditor', ''),
-                data.get('substitution_or_transfer', ''),
-                data.get('transfer_date', ''),
-                '未確認',  # ステータス
-                data.get('notes', ''),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            ]
+            # インデックスで重複を確認し、IDを採番（債権者名と債権額、全角・半角や空白の違いは無視）
+            index = self.get_sheet_index(spreadsheet)
+            reserved = index.reserve([data])[0]
+            if reserved is None:
+                st.warning(f"同じデータが既に存在します: {data.get('company_name', '')}")
+                return True  # 重複として処理成功扱い
             
-            worksheet.update(f'A{next_row}:T{next_row}', [row_data])
+            row_data = self._build_row(data, reserved[0], datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            
+            response = self._append_rows(worksheet, [row_data])
+            self._invalidate(spreadsheet.id, self._record_appended_rows(index, response, [reserved]))
             return True
             
         except Exception as e:
+            self.indexes.invalidate(spreadsheet.id)
             st.error(f"データ追加エラー: {e}")
             return False
     
+    def add_data_batch(self, spreadsheet, records):
+        """
+        複数件のデータを1回の書き込みで追加
+        
+        書き込み前に全件の重複判定とID採番をインデックスでまとめて行い、重複しないものだけを書き込む。
+        
+        Returns:
+            list: 各レコードの結果（'added' または 'duplicate'）。失敗時はNone
+        """
+        if not spreadsheet:
+            return None
+        if not records:
+            return []
+            
+        try:
+            worksheet = spreadsheet.sheet1
+            
+            index = self.get_sheet_index(spreadsheet)
+            reservations = index.reserve(records)
+            added = [(data, reserved) for data, reserved in zip(records, reservations) if reserved is not None]
+            
+            registered_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [self._build_row(data, reserved[0], registered_at) for data, reserved in added]
+            
+            if rows:
+                response = self._append_rows(worksheet, rows)
+                self._invalidate(
+                    spreadsheet.id,
+                    self._record_appended_rows(index, response, [reserved for _, reserved in added])
+                )
+            return ['duplicate' if reserved is None else 'added' for reserved in reservations]
+            
+        except Exception as e:
+            self.indexes.invalidate(spreadsheet.id)
+            _report_error(f"データ一括追加エラー: {e}")
+            return None
+    
     def delete_spreadsheet(self, sheet_id):
         """スプレッドシートを削除"""
         if not self.client:
@@ -468,6 +904,8 @@ class SheetsManager:
             # スプレッドシートを削除（ゴミ箱に移動）
             self.client.del_spreadsheet(sheet_id)
             
+            self._invalidate(sheet_id)
+            self.debtors.invalidate_sheet(sheet_id)
             return True
             
         except Exception as e:
@@ -485,6 +923,7 @@ class SheetsManager:
             
             # 行を削除（row_numberは1ベース）
             worksheet.delete_rows(row_number)
+            self._invalidate(sheet_id)
             return True
             
         except Exception as e:
@@ -506,32 +945,254 @@ class SheetsManager:
             
             # 行を更新（A列からT列まで）
             worksheet.update(f'A{row_number}:T{row_number}', [row_data])
+            self._invalidate(sheet_id)
+            return True
+            
+        except Exception as e:
+            st.error(f"行更新エラー: {e}")
+            return False
+    
+    @staticmethod
+    def _drop_frame_row(df, sheet_row):
+        """DataFrameから行を除き、以降のsheet_rowを詰める（元のDataFrameは変更しない）"""
+        patched = df[df['sheet_row'] != sheet_row].copy()
+        patched.loc[patched['sheet_row'] > sheet_row, 'sheet_row'] -= 1
+        return patched
+    
+    @staticmethod
+    def _replace_frame_row(df, sheet_row, row_data):
+        """DataFrameの行の値を置き換える（元のDataFrameは変更しない）"""
+        patched = df.copy()
+        columns = [col for col in patched.columns if col != 'sheet_row']
+        values = [str(cell) for cell in row_data][:len(columns)]
+        values += [''] * (len(columns) - len(values))
+        patched.loc[patched['sheet_row'] == sheet_row, columns] = values
+        return patched
+    
+    def _read_record_id(self, sheet_id, sheet_row):
+        """行のID列の値を1セルだけ読む（数値でなければNone）"""
+        values = self.client.http_client.values_get(sheet_id, f"A{sheet_row}").get('values', [])
+        return parse_amount(values[0][0]) if values and values[0] else None
+    
+    def _locate_creditor(self, sheet_id, record_id, hint_row=None):
+        """
+        IDから行を特定（スプレッドシート, インデックス, 行番号, 書き込み前のリビジョン）
+        
+        リビジョンの確認後に他で行が追加・削除されていると、インデックスの行番号が別の行を指すことがあるため、
+        特定した行のID列を読んで確かめる。違う場合はインデックスとキャッシュを破棄し、読み直して特定し直す。
+        """
+        spreadsheet = self.client.open_by_key(sheet_id)
+        revision = self.get_revision_tokens([sheet_id]).get(sheet_id)
+        for _ in range(2):
+            index = self.get_sheet_index(spreadsheet)
+            sheet_row = index.locate(record_id, hint_row)
+            if sheet_row is None or self._read_record_id(sheet_id, sheet_row) == record_id:
+                return spreadsheet, index, sheet_row, revision
+            self.indexes.invalidate(sheet_id)
+            self.cache.invalidate(sheet_id)
+            # 書き込み前のリビジョンが分からないため、書き込み後はキャッシュを反映せずに破棄させる
+            revision = None
+        return spreadsheet, index, None, revision
+    
+    def delete_creditor(self, sheet_id, record_id, hint_row=None):
+        """
+        ID列で指定した債権者の行を削除
+        
+        他の行の削除で行番号がずれても、インデックスからIDの現在の行を特定する。
+        キャッシュ済みのデータは再取得せずに削除を反映する。
+        
+        Args:
+            hint_row: 同じIDの行が複数ある場合（古いデータ）に使う行番号
+        """
+        if not self.client:
+            return False
+            
+        try:
+            spreadsheet, index, sheet_row, revision = self._locate_creditor(sheet_id, record_id, hint_row)
+            if sheet_row is None:
+                self.indexes.invalidate(sheet_id)
+                st.error(f"ID {record_id} の行が見つかりません（他で変更された可能性があります）")
+                return False
+            
+            spreadsheet.sheet1.delete_rows(sheet_row)
+            index.remove_row(sheet_row)
+            self._invalidate(
+                sheet_id, index,
+                patch=lambda df: self._drop_frame_row(df, sheet_row),
+                revision=revision
+            )
+            return True
+            
+        except Exception as e:
+            self.indexes.invalidate(sheet_id)
+            st.error(f"行削除エラー: {str(e)}")
+            return False
+    
+    def update_creditor(self, sheet_id, record_id, row_data, hint_row=None):
+        """ID列で指定した債権者の行を更新（キャッシュ済みのデータは再取得せずに反映）"""
+        if not self.client:
+            return False
+            
+        try:
+            spreadsheet, index, sheet_row, revision = self._locate_creditor(sheet_id, record_id, hint_row)
+            if sheet_row is None:
+                self.indexes.invalidate(sheet_id)
+                st.error(f"ID {record_id} の行が見つかりません（他で変更された可能性があります）")
+                return False
+            
+            # 更新日時を最後に追加
+            if len(row_data) >= 20:
+                row_data[19] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            spreadsheet.sheet1.update(f'A{sheet_row}:T{sheet_row}', [row_data])
+            index.update_row(sheet_row, row_data)
+            self._invalidate(
+                sheet_id, index,
+                patch=lambda df: self._replace_frame_row(df, sheet_row, row_data),
+                revision=revision
+            )
             return True
             
         except Exception as e:
+            self.indexes.invalidate(sheet_id)
             st.error(f"行更新エラー: {e}")
             return False
     
+    def _set_creditor_status(self, sheet_id, record_id, status, hint_row=None):
+        """IDで指定した行のステータス列だけを更新（書き込み後の行番号と書き込み前のリビジョンを返す）"""
+        spreadsheet, index, sheet_row, revision = self._locate_creditor(sheet_id, record_id, hint_row)
+        if sheet_row is None:
+            self.indexes.invalidate(sheet_id)
+            st.error(f"ID {record_id} の行が見つかりません（他で変更された可能性があります）")
+            return None, None, None
+        
+        spreadsheet.sheet1.update_cell(sheet_row, STATUS_COLUMN + 1, status)
+        return index, sheet_row, revision
+    
+    def mark_creditor_deleted(self, sheet_id, record_id, hint_row=None):
+        """
+        IDで指定した債権者の行を論理削除（ステータス列に削除済みと記録）
+        
+        行を詰めないため他の行の行番号は変わらない。キャッシュ済みのデータからは行を除くだけで、
+        物理的な削除は purge_deleted_rows でまとめて行う。
+        """
+        if not self.client:
+            return False
+            
+        try:
+            index, sheet_row, revision = self._set_creditor_status(
+                sheet_id, record_id, SOFT_DELETE["status"], hint_row
+            )
+            if sheet_row is None:
+                return False
+            
+            index.mark_deleted(sheet_row)
+            self._invalidate(
+                sheet_id, index,
+                patch=lambda df: df[df['sheet_row'] != sheet_row],
+                revision=revision
+            )
+            return True
+            
+        except Exception as e:
+            self.indexes.invalidate(sheet_id)
+            st.error(f"行削除エラー: {str(e)}")
+            return False
+    
+    def restore_creditor(self, sheet_id, record_id, status='', hint_row=None):
+        """論理削除した行を元に戻す（ステータスを削除前の値に戻す）"""
+        if not self.client:
+            return False
+            
+        try:
+            index, sheet_row, _ = self._set_creditor_status(sheet_id, record_id, status, hint_row)
+            if sheet_row is None:
+                return False
+            
+            # 行の値は読み直していないため、インデックスとキャッシュは次の読み込みで作り直す
+            self._invalidate(sheet_id)
+            return True
+            
+        except Exception as e:
+            self.indexes.invalidate(sheet_id)
+            st.error(f"行復元エラー: {str(e)}")
+            return False
+    
+    def purge_deleted_rows(self, sheet_id):
+        """
+        論理削除済みの行と空白行をまとめて物理削除
+        
+        連続する行ごとの deleteDimension を1回の batchUpdate で送る（下の行から削除して行番号のずれを防ぐ）。
+        
+        Returns:
+            int: 削除した行数（失敗時はNone）
+        """
+        if not self.client:
+            return None
+            
+        try:
+            spreadsheet = self.client.open_by_key(sheet_id)
+            worksheet = spreadsheet.sheet1
+            all_values = worksheet.get_all_values()
+            
+            purge_rows = [
+                sheet_row for sheet_row, row in enumerate(all_values[1:], start=2)
+                if is_deleted_row(row) or not any(str(cell).strip() for cell in row)
+            ]
+            if not purge_rows:
+                return 0
+            
+            # 連続する行をまとめた範囲（0始まり、終端を含まない）
+            ranges = []
+            for sheet_row in purge_rows:
+                if ranges and ranges[-1][1] == sheet_row - 1:
+                    ranges[-1][1] = sheet_row
+                else:
+                    ranges.append([sheet_row - 1, sheet_row])
+            
+            requests = [
+                {
+                    "deleteDimension": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "dimension": "ROWS",
+                            "startIndex": start,
+                            "endIndex": end
+                        }
+                    }
+                }
+                for start, end in reversed(ranges)
+            ]
+            spreadsheet.batch_update({"requests": requests})
+            
+            self._invalidate(sheet_id)
+            return len(purge_rows)
+            
+        except Exception as e:
+            self._invalidate(sheet_id)
+            st.error(f"シート整理エラー: {e}")
+            return None
+    
     def get_all_spreadsheets(self):
         """すべての債権者スプレッドシートを取得"""
         if not self.client:
             return []
             
         try:
-            spreadsheets = self.client.list_spreadsheet_files()
             debt_sheets = []
             
-            for sheet in spreadsheets:
-                if "債権者データ_" in sheet['name']:
-                    parts = sheet['name'].split('_')
-                    if len(parts) >= 2:
-                        debtor_name = parts[1]
-                        debt_sheets.append({
-                            'debtor_name': debtor_name,
-                            'sheet_name': sheet['name'],
-                            'sheet_id': sheet['id'],
-                            'url': f"https://docs.google.com/spreadsheets/d/{sheet['id']}/edit?usp=sharing"
-                        })
+            for sheet in self.iter_debtor_spreadsheets():
+                parts = sheet['name'].split('_')
+                if len(parts) >= 2:
+                    debtor_name = parts[1]
+                    debt_sheets.append({
+                        'debtor_name': debtor_name,
+                        'sheet_name': sheet['name'],
+                        'sheet_id': sheet['id'],
+                        'created_at': sheet.get('createdTime', ''),
+                        'modified_at': sheet.get('modifiedTime', ''),
+                        'url': f"https://docs.google.com/spreadsheets/d/{sheet['id']}/edit?usp=sharing"
+                    })
             
             return debt_sheets
             
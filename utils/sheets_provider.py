@@ -0,0 +1,34 @@
+"""
+SheetsManager共有プロバイダー
+
+全ページで1つの認証済みクライアント（接続プール付きHTTPセッション）を共有する。
+ページ切り替え時も同じ接続を再利用し、認証のやり直しを避ける。
+接続できなかったSheetsManagerは共有せず、次回の取得時に認証をやり直す。
+"""
+
+import threading
+from utils.sheets_manager import SheetsManager
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_sheets_manager():
+    """共有SheetsManagerを取得（未作成の場合は作成して認証）"""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            return _manager
+        manager = SheetsManager()
+        if manager.is_connected():
+            _manager = manager
+        return manager
+
+
+def invalidate_sheets_manager():
+    """共有SheetsManagerを破棄（次回取得時に再認証）。作成済みのものだけを閉じる"""
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        manager.close()
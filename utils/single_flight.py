@@ -0,0 +1,149 @@
+"""
+同一リクエストの集約（シングルフライト）
+
+同じキー（シートIDと範囲）の読み込みが同時に複数発生した場合、最初の呼び出しだけが
+実際にリクエストを送り、実行中に来た呼び出しはその結果（または例外）を共有する。
+最初の呼び出しが中断（キャンセル・割り込み）された場合は、待っていた呼び出しの1つが改めて実行する。
+複数セッションが同じ債務者を同時に開いた場合などに、同じ読み込みを1回にまとめる。
+共有した結果は複数の呼び出し元で使われるため、呼び出し側で変更しないこと。
+スレッドと asyncio の両方から利用できる。
+"""
+
+import asyncio
+import threading
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Call:
+    """実行中の呼び出し（完了を待つ呼び出し元と結果を共有）"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False  # 実行した呼び出し元が中断され、結果がない
+        self.waiters = []  # 完了を待つ asyncio の呼び出し元 [(イベントループ, Future)]
+
+    def outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """キーごとに実行中の呼び出しを1つにまとめる"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0  # 実行中の呼び出しの結果を共有した回数
+
+    def _join(self, key):
+        """実行中の呼び出しに合流（なければ新たに登録して、自分が実行する）"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _finish(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            call.done.set()
+            waiters, call.waiters = call.waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # 待っていたイベントループが既に閉じられている
+                pass
+
+    async def _wait_async(self, call):
+        """実行中の呼び出しの完了を、スレッドを使わずに待つ（完了時に実行した側から通知される）"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if call.done.is_set():
+                return
+            call.waiters.append((loop, future))
+        await future
+
+    def do(self, key, fn):
+        """
+        fn() を実行して結果を返す（同じキーの呼び出しが実行中なら、その結果を待って返す）
+
+        Args:
+            key: 呼び出しのキー（先頭要素はシートID）
+            fn: 実際の読み込み処理
+        """
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.abandoned:
+                return self.do(key, fn)
+            return call.outcome()
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            self._finish(key, call)
+
+    async def do_async(self, key, fn):
+        """do の asyncio 版（fn はコルーチンを返す関数）"""
+        call, leader = self._join(key)
+        if not leader:
+            await self._wait_async(call)
+            if call.abandoned:
+                return await self.do_async(key, fn)
+            return call.outcome()
+
+        try:
+            call.result = await fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # キャンセルされた場合は、待っている呼び出し元の1つが改めて実行する
+            call.abandoned = True
+            raise
+        finally:
+            self._finish(key, call)
+
+    def forget(self, sheet_id):
+        """
+        シートの実行中の呼び出しを切り離す（書き込み後に呼ぶ）
+
+        書き込み前に始まった読み込みの結果を、書き込み後の呼び出しが受け取らないようにする。
+        実行中の呼び出しはそのまま完了し、すでに合流した呼び出し元にだけ結果を返す。
+        """
+        with self._lock:
+            for key in [key for key in self._calls if key[0] == sheet_id]:
+                del self._calls[key]
+
+
+_flights = None
+_flights_lock = threading.Lock()
+
+
+def get_single_flight():
+    """プロセス全体で共有するシングルフライトを取得"""
+    global _flights
+    with _flights_lock:
+        if _flights is None:
+            _flights = SingleFlight()
+        return _flights
@@ -1,16 +1,13 @@
 """
 アプリケーションのデザインとスタイル定義
+
+色・角丸・入力欄などの基本はテーマ（.streamlit/config.toml）で指定し、
+ここではテーマで表せないボタンの配色と、カード・バッジ・メッセージなどの独自要素を定義する。
 """
 
 # メインCSS
 MAIN_CSS = """
 <style>
-    /* ベース設定 */
-    .main {
-        background-color: #fefefe;
-        padding: 1rem;
-    }
-    
     /* カードデザイン */
     .spreadsheet-card {
         background-color: #fcfcff;
@@ -59,103 +56,53 @@ MAIN_CSS = """
         border: 1px solid #f5c2c7;
     }
     
-    /* ボタンスタイル - パステルカラー（全ボタンタイプ対応）*/
-    .stButton > button,
-    .stFormSubmitButton > button,
-    button[data-testid="baseButton-primary"],
-    button[data-testid="baseButton-secondary"],
-    div[data-testid="stFormSubmitButton"] > button,
-    .stForm button[kind="primary"],
-    .stForm button {
-        border-radius: 8px !important;
-        font-weight: 500 !important;
-        border: 1px solid #e2e5ea !important;
-        font-size: 0.95rem !important;
-        padding: 0.6rem 1rem !important;
-        min-height: 2.4rem !important;
-        background-color: #f7f8fc !important;
-        color: #4a5568 !important;
-        transition: all 0.2s ease !important;
-        width: 100% !important;
-    }
-    
-    .stButton > button:hover,
-    .stFormSubmitButton > button:hover,
-    button[data-testid="baseButton-primary"]:hover,
-    button[data-testid="baseButton-secondary"]:hover,
-    div[data-testid="stFormSubmitButton"] > button:hover,
-    .stForm button:hover {
-        background-color: #f0f2f7 !important;
-        border-color: #c4c9d4 !important;
-    }
-    
-    /* 登録ボタン（プライマリ）- パステルグリーン - 最優先 */
-    .stButton > button[kind="primary"],
-    .stFormSubmitButton > button[kind="primary"],
-    button[data-testid="baseButton-primary"],
-    div[data-testid="stFormSubmitButton"] > button,
-    .stForm button[kind="primary"],
-    .stForm > div > div > div > button,
-    form button[type="submit"] {
-        background-color: #a8d5a8 !important;
-        color: #2d5a2d !important;
-        border-color: #a8d5a8 !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        min-height: 2.8rem !important;
-        width: 100% !important;
+    .status-changed {
+        background-color: #fff8e7;
+        color: #8b6914;
+        border: 1px solid #f5d982;
     }
     
-    .stButton > button[kind="primary"]:hover,
-    .stFormSubmitButton > button[kind="primary"]:hover,
-    button[data-testid="baseButton-primary"]:hover,
-    div[data-testid="stFormSubmitButton"] > button:hover,
-    .stForm button[kind="primary"]:hover,
-    .stForm > div > div > div > button:hover,
-    form button[type="submit"]:hover {
-        background-color: #98c798 !important;
-        border-color: #98c798 !important;
-        color: #2d5a2d !important;
+    /* ボタン - 色・角丸の基本はテーマ（.streamlit/config.toml）、ここでは大きさと配色のみ補足 */
+    div[data-testid="stButton"] button,
+    div[data-testid="stFormSubmitButton"] button,
+    div[data-testid="stDownloadButton"] button {
+        width: 100%;
+        min-height: 2.4rem;
+        font-size: 0.95rem;
+        font-weight: 500;
     }
     
-    /* 削除ボタン（セカンダリ）- パステルグレー */
-    .stButton > button[kind="secondary"],
-    .stFormSubmitButton > button[kind="secondary"],
-    button[data-testid="baseButton-secondary"] {
-        background-color: #c4c9d4 !important;
-        color: #4a5568 !important;
-        border-color: #c4c9d4 !important;
-        font-weight: 500 !important;
+    /* 通常ボタン（セカンダリ）- パステルグレー */
+    button[data-testid="stBaseButton-secondary"] {
+        background-color: #c4c9d4;
+        color: #4a5568;
+        border-color: #c4c9d4;
     }
     
-    .stButton > button[kind="secondary"]:hover,
-    .stFormSubmitButton > button[kind="secondary"]:hover,
-    button[data-testid="baseButton-secondary"]:hover {
-        background-color: #b4b9c4 !important;
-        border-color: #b4b9c4 !important;
+    button[data-testid="stBaseButton-secondary"]:hover {
+        background-color: #b4b9c4;
+        border-color: #b4b9c4;
+        color: #4a5568;
     }
     
-    /* フォームコンテナ内のボタン全体に適用 */
-    .stForm button,
-    .stForm input[type="submit"],
-    .stForm [role="button"] {
-        background-color: #a8d5a8 !important;
-        color: #2d5a2d !important;
-        border-color: #a8d5a8 !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        border-radius: 8px !important;
-        min-height: 2.8rem !important;
-        width: 100% !important;
-        border: 1px solid #a8d5a8 !important;
+    /* 登録ボタン（プライマリ・フォーム送信）- パステルグリーン */
+    button[data-testid="stBaseButton-primary"],
+    button[data-testid="stBaseButton-primaryFormSubmit"],
+    button[data-testid="stBaseButton-secondaryFormSubmit"] {
+        background-color: #a8d5a8;
+        color: #2d5a2d;
+        border-color: #a8d5a8;
+        font-size: 1rem;
+        font-weight: 600;
+        min-height: 2.8rem;
     }
     
-    .stForm button:hover,
-    .stForm input[type="submit"]:hover,
-    .stForm [role="button"]:hover {
-        background-color: #98c798 !important;
-        border-color: #98c798 !important;
-        color: #2d5a2d !important;
+    button[data-testid="stBaseButton-primary"]:hover,
+    button[data-testid="stBaseButton-primaryFormSubmit"]:hover,
+    button[data-testid="stBaseButton-secondaryFormSubmit"]:hover {
+        background-color: #98c798;
+        border-color: #98c798;
+        color: #2d5a2d;
     }
     
     /* テキストスタイル */
@@ -203,31 +150,8 @@ MAIN_CSS = """
         font-weight: 500;
     }
     
-    /* フォーム要素 - パステルカラー */
-    .stTextInput > div > div > input {
-        border-radius: 8px;
-        border: 1px solid #e2e5ea;
-        background-color: #fcfcff;
-    }
-    
-    .stTextArea > div > div > textarea {
-        border-radius: 8px;
-        border: 1px solid #e2e5ea;
-        background-color: #fcfcff;
-    }
-    
-    .stSelectbox > div > div > select {
-        border-radius: 8px;
-        border: 1px solid #e2e5ea;
-        background-color: #fcfcff;
-    }
-    
     /* レスポンシブ対応 */
     @media (max-width: 768px) {
-        .main {
-            padding: 0.5rem;
-        }
-        
         .spreadsheet-card {
             padding: 1rem;
         }
@@ -2,6 +2,7 @@ import os
 import json
 from datetime import datetime
 import streamlit as st
+from utils.registry_snapshot import RegistrySnapshot
 
 class TemplateManager:
     def __init__(self):
@@ -328,56 +329,6 @@ class TemplateManager:
             st.error(f"バックアップエラー: {e}")
             return None
     
-    def get_registry_info(self):
-        """レジストリの詳細情報を取得"""
-        registry = self.load_registry()
-        info = {
-            "total_courts": len(registry),
-            "total_templates": 0,
-            "courts": []
-        }
-        
-        for court_name, court_data in registry.items():
-            court_info = {
-                "name": court_name,
-                "procedures": []
-            }
-            
-            for key, value in court_data.items():
-                if isinstance(value, dict) and "債権者一覧表" in value:
-                    if key in ["個人再生", "自己破産"]:
-                        court_info["procedures"].append(key)
-                        info["total_templates"] += 1
-            
-            info["courts"].append(court_info)
-        
-        return info
-
-    def list_templates(self):
-        """登録済みテンプレート一覧を取得"""
-        templates = []
-        registry = self.load_registry()
-        
-        for court_name in registry.keys():
-            for procedure_type in registry[court_name].keys():
-                if "債権者一覧表" in registry[court_name][procedure_type]:
-                    template_key = self.create_template_key(court_name, procedure_type)
-                    template_info = registry[court_name][procedure_type]["債権者一覧表"].copy()
-                    
-                    # 追加情報を設定
-                    template_info['key'] = template_key
-                    template_info['court'] = court_name
-                    template_info['procedure_type'] = procedure_type
-                    
-                    # ファイル拡張子を取得
-                    template_path = self.get_template_path(template_key)
-                    if template_path:
-                        template_info['file_extension'] = os.path.splitext(template_path)[1]
-                    else:
-                        template_info['file_extension'] = '.xlsx'
-                    
-                    templates.append(template_info)
-        
-        # 裁判所名でソート
-        templates.sort(key=lambda x: x['court'])
-        return templates
\ No newline at end of file
+    def get_registry_snapshot(self):
+        """レジストリのスナップショットを取得（レジストリのバージョン単位でメモ化）"""
+        return RegistrySnapshot.current(self)
@@ -1,8 +1,6 @@
 import io
 import os
 from datetime import datetime
-from openpyxl import load_workbook
-from docx import Document
 from .tokyo_district_handler import TokyoDistrictHandler
 
 class TemplateProcessor:
@@ -27,8 +25,8 @@ class TemplateProcessor:
         result = result.replace("{total_creditors}", str(len(creditor_data)))
         
         # 債権金額総計の計算
-        total_amount = sum(float(str(row.get('債権額', 0)).replace(',', '')) if row.get('債権額') else 0 for row in creditor_data)
-        result = result.replace("{total_claim_amount}", f"{int(total_amount):,}")
+        total_amount = sum(record.claim_amount or 0 for record in creditor_data)
+        result = result.replace("{total_claim_amount}", f"{total_amount:,}")
         
         # 東京地裁自己破産の特殊処理
         if self.tokyo_handler.is_tokyo_district_bankruptcy(court_name, procedure_type):
@@ -46,25 +44,25 @@ class TemplateProcessor:
         # 債権者個別情報の置換
         for i, creditor in enumerate(creditor_data, 1):
             replacements = {
-                f"{{id_{i}}}": str(creditor.get('ID', '')),
-                f"{{company_name_{i}}}": str(creditor.get('会社名', '')),
-                f"{{branch_name_{i}}}": str(creditor.get('支店名', '')),
-                f"{{postal_code_{i}}}": str(creditor.get('郵便番号', '')),
-                f"{{address_{i}}}": str(creditor.get('住所', '')),
-                f"{{phone_number_{i}}}": str(creditor.get('電話番号', '')),
-                f"{{fax_number_{i}}}": str(creditor.get('FAX番号', '')),
-                f"{{claim_name_{i}}}": str(creditor.get('債権名', '')),
-                f"{{claim_amount_{i}}}": str(creditor.get('債権額', '')),
-                f"{{contract_date_{i}}}": str(creditor.get('契約日', '')),
-                f"{{first_borrowing_date_{i}}}": str(creditor.get('初回借入日', '')),
-                f"{{last_borrowing_date_{i}}}": str(creditor.get('最終借入日', '')),
-                f"{{last_payment_date_{i}}}": str(creditor.get('最終返済日', '')),
-                f"{{original_creditor_{i}}}": str(creditor.get('原債権者', '')),
-                f"{{substitution_or_transfer_{i}}}": str(creditor.get('代位弁済/債権譲渡', '')),
-                f"{{transfer_date_{i}}}": str(creditor.get('債権移転日', '')),
-                f"{{status_{i}}}": str(creditor.get('ステータス', '')),
-                f"{{notes_{i}}}": str(creditor.get('備考', '')),
-                f"{{registration_date_{i}}}": str(creditor.get('登録日', '')),
+                f"{{id_{i}}}": creditor.text('ID'),
+                f"{{company_name_{i}}}": creditor.text('会社名'),
+                f"{{branch_name_{i}}}": creditor.text('支店名'),
+                f"{{postal_code_{i}}}": creditor.text('郵便番号'),
+                f"{{address_{i}}}": creditor.text('住所'),
+                f"{{phone_number_{i}}}": creditor.text('電話番号'),
+                f"{{fax_number_{i}}}": creditor.text('FAX番号'),
+                f"{{claim_name_{i}}}": creditor.text('債権名'),
+                f"{{claim_amount_{i}}}": creditor.text('債権額'),
+                f"{{contract_date_{i}}}": creditor.text('契約日'),
+                f"{{first_borrowing_date_{i}}}": creditor.text('初回借入日'),
+                f"{{last_borrowing_date_{i}}}": creditor.text('最終借入日'),
+                f"{{last_payment_date_{i}}}": creditor.text('最終返済日'),
+                f"{{original_creditor_{i}}}": creditor.text('原債権者'),
+                f"{{substitution_or_transfer_{i}}}": creditor.text('代位弁済/債権譲渡'),
+                f"{{transfer_date_{i}}}": creditor.text('債権移転日'),
+                f"{{status_{i}}}": creditor.text('ステータス'),
+                f"{{notes_{i}}}": creditor.text('備考'),
+                f"{{registration_date_{i}}}": creditor.text('登録日'),
                 f"{{creditor_rank_{i}}}": str(i)
             }
             
@@ -75,6 +73,8 @@ class TemplateProcessor:
         
     def process_excel_template(self, template_path, creditor_data, debtor_name, court_name, procedure_type, case_number=""):
         """Excelテンプレートファイルを処理"""
+        from openpyxl import load_workbook
+        
         wb = load_workbook(template_path)
         
         for sheet_name in wb.sheetnames:
@@ -91,6 +91,8 @@ class TemplateProcessor:
     
     def process_word_template(self, template_path, creditor_data, debtor_name, court_name, procedure_type, case_number=""):
         """Wordテンプレートファイルを処理"""
+        from docx import Document
+        
         doc = Document(template_path)
         
         # 段落内のテキストを処理
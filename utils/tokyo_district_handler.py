@@ -1,3 +1,5 @@
+from utils.creditor_record import ClaimName
+
 class TokyoDistrictHandler:
     """東京地裁専用の処理を行うクラス"""
     
@@ -10,14 +12,9 @@ class TokyoDistrictHandler:
     
     def convert_claim_name_to_code(self, claim_name):
         """東京地裁用：債権名をコードに変換"""
-        claim_name_str = str(claim_name).strip()
-        conversion_map = {
-            '貸付金': 'A',
-            '立替金': 'B', 
-            '保証金': 'C',
-            'その他': 'D'
-        }
-        return conversion_map.get(claim_name_str, 'D')  # 該当なしの場合はDを返す
+        if isinstance(claim_name, ClaimName):
+            return claim_name.code
+        return ClaimName.parse(claim_name).code  # 該当なしの場合はDを返す
     
     def replace_tokyo_variables(self, text, creditor_data):
         """東京地裁自己破産用のA/B変数置換（修正版）"""
@@ -55,29 +52,29 @@ class TokyoDistrictHandler:
                 
                 if creditor_index >= 0 and creditor_index < len(creditor_data):
                     creditor = creditor_data[creditor_index]
-                    claim_name_code = self.convert_claim_name_to_code(creditor.get('債権名', ''))
+                    claim_name_code = creditor.claim_name.code
                     
                     replacements = {
-                        f"{{company_name_A{i}}}": str(creditor.get('会社名', '')),
-                        f"{{branch_name_A{i}}}": str(creditor.get('支店名', '')),
-                        f"{{postal_code_A{i}}}": str(creditor.get('郵便番号', '')),
-                        f"{{address_A{i}}}": str(creditor.get('住所', '')),
-                        f"{{phone_number_A{i}}}": str(creditor.get('電話番号', '')),
-                        f"{{fax_number_A{i}}}": str(creditor.get('FAX番号', '')),
+                        f"{{company_name_A{i}}}": creditor.text('会社名'),
+                        f"{{branch_name_A{i}}}": creditor.text('支店名'),
+                        f"{{postal_code_A{i}}}": creditor.text('郵便番号'),
+                        f"{{address_A{i}}}": creditor.text('住所'),
+                        f"{{phone_number_A{i}}}": creditor.text('電話番号'),
+                        f"{{fax_number_A{i}}}": creditor.text('FAX番号'),
                         f"{{claim_name_A{i}}}": claim_name_code,
-                        f"{{claim_amount_A{i}}}": str(creditor.get('債権額', '')),
-                        f"{{contract_date_A{i}}}": str(creditor.get('契約日', '')),
-                        f"{{first_borrowing_date_A{i}}}": str(creditor.get('初回借入日', '')),
-                        f"{{last_borrowing_date_A{i}}}": str(creditor.get('最終借入日', '')),
-                        f"{{last_payment_date_A{i}}}": str(creditor.get('最終返済日', '')),
-                        f"{{original_creditor_A{i}}}": str(creditor.get('原債権者', '')),
-                        f"{{substitution_or_transfer_A{i}}}": str(creditor.get('代位弁済/債権譲渡', '')),
-                        f"{{transfer_date_A{i}}}": str(creditor.get('債権移転日', '')),
-                        f"{{status_A{i}}}": str(creditor.get('ステータス', '')),
-                        f"{{notes_A{i}}}": str(creditor.get('備考', '')),
-                        f"{{registration_date_A{i}}}": str(creditor.get('登録日', '')),
+                        f"{{claim_amount_A{i}}}": creditor.text('債権額'),
+                        f"{{contract_date_A{i}}}": creditor.text('契約日'),
+                        f"{{first_borrowing_date_A{i}}}": creditor.text('初回借入日'),
+                        f"{{last_borrowing_date_A{i}}}": creditor.text('最終借入日'),
+                        f"{{last_payment_date_A{i}}}": creditor.text('最終返済日'),
+                        f"{{original_creditor_A{i}}}": creditor.text('原債権者'),
+                        f"{{substitution_or_transfer_A{i}}}": creditor.text('代位弁済/債権譲渡'),
+                        f"{{transfer_date_A{i}}}": creditor.text('債権移転日'),
+                        f"{{status_A{i}}}": creditor.text('ステータス'),
+                        f"{{notes_A{i}}}": creditor.text('備考'),
+                        f"{{registration_date_A{i}}}": creditor.text('登録日'),
                         f"{{creditor_rank_A{i}}}": str(creditor_index + 1),  # 1ベースで表示
-                        f"{{id_A{i}}}": str(creditor.get('ID', ''))
+                        f"{{id_A{i}}}": creditor.text('ID')
                     }
                     
                     
@@ -118,29 +115,29 @@ class TokyoDistrictHandler:
             for i in range(1, 22):  # B1～B21
                 if i <= general_count:
                     creditor = creditor_data[i - 1]
-                    claim_name_code = self.convert_claim_name_to_code(creditor.get('債権名', ''))
+                    claim_name_code = creditor.claim_name.code
                     
                     replacements = {
-                        f"{{company_name_B{i}}}": str(creditor.get('会社名', '')),
-                        f"{{branch_name_B{i}}}": str(creditor.get('支店名', '')),
-                        f"{{postal_code_B{i}}}": str(creditor.get('郵便番号', '')),
-                        f"{{address_B{i}}}": str(creditor.get('住所', '')),
-                        f"{{phone_number_B{i}}}": str(creditor.get('電話番号', '')),
-                        f"{{fax_number_B{i}}}": str(creditor.get('FAX番号', '')),
+                        f"{{company_name_B{i}}}": creditor.text('会社名'),
+                        f"{{branch_name_B{i}}}": creditor.text('支店名'),
+                        f"{{postal_code_B{i}}}": creditor.text('郵便番号'),
+                        f"{{address_B{i}}}": creditor.text('住所'),
+                        f"{{phone_number_B{i}}}": creditor.text('電話番号'),
+                        f"{{fax_number_B{i}}}": creditor.text('FAX番号'),
                         f"{{claim_name_B{i}}}": claim_name_code,
-                        f"{{claim_amount_B{i}}}": str(creditor.get('債権額', '')),
-                        f"{{contract_date_B{i}}}": str(creditor.get('契約日', '')),
-                        f"{{first_borrowing_date_B{i}}}": str(creditor.get('初回借入日', '')),
-                        f"{{last_borrowing_date_B{i}}}": str(creditor.get('最終借入日', '')),
-                        f"{{last_payment_date_B{i}}}": str(creditor.get('最終返済日', '')),
-                        f"{{original_creditor_B{i}}}": str(creditor.get('原債権者', '')),
-                        f"{{substitution_or_transfer_B{i}}}": str(creditor.get('代位弁済/債権譲渡', '')),
-                        f"{{transfer_date_B{i}}}": str(creditor.get('債権移転日', '')),
-                        f"{{status_B{i}}}": str(creditor.get('ステータス', '')),
-                        f"{{notes_B{i}}}": str(creditor.get('備考', '')),
-                        f"{{registration_date_B{i}}}": str(creditor.get('登録日', '')),
+                        f"{{claim_amount_B{i}}}": creditor.text('債権額'),
+                        f"{{contract_date_B{i}}}": creditor.text('契約日'),
+                        f"{{first_borrowing_date_B{i}}}": creditor.text('初回借入日'),
+                        f"{{last_borrowing_date_B{i}}}": creditor.text('最終借入日'),
+                        f"{{last_payment_date_B{i}}}": creditor.text('最終返済日'),
+                        f"{{original_creditor_B{i}}}": creditor.text('原債権者'),
+                        f"{{substitution_or_transfer_B{i}}}": creditor.text('代位弁済/債権譲渡'),
+                        f"{{transfer_date_B{i}}}": creditor.text('債権移転日'),
+                        f"{{status_B{i}}}": creditor.text('ステータス'),
+                        f"{{notes_B{i}}}": creditor.text('備考'),
+                        f"{{registration_date_B{i}}}": creditor.text('登録日'),
                         f"{{creditor_rank_B{i}}}": str(i),
-                        f"{{id_B{i}}}": str(creditor.get('ID', ''))
+                        f"{{id_B{i}}}": creditor.text('ID')
                     }
                     
                     for var, value in replacements.items():